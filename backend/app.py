@@ -2,16 +2,39 @@
 """Book Tracker API - Flask backend with Open Library API integration."""
 
 import sqlite3
-import urllib.request
-import urllib.parse
 import json
 import os
 import csv
 import io
-from functools import wraps
+import re
+import sys
+import time
+import base64
+import hmac
+import zlib
+from functools import lru_cache, partial, wraps
 from pathlib import Path
 from datetime import date
-from flask import Flask, jsonify, request, g, session, send_from_directory
+from flask import (
+    Flask, Response, jsonify, request, g, session, send_from_directory, has_request_context,
+    make_response, redirect, send_file, stream_with_context,
+)
+from werkzeug.exceptions import HTTPException
+
+# Sibling modules are imported flat, which needs the backend directory on the
+# path when the app is loaded as backend.app under gunicorn.
+sys.path.insert(0, str(Path(__file__).parent))
+
+import database
+import library_export
+import library_stats
+import metrics
+import openlibrary
+import path_ranks
+from covers import CoverStore
+from openlibrary import OPEN_LIBRARY_COVERS, extract_open_library_info
+from enrichment import EnrichmentEngine
+from response_cache import ResponseCache
 
 app = Flask(__name__, static_folder=None)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -29,25 +52,154 @@ DATABASE = get_database_path()
 # Frontend static files path
 FRONTEND_DIR = Path(__file__).parent.parent / 'frontend'
 
-# Open Library APIs
-OPEN_LIBRARY_SEARCH = 'https://openlibrary.org/search.json'
-OPEN_LIBRARY_COVERS = 'https://covers.openlibrary.org/b'
+# Open Library response cache (TTLs in seconds)
+open_library_cache = openlibrary.OpenLibraryCache(
+    DATABASE,
+    ttl=int(os.environ.get('OPEN_LIBRARY_CACHE_TTL', 30 * 24 * 3600)),
+    negative_ttl=int(os.environ.get('OPEN_LIBRARY_CACHE_NEGATIVE_TTL', 24 * 3600)),
+    max_entries=int(os.environ.get('OPEN_LIBRARY_CACHE_MAX_ENTRIES', 20000)),
+)
+
+# Seconds an Open Library search made for a request may take, connect to last byte
+OPEN_LIBRARY_TIMEOUT = float(os.environ.get('OPEN_LIBRARY_TIMEOUT', openlibrary.SEARCH_TIMEOUT))
+
+# Background bulk enrichment (rate is Open Library requests per second)
+enrichment_engine = EnrichmentEngine(
+    DATABASE,
+    cache=open_library_cache,
+    concurrency=int(os.environ.get('ENRICH_CONCURRENCY', 4)),
+    rate=float(os.environ.get('ENRICH_RATE_LIMIT', 2.0)),
+    batch_size=int(os.environ.get('ENRICH_BATCH_SIZE', 25)),
+)
+
+# Cover images proxied from Open Library, cached on the volume next to the database
+cover_store = CoverStore(
+    os.environ.get('COVER_CACHE_DIR', DATABASE.parent / 'covers'),
+    origin=os.environ.get('OPEN_LIBRARY_COVERS_URL', OPEN_LIBRARY_COVERS),
+    negative_ttl=int(os.environ.get('COVER_CACHE_NEGATIVE_TTL', 24 * 3600)),
+    client=openlibrary.client,
+)
+
+# Cached covers never change, so browsers may keep them for a year
+COVER_MAX_AGE = 365 * 24 * 3600
+
+# Serialized responses of the heaviest read endpoints, per worker
+response_cache = ResponseCache(max_bytes=int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 8 * 1024 * 1024)))
+
+# Per-worker connection pool (WAL, tuned pragmas, statement cache)
+db_pool = database.ConnectionPool(DATABASE, max_readers=int(os.environ.get('SQLITE_MAX_READERS', 4)))
+
+# Requests with these methods only read and get a read-only connection
+READ_ONLY_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Warn when one statement shape runs more than this many times in a request (N+1 queries)
+SQL_N_PLUS_ONE_THRESHOLD = int(os.environ.get('SQL_N_PLUS_ONE_THRESHOLD', 10))
+
+# Warn about single statements slower than this
+SQL_SLOW_STATEMENT_MS = float(os.environ.get('SQL_SLOW_STATEMENT_MS', 100))
+
+# Cache counters exported at /api/metrics (other numeric stats are exported as gauges)
+metrics.REGISTRY.register_cache(
+    'response', response_cache.stats, counters=('hits', 'misses', 'stores', 'evictions', 'invalidations', 'bytes_saved'),
+)
+metrics.REGISTRY.register_cache(
+    'open_library', open_library_cache.stats, counters=('hits', 'negative_hits', 'misses', 'stores', 'evictions'),
+)
+metrics.REGISTRY.register_cache(
+    'covers', cover_store.stats, counters=('hits', 'negative_hits', 'misses', 'stores', 'errors'),
+)
 
 
 def get_db():
-    """Get database connection for current request."""
+    """Get a pooled database connection for current request.
+
+    Read-only requests get a reader connection; anything else gets the
+    worker's single writer connection for the rest of the request. The
+    connection is wrapped to count and time the statements the request runs.
+    """
     if 'db' not in g:
-        g.db = sqlite3.connect(DATABASE)
-        g.db.row_factory = sqlite3.Row
+        if has_request_context() and request.method in READ_ONLY_METHODS:
+            conn = db_pool.acquire_reader()
+        else:
+            conn = db_pool.acquire_writer()
+        g.db = database.InstrumentedConnection(conn)
     return g.db
 
 
+@app.after_request
+def invalidate_response_cache(response):
+    """Clear cached responses after a successful request that used the writer connection."""
+    if request.method not in READ_ONLY_METHODS and 'db' in g and response.status_code < 400:
+        response_cache.invalidate()
+    return response
+
+
 @app.teardown_appcontext
 def close_db(exception):
-    """Close database connection at end of request."""
+    """Return database connection to the pool at end of request."""
     db = g.pop('db', None)
     if db is not None:
-        db.close()
+        db_pool.release(db.connection)
+
+
+# --- Request Metrics ---
+
+def get_route_label() -> str:
+    """Label metrics by route template, so /api/books/1 and /api/books/2 share a series."""
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def instrument_response(response):
+    """Add a Server-Timing header and record request metrics once the response is sent.
+
+    Metrics are recorded when the response is closed, so streamed exports
+    include the time and statements spent producing their body.
+    """
+    db = g.get('db')
+    started = g.get('request_started')
+    timings = []
+    if db is not None:
+        timings.append(f'sql;dur={db.seconds * 1000:.1f};desc="{db.statements} statements"')
+    if started is not None:
+        timings.append(f'app;dur={(time.perf_counter() - started) * 1000:.1f}')
+        response.call_on_close(partial(
+            record_request_metrics, request.method, get_route_label(), response.status_code, started, db,
+        ))
+    if timings:
+        response.headers['Server-Timing'] = ', '.join(timings)
+    return response
+
+
+def record_request_metrics(method: str, route: str, status: int, started: float, db):
+    """Record latency and SQL metrics for a finished request.
+
+    Also logs warnings for statements that repeat past SQL_N_PLUS_ONE_THRESHOLD
+    and for the slowest statement when it took over SQL_SLOW_STATEMENT_MS.
+    """
+    metrics.http_request_duration.observe(time.perf_counter() - started, method=method, route=route)
+    metrics.http_requests.inc(method=method, route=route, status=status)
+    if db is None:
+        return
+    metrics.sql_statements.observe(db.statements, route=route)
+    metrics.sql_seconds.inc(db.seconds, route=route)
+
+    repeated = db.repeated(SQL_N_PLUS_ONE_THRESHOLD)
+    if repeated:
+        metrics.sql_n_plus_one.inc(route=route)
+        for sql, count in repeated:
+            print(f"Warning: possible N+1 in {method} {route}: {count}x {sql[:200]}")
+
+    slowest_seconds, slowest_sql = db.slowest
+    if slowest_seconds * 1000 > SQL_SLOW_STATEMENT_MS:
+        metrics.sql_slow_statements.inc(route=route)
+        print(f"Warning: slow statement in {method} {route} ({slowest_seconds * 1000:.0f}ms): "
+              f"{database.normalize_sql(slowest_sql)[:200]}")
 
 
 def dict_from_row(row):
@@ -55,23 +207,79 @@ def dict_from_row(row):
     return dict(zip(row.keys(), row))
 
 
+def rows_to_dicts(cursor) -> list[dict]:
+    """Convert a cursor's remaining rows to dicts, reading the column names once."""
+    columns = [col[0] for col in cursor.description]
+    cursor.row_factory = None
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+def create_schema(schema_path: Path) -> bool:
+    """Create the schema in a new, empty database file.
+
+    Returns False without changes if the database already has tables, e.g.
+    because another worker created them while this one waited for the lock.
+    """
+    conn = sqlite3.connect(DATABASE, timeout=300)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        if conn.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()[0]:
+            return False
+        # executescript would commit first and drop the lock, so run statement by statement
+        statement = ''
+        for line in schema_path.read_text().splitlines(keepends=True):
+            statement += line
+            if sqlite3.complete_statement(statement):
+                conn.execute(statement)
+                statement = ''
+        conn.commit()
+        return True
+    finally:
+        conn.close()
+
+
 def init_database():
-    """Initialize database if it doesn't exist."""
+    """Initialize database if it doesn't exist and apply pending migrations.
+
+    Every gunicorn worker runs this when it imports the app. Schema creation
+    and each migration hold SQLite's write lock from their check to their
+    commit, so concurrent workers apply each step once.
+    """
     if not DATABASE.exists():
-        print(f"Initializing database at {DATABASE}")
-        DATABASE.parent.mkdir(parents=True, exist_ok=True)
         schema_path = Path(__file__).parent / 'schema.sql'
-        if schema_path.exists():
-            conn = sqlite3.connect(DATABASE)
-            with open(schema_path) as f:
-                conn.executescript(f.read())
-            conn.close()
-            print("Database initialized from schema.sql")
+        if not schema_path.exists():
+            print(f"No database at {DATABASE} and no schema.sql to create it from")
+            return
+        DATABASE.parent.mkdir(parents=True, exist_ok=True)
+        if create_schema(schema_path):
+            print(f"Database initialized at {DATABASE} from schema.sql")
 
             # Run migration
             from migrate_v1 import migrate
             migrate()
 
+    # Migrations below are idempotent and cheap when already applied
+    from migrate_v2 import migrate as migrate_v2
+    migrate_v2()
+    from migrate_v3 import migrate as migrate_v3
+    migrate_v3()
+    from migrate_v4 import migrate as migrate_v4
+    migrate_v4()
+    from migrate_v5 import migrate as migrate_v5
+    migrate_v5()
+    from migrate_v6 import migrate as migrate_v6
+    migrate_v6()
+    from migrate_v7 import migrate as migrate_v7
+    migrate_v7()
+    from migrate_v8 import migrate as migrate_v8
+    migrate_v8()
+    from migrate_v9 import migrate as migrate_v9
+    migrate_v9()
+    from migrate_v10 import migrate as migrate_v10
+    migrate_v10()
+    from migrate_v11 import migrate as migrate_v11
+    migrate_v11()
+
 
 # --- Authentication ---
 
@@ -128,6 +336,55 @@ def check_auth():
     })
 
 
+# --- Conditional Requests ---
+
+def get_library_etag(db) -> str:
+    """Build the ETag for library reads from the shared revision counter.
+
+    The counter lives in the database and is bumped by triggers on every write,
+    so all workers agree on it. The date is included because library_view
+    derives is_stale from the current time.
+    """
+    row = db.execute('SELECT epoch, revision FROM library_revision WHERE id = 1').fetchone()
+    return f"{row['epoch']}-{row['revision']}-{date.today().isoformat()}"
+
+
+def revision_etag(f):
+    """Decorator for read endpoints: answer If-None-Match with 304 before any query runs."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        etag = g.library_etag = get_library_etag(get_db())
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        # Private (auth cookie) and always revalidated, which is cheap
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    return decorated_function
+
+
+def cached_response(f):
+    """Decorator for expensive read endpoints: reuse the serialized body at the same library revision.
+
+    Must be applied inside revision_etag, which sets g.library_etag.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        body = response_cache.get(key, g.library_etag)
+        if body is not None:
+            return Response(body, mimetype='application/json')
+        response = make_response(f(*args, **kwargs))
+        if response.status_code == 200 and not response.is_streamed:
+            response_cache.set(key, g.library_etag, response.get_data())
+        return response
+    return decorated_function
+
+
 # --- Static File Serving ---
 
 @app.route('/')
@@ -144,125 +401,444 @@ def serve_static(filename):
 
 # --- Open Library API ---
 
-def get_open_library_cover_url(isbn: str = None, olid: str = None, size: str = 'L') -> str | None:
-    """Get cover URL from Open Library."""
-    if isbn:
-        return f"{OPEN_LIBRARY_COVERS}/isbn/{isbn}-{size}.jpg"
-    if olid:
-        return f"{OPEN_LIBRARY_COVERS}/olid/{olid}-{size}.jpg"
-    return None
-
+@app.route('/covers/<kind>/<name>', methods=['GET'])
+@require_auth
+def get_cover(kind: str, name: str):
+    """Serve a cover from the local cache, e.g. /covers/isbn/9780262033848-M.jpg.
 
-def search_open_library(query: str, limit: int = 5) -> list[dict]:
-    """Search Open Library for books."""
-    params = urllib.parse.urlencode({
-        'q': query,
-        'limit': limit,
-        'fields': 'key,title,author_name,first_publish_year,cover_i,isbn,number_of_pages_median,publisher,subject',
-    })
-    url = f"{OPEN_LIBRARY_SEARCH}?{params}"
+    The S/M/L suffix picks the Open Library size. Covers are fetched once and
+    then served with an immutable Cache-Control and their content hash as ETag.
+    """
+    value, _, size = name.removesuffix('.jpg').rpartition('-')
+    if not cover_store.is_valid(kind, value, size):
+        return jsonify({'error': 'Invalid cover key'}), 404
 
     try:
-        with urllib.request.urlopen(url, timeout=10) as response:
-            data = json.loads(response.read().decode())
-            return data.get('docs', [])
+        entry = cover_store.get(kind, value, size)
     except Exception as e:
-        print(f"Open Library API error: {e}")
-        return []
-
-
-def get_open_library_book_by_isbn(isbn: str) -> dict | None:
-    """Get book details from Open Library by ISBN."""
-    results = search_open_library(f'isbn:{isbn}', limit=1)
-    return results[0] if results else None
-
-
-def extract_open_library_info(ol_book: dict) -> dict:
-    """Extract relevant info from Open Library search result."""
-    cover_id = ol_book.get('cover_i')
-    isbns = ol_book.get('isbn', [])
-
-    isbn13 = next((i for i in isbns if len(i) == 13), None)
-    isbn10 = next((i for i in isbns if len(i) == 10), None)
-
-    return {
-        'open_library_key': ol_book.get('key'),
-        'title': ol_book.get('title'),
-        'authors': ol_book.get('author_name', []),
-        'first_publish_year': ol_book.get('first_publish_year'),
-        'page_count': ol_book.get('number_of_pages_median'),
-        'publishers': ol_book.get('publisher', [])[:3],
-        'subjects': ol_book.get('subject', [])[:10],
-        'cover_image_url': f"https://covers.openlibrary.org/b/id/{cover_id}-L.jpg" if cover_id else None,
-        'cover_image_medium': f"https://covers.openlibrary.org/b/id/{cover_id}-M.jpg" if cover_id else None,
-        'isbn_10': isbn10,
-        'isbn_13': isbn13,
-    }
+        # Let the browser try the origin directly rather than show no cover
+        print(f"Cover fetch error for {kind}/{name}: {e}")
+        return redirect(cover_store.origin_url(kind, value, size))
+
+    if entry is None:
+        response = jsonify({'error': 'Cover not found'})
+        response.status_code = 404
+        response.cache_control.max_age = cover_store.negative_ttl
+        return response
+
+    digest, content_type = entry
+    response = send_file(
+        cover_store.object_path(digest),
+        mimetype=content_type,
+        etag=digest,
+        max_age=COVER_MAX_AGE,
+        conditional=True,
+    )
+    response.cache_control.immutable = True
+    return response
+
+
+@app.route('/api/covers/cache', methods=['GET'])
+@require_auth
+def get_cover_cache_stats():
+    """Get cover cache hit/miss counters and stored object count and size."""
+    return jsonify(cover_store.stats())
+
+
+def search_open_library(query: str, limit: int = 5) -> list[dict]:
+    """Search Open Library for books, using the persistent response cache."""
+    return openlibrary.search(query, limit, cache=open_library_cache, timeout=OPEN_LIBRARY_TIMEOUT)
 
 
 # --- API Routes ---
 
-@app.route('/api/books', methods=['GET'])
-@require_auth
-def get_books():
-    """Get all books with filtering and pagination."""
-    db = get_db()
+VALID_BOOK_SORTS = ['date_added', 'finished_reading_at', 'title', 'author', 'my_rating', 'page_count', 'year_published']
+
+# bm25 column weights for books_fts: title, author, additional_authors, publisher, description
+FTS_RANK_WEIGHTS = '10.0, 5.0, 3.0, 1.0, 1.0'
 
-    status = request.args.get('status')
-    search = request.args.get('search', '')
-    sort_by = request.args.get('sort', 'date_added')
-    sort_order = request.args.get('order', 'desc')
-    page = int(request.args.get('page', 1))
-    per_page = int(request.args.get('per_page', 50))
 
-    query = 'SELECT * FROM library_view WHERE 1=1'
+def build_fts_query(search: str) -> str | None:
+    """Turn free-text input into an FTS5 MATCH expression of prefix terms.
+
+    Each word must match (implicit AND), and the last characters typed match
+    as a prefix so results update on every keystroke.
+    """
+    terms = re.findall(r'\w+', search or '')
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def build_library_source(fts_query: str = None) -> tuple[str, list]:
+    """Get the FROM source for library list queries.
+
+    With a full-text query the source is library_view joined to books_fts,
+    filtered by MATCH and carrying a bm25 relevance column (lower is better).
+    """
+    if not fts_query:
+        return 'library_view', []
+    return f'''(
+        SELECT lv.*, bm25(books_fts, {FTS_RANK_WEIGHTS}) AS relevance
+        FROM library_view lv
+        JOIN books_fts ON books_fts.rowid = lv.book_id
+        WHERE books_fts MATCH ?
+    )''', [fts_query]
+
+
+def build_library_filters(status: str = None) -> tuple[str, list]:
+    """Build the WHERE clause shared by library_view list queries."""
+    where = 'WHERE 1=1'
     params = []
 
     if status:
-        query += ' AND status = ?'
+        where += ' AND status = ?'
         params.append(status)
 
-    if search:
-        query += ' AND (title LIKE ? OR author LIKE ?)'
-        search_term = f'%{search}%'
-        params.extend([search_term, search_term])
+    return where, params
+
+
+# Named projections for list endpoints (view=), e.g. what a book card renders
+LIBRARY_PROJECTIONS = {
+    'card': [
+        'book_id', 'user_book_id', 'title', 'author', 'cover_image_url', 'status',
+        'progress_percent', 'current_page', 'page_count', 'my_rating', 'priority',
+        'is_stale', 'last_read_at', 'date_added', 'finished_reading_at',
+    ],
+}
+
+# Columns the API serves from another library_view column: the cover with its
+# ISBN fallback. Stored values (exports, create/update responses) are left as-is.
+DISPLAY_COLUMNS = {'cover_image_url': 'display_cover_url'}
+
+_library_columns = None
+
+
+def get_library_columns(db) -> list[str]:
+    """Get the library_view column names, without display columns (read once per process)."""
+    global _library_columns
+    if _library_columns is None:
+        hidden = set(DISPLAY_COLUMNS.values())
+        _library_columns = [
+            col[0] for col in db.execute('SELECT * FROM library_view LIMIT 0').description
+            if col[0] not in hidden
+        ]
+    return _library_columns
+
+
+def parse_projection(db) -> list[str] | None:
+    """Parse the view= and fields= parameters into library_view columns.
+
+    Returns None when neither is given (all columns). Raises ValueError for
+    an unknown view or column.
+    """
+    fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()]
+    view = request.args.get('view')
+    if view:
+        if view not in LIBRARY_PROJECTIONS:
+            raise ValueError(f'Unknown view: {view}')
+        fields = LIBRARY_PROJECTIONS[view] + fields
+    if not fields:
+        return None
+
+    available = get_library_columns(db)
+    unknown = [f for f in fields if f not in available]
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+    return list(dict.fromkeys(fields))
+
+
+def build_projection(db, fields: list[str] | None, prefix: str = '') -> str:
+    """Build the SELECT column list for a projection (all columns for None).
+
+    Display columns are selected under their API name.
+    """
+    if fields is None:
+        fields = get_library_columns(db)
+    return ', '.join(
+        f'{prefix}{DISPLAY_COLUMNS[c]} AS {c}' if c in DISPLAY_COLUMNS else prefix + c
+        for c in fields
+    )
 
-    valid_sorts = ['date_added', 'finished_reading_at', 'title', 'author', 'my_rating', 'page_count', 'year_published']
-    if sort_by in valid_sorts:
-        order = 'DESC' if sort_order.lower() == 'desc' else 'ASC'
-        query += f' ORDER BY {sort_by} IS NULL, {sort_by} {order}'
 
-    offset = (page - 1) * per_page
-    query += ' LIMIT ? OFFSET ?'
-    params.extend([per_page, offset])
+# --- JSON Serialization ---
 
-    cursor = db.execute(query, params)
-    books = [dict_from_row(row) for row in cursor.fetchall()]
+class RawJSON(str):
+    """Already-serialized JSON, written into encode_json output as-is."""
 
-    for book in books:
-        if not book.get('cover_image_url'):
-            isbn = book.get('isbn13') or book.get('isbn')
-            if isbn:
-                book['cover_image_url'] = get_open_library_cover_url(isbn=isbn, size='L')
 
-    count_query = 'SELECT COUNT(*) FROM library_view WHERE 1=1'
-    count_params = []
-    if status:
-        count_query += ' AND status = ?'
-        count_params.append(status)
-    if search:
-        count_query += ' AND (title LIKE ? OR author LIKE ?)'
-        count_params.extend([f'%{search}%', f'%{search}%'])
+@lru_cache(maxsize=64)
+def _json_object_sql(columns: tuple[str, ...], prefix: str) -> str:
+    return 'json_object(' + ', '.join(f"'{c}', {prefix}{DISPLAY_COLUMNS.get(c, c)}" for c in columns) + ')'
 
-    total = db.execute(count_query, count_params).fetchone()[0]
 
-    return jsonify({
-        'books': books,
-        'total': total,
-        'page': page,
+def json_object_sql(columns: list[str], prefix: str = '') -> str:
+    """Build a json_object(...) expression that serializes the given columns of a row.
+
+    Large lists are serialized by SQLite this way, one string per row, instead
+    of building a dict per row and encoding it again in Python.
+    """
+    return _json_object_sql(tuple(columns), prefix)
+
+
+def encode_json(value) -> str:
+    """Encode dicts, lists and scalars to JSON, splicing in RawJSON values unchanged."""
+    if isinstance(value, RawJSON):
+        return value
+    if isinstance(value, dict):
+        return '{' + ','.join(f'{json.dumps(str(k))}:{encode_json(v)}' for k, v in value.items()) + '}'
+    if isinstance(value, (list, tuple)):
+        return '[' + ','.join(encode_json(v) for v in value) + ']'
+    return json.dumps(value)
+
+
+def json_response(value) -> Response:
+    """Build a JSON response from a value that may contain RawJSON parts."""
+    return Response(encode_json(value) + '\n', mimetype='application/json')
+
+
+def encode_cursor(sort_by: str, order: str, book: dict) -> str:
+    """Encode an opaque keyset cursor pointing just past the given book."""
+    payload = json.dumps([sort_by, order, book[sort_by], book['user_book_id']])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, sort_by: str, order: str) -> tuple | None:
+    """Decode a keyset cursor, returning (sort_value, user_book_id) or None if invalid."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_sort, cursor_order, value, user_book_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        return None
+    if cursor_sort != sort_by or cursor_order != order or not isinstance(user_book_id, int):
+        return None
+    return value, user_book_id
+
+
+def build_keyset_condition(sort_by: str, order: str, value, user_book_id: int) -> tuple[str, list]:
+    """Build the predicate selecting rows after a cursor.
+
+    Rows are ordered by (sort_by IS NULL, sort_by, user_book_id), with NULL
+    sort values always last and user_book_id breaking ties in the sort direction.
+    """
+    op = '<' if order == 'DESC' else '>'
+    if value is None:
+        return f' AND ({sort_by} IS NULL AND user_book_id {op} ?)', [user_book_id]
+    return (
+        f' AND ({sort_by} IS NULL OR {sort_by} {op} ? OR ({sort_by} = ? AND user_book_id {op} ?))',
+        [value, value, user_book_id],
+    )
+
+
+# Library list sorts -> the user_books column holding the sort key. Each one is
+# indexed alone and after status (see migrate_v11), so a page is an index walk.
+SORT_KEY_COLUMNS = {
+    'date_added': 'date_added',
+    'finished_reading_at': 'finished_reading_at',
+    'my_rating': 'my_rating',
+    'title': 'sort_title',
+    'author': 'sort_author',
+    'page_count': 'sort_page_count',
+    'year_published': 'sort_year_published',
+}
+
+
+def build_sort_walks(sort_by: str, order: str, position: tuple = None) -> list[tuple[str, list, str]]:
+    """Split a sorted library read into index walks of (condition, params, order_by).
+
+    Rows are ordered as in build_keyset_condition, NULL sort values last. A
+    sort key index yields the rows with a value and the rows without one in
+    that order, but not both in one walk, so a page is read from the first
+    walk and topped up from the second. A position starts the walks past it.
+    """
+    column = f'ub.{SORT_KEY_COLUMNS[sort_by]}'
+    op = '<' if order == 'DESC' else '>'
+    with_value = (f'{column} IS NOT NULL', [])
+    without_value = (f'{column} IS NULL', [])
+    if position is not None:
+        value, user_book_id = position
+        if value is None:
+            with_value = None
+            without_value = (f'{column} IS NULL AND ub.id {op} ?', [user_book_id])
+        else:
+            # Never true for a NULL sort value, so those rows are left to the second walk
+            with_value = (f'({column}, ub.id) {op} (?, ?)', [value, user_book_id])
+
+    walks = []
+    if with_value:
+        walks.append((*with_value, f'{column} {order}, ub.id {order}'))
+    walks.append((*without_value, f'ub.id {order}'))
+    return walks
+
+
+def load_sorted_page(db, fields: list[str], status: str | None, sort_by: str, order: str,
+                     limit: int, offset: int, position: tuple = None) -> list[tuple]:
+    """Read a page of the library list as (json, sort value, user_book_id) rows.
+
+    An offset still walks the rows it skips, so deep pages are cheaper by cursor.
+    """
+    column = f'ub.{SORT_KEY_COLUMNS[sort_by]}'
+    status_where = 'ub.status = ? AND ' if status else ''
+    status_params = [status] if status else []
+
+    rows = []
+    for condition, params, order_by in build_sort_walks(sort_by, order, position):
+        where = f'WHERE {status_where}{condition}'
+        # CROSS JOIN keeps user_books, read in index order, as the outer loop
+        cursor = db.execute(f'''
+            SELECT {json_object_sql(fields, 'lv.')}, {column}, ub.id
+            FROM user_books ub CROSS JOIN library_view lv ON lv.user_book_id = ub.id
+            {where} ORDER BY {order_by} LIMIT ? OFFSET ?
+        ''', status_params + params + [limit - len(rows), offset])
+        cursor.row_factory = None
+        found = cursor.fetchall()
+        if found or not offset:
+            offset = 0
+        else:
+            # The offset skipped this whole walk; carry the rest into the next one
+            offset -= db.execute(f'SELECT COUNT(*) FROM user_books ub {where}', status_params + params).fetchone()[0]
+        rows += found
+        if len(rows) >= limit:
+            break
+    return rows
+
+
+def load_search_page(db, fields: list[str], fts_query: str, status: str | None, sort_by: str, order: str,
+                     limit: int, offset: int, position: tuple = None,
+                     include_total: bool = True) -> tuple[list[tuple], int | None]:
+    """Read a page of search results as (json, sort value, user_book_id) rows, plus the total.
+
+    MATCH narrows the library first, so the matches are sorted in full.
+    """
+    source, source_params = build_library_source(fts_query)
+    where, params = build_library_filters(status)
+    params = source_params + params
+
+    page_where = where
+    page_params = list(params)
+    if position is not None:
+        keyset, keyset_params = build_keyset_condition(sort_by, order, *position)
+        page_where += keyset
+        page_params += keyset_params
+
+    # The total is computed over the filtered set only, so it is only
+    # available from the page statement itself when no cursor narrows it.
+    total_in_page = include_total and position is None
+    total_column = ', COUNT(*) OVER () AS _total' if total_in_page else ''
+
+    cursor = db.execute(
+        f'SELECT {json_object_sql(fields)}, {sort_by}, user_book_id{total_column} FROM {source} {page_where}'
+        f' ORDER BY {sort_by} IS NULL, {sort_by} {order}, user_book_id {order}'
+        ' LIMIT ? OFFSET ?',
+        page_params + [limit, offset],
+    )
+    cursor.row_factory = None
+    rows = cursor.fetchall()
+
+    total = None
+    if total_in_page and rows:
+        total = rows[0][3]
+    elif include_total:
+        total = db.execute(f'SELECT COUNT(*) FROM {source} {where}', params).fetchone()[0]
+    return [row[:3] for row in rows], total
+
+
+@app.route('/api/books', methods=['GET'])
+@require_auth
+@revision_etag
+def get_books():
+    """Get all books with filtering and pagination.
+
+    Supports classic page/per_page paging and keyset paging via an opaque
+    cursor (returned as next_cursor). Pass include_total=false to skip
+    counting the filtered set. A search uses the books_fts index and sorts
+    by relevance unless another sort is requested. fields= (comma-separated
+    columns) and/or view=card limit the columns returned per book.
+
+    With ids= (comma-separated book ids) it instead returns those books with
+    their details, as get_book does, honoring include=.
+    """
+    db = get_db()
+
+    if 'ids' in request.args:
+        try:
+            book_ids = list(dict.fromkeys(int(i) for i in request.args['ids'].split(',') if i.strip()))
+            includes = parse_includes(request.args.get('include'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if len(book_ids) > MAX_BATCH_IDS:
+            return jsonify({'error': f'At most {MAX_BATCH_IDS} ids per request'}), 400
+        books = load_book_details(db, book_ids, includes)
+        found = {book['book_id'] for book in books}
+        return jsonify({
+            'books': books,
+            'missing': [book_id for book_id in book_ids if book_id not in found],
+        })
+
+    try:
+        fields = parse_projection(db)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    status = request.args.get('status')
+    search = request.args.get('search', '')
+    fts_query = build_fts_query(search)
+    sort_by = request.args.get('sort', 'relevance' if fts_query else 'date_added')
+    sort_order = request.args.get('order', 'desc')
+    page = int(request.args.get('page', 1))
+    per_page = int(request.args.get('per_page', 50))
+    cursor_token = request.args.get('cursor')
+    include_total = request.args.get('include_total', 'true').lower() != 'false'
+
+    if sort_by == 'relevance' and fts_query:
+        # bm25 scores are negative; ascending puts the best matches first
+        order = 'ASC'
+    else:
+        if sort_by not in VALID_BOOK_SORTS:
+            sort_by = 'date_added'
+        order = 'DESC' if sort_order.lower() == 'desc' else 'ASC'
+
+    position = None
+    if cursor_token:
+        position = decode_cursor(cursor_token, sort_by, order)
+        if position is None:
+            return jsonify({'error': 'Invalid cursor'}), 400
+    offset = 0 if cursor_token else (page - 1) * per_page
+
+    if fields is None:
+        fields = get_library_columns(db) + (['relevance'] if fts_query else [])
+    # Each row is serialized by SQLite; the sort key rides along for the cursor
+    if fts_query:
+        rows, total = load_search_page(
+            db, fields, fts_query, status, sort_by, order, per_page + 1, offset, position, include_total
+        )
+    else:
+        rows = load_sorted_page(db, fields, status, sort_by, order, per_page + 1, offset, position)
+        total = None
+        if include_total:
+            # Every user_books row has its book (books are never deleted), so the view is not needed
+            where, params = ('WHERE status = ?', [status]) if status else ('', [])
+            total = db.execute(f'SELECT COUNT(*) FROM user_books {where}', params).fetchone()[0]
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(sort_by, order, {sort_by: rows[-1][1], 'user_book_id': rows[-1][2]})
+
+    result = {
+        'books': [RawJSON(row[0]) for row in rows],
         'per_page': per_page,
-        'pages': (total + per_page - 1) // per_page,
-    })
+        'next_cursor': next_cursor,
+    }
+    if not cursor_token:
+        result['page'] = page
+    if total is not None:
+        result['total'] = total
+        result['pages'] = (total + per_page - 1) // per_page
+
+    return json_response(result)
 
 
 @app.route('/api/books', methods=['POST'])
@@ -348,87 +924,130 @@ def create_book():
     user_book_id = cursor.lastrowid
 
     # Return the created book
-    cursor = db.execute('SELECT * FROM library_view WHERE user_book_id = ?', (user_book_id,))
+    cursor = db.execute(
+        f'SELECT {", ".join(get_library_columns(db))} FROM library_view WHERE user_book_id = ?', (user_book_id,)
+    )
     book = dict_from_row(cursor.fetchone())
 
     return jsonify(book), 201
 
 
+# Relations that get_book can include, each loaded as JSON by a correlated
+# subquery so any selection is fetched in a single statement
+BOOK_INCLUDES = {
+    'tags': {
+        'tags': """
+            SELECT json_group_array(json_object('id', t.id, 'name', t.name, 'color', t.color))
+            FROM tags t
+            JOIN user_book_tags ubt ON t.id = ubt.tag_id
+            WHERE ubt.user_book_id = lv.user_book_id
+        """,
+    },
+    'notes': {
+        'notes': """
+            SELECT json_group_array(json(item)) FROM (
+                SELECT json_object('id', id, 'title', title, 'content', content,
+                                   'created_at', created_at, 'updated_at', updated_at) AS item
+                FROM notes
+                WHERE user_book_id = lv.user_book_id
+                ORDER BY created_at DESC
+            )
+        """,
+    },
+    'sessions': {
+        'reading_sessions': """
+            SELECT json_group_array(json(item)) FROM (
+                SELECT json_object('id', id, 'started_at', started_at, 'finished_at', finished_at,
+                                   'pages_read', pages_read, 'notes', notes, 'created_at', created_at) AS item
+                FROM reading_sessions
+                WHERE user_book_id = lv.user_book_id
+                ORDER BY finished_at DESC
+            )
+        """,
+    },
+    'lineage': {
+        'source_book': """
+            SELECT json_object('book_id', b.id, 'title', b.title, 'author', b.author)
+            FROM books b
+            WHERE b.id = lv.source_book_id
+        """,
+        'sparked_books': """
+            SELECT json_group_array(json_object('book_id', s.book_id, 'title', s.title,
+                                                'author', s.author, 'status', s.status))
+            FROM library_view s
+            WHERE s.source_book_id = lv.book_id
+        """,
+    },
+    'paths': {
+        'paths': """
+            SELECT json_group_array(json_object('id', lp.id, 'name', lp.name, 'color', lp.color))
+            FROM learning_paths lp
+            JOIN learning_path_books lpb ON lp.id = lpb.learning_path_id
+            WHERE lpb.user_book_id = lv.user_book_id
+        """,
+    },
+}
+
+# Upper bound for GET /api/books?ids=
+MAX_BATCH_IDS = 100
+
+
+def parse_includes(value: str | None) -> list[str]:
+    """Parse an include= parameter. Missing means everything; raises ValueError on unknown names."""
+    if value is None:
+        return list(BOOK_INCLUDES)
+    includes = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in includes if name not in BOOK_INCLUDES]
+    if unknown:
+        raise ValueError(f'Unknown include: {", ".join(unknown)}')
+    return includes
+
+
+def load_book_details(db, book_ids: list[int], includes: list[str]) -> list[dict]:
+    """Load library_view rows plus the selected relations in one statement.
+
+    Books are returned in the order of book_ids; ids that do not exist are skipped.
+    """
+    relations = [
+        (key, sql) for name in includes for key, sql in BOOK_INCLUDES[name].items()
+    ]
+    columns = ''.join(f',\n({sql}) AS {key}' for key, sql in relations)
+    cursor = db.execute(f'''
+        SELECT {build_projection(db, None, prefix='lv.')}{columns}
+        FROM library_view lv
+        WHERE lv.book_id IN (SELECT value FROM json_each(?))
+    ''', (json.dumps(book_ids),))
+
+    by_id = {}
+    for book_dict in rows_to_dicts(cursor):
+        for key, _ in relations:
+            if book_dict[key] is None:
+                del book_dict[key]
+            else:
+                book_dict[key] = json.loads(book_dict[key])
+        by_id[book_dict['book_id']] = book_dict
+    return [by_id[book_id] for book_id in book_ids if book_id in by_id]
+
+
 @app.route('/api/books/<int:book_id>', methods=['GET'])
 @require_auth
+@revision_etag
 def get_book(book_id: int):
-    """Get a single book with all details."""
-    db = get_db()
+    """Get a single book with its details.
 
-    cursor = db.execute('SELECT * FROM library_view WHERE book_id = ?', (book_id,))
-    book = cursor.fetchone()
+    include= selects relations (comma-separated: tags, notes, sessions,
+    lineage, paths); all are included by default.
+    """
+    try:
+        includes = parse_includes(request.args.get('include'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-    if not book:
+    books = load_book_details(get_db(), [book_id], includes)
+    if not books:
         return jsonify({'error': 'Book not found'}), 404
 
-    book_dict = dict_from_row(book)
-
-    if not book_dict.get('cover_image_url'):
-        isbn = book_dict.get('isbn13') or book_dict.get('isbn')
-        if isbn:
-            book_dict['cover_image_url'] = get_open_library_cover_url(isbn=isbn, size='L')
-
-    # Get tags
-    cursor = db.execute('''
-        SELECT t.id, t.name, t.color
-        FROM tags t
-        JOIN user_book_tags ubt ON t.id = ubt.tag_id
-        WHERE ubt.user_book_id = ?
-    ''', (book_dict['user_book_id'],))
-    book_dict['tags'] = [dict_from_row(row) for row in cursor.fetchall()]
-
-    # Get notes
-    cursor = db.execute('''
-        SELECT id, title, content, created_at, updated_at
-        FROM notes
-        WHERE user_book_id = ?
-        ORDER BY created_at DESC
-    ''', (book_dict['user_book_id'],))
-    book_dict['notes'] = [dict_from_row(row) for row in cursor.fetchall()]
-
-    # Get reading sessions
-    cursor = db.execute('''
-        SELECT id, started_at, finished_at, pages_read, notes, created_at
-        FROM reading_sessions
-        WHERE user_book_id = ?
-        ORDER BY finished_at DESC
-    ''', (book_dict['user_book_id'],))
-    book_dict['reading_sessions'] = [dict_from_row(row) for row in cursor.fetchall()]
-
-    # Get source book info if exists
-    if book_dict.get('source_book_id'):
-        cursor = db.execute('''
-            SELECT b.id as book_id, b.title, b.author
-            FROM books b
-            WHERE b.id = ?
-        ''', (book_dict['source_book_id'],))
-        source_book = cursor.fetchone()
-        if source_book:
-            book_dict['source_book'] = dict_from_row(source_book)
-
-    # Get books sparked from this book
-    cursor = db.execute('''
-        SELECT lv.book_id, lv.title, lv.author, lv.status
-        FROM library_view lv
-        WHERE lv.source_book_id = ?
-    ''', (book_id,))
-    book_dict['sparked_books'] = [dict_from_row(row) for row in cursor.fetchall()]
-
-    # Get learning paths
-    cursor = db.execute('''
-        SELECT lp.id, lp.name, lp.color
-        FROM learning_paths lp
-        JOIN learning_path_books lpb ON lp.id = lpb.learning_path_id
-        WHERE lpb.user_book_id = ?
-    ''', (book_dict['user_book_id'],))
-    book_dict['paths'] = [dict_from_row(row) for row in cursor.fetchall()]
-
-    return jsonify(book_dict)
+    return jsonify(books[0])
 
 
 @app.route('/api/books/<int:book_id>/enrich', methods=['POST'])
@@ -445,14 +1064,7 @@ def enrich_book(book_id: int):
 
     book_dict = dict_from_row(book)
 
-    ol_book = None
-    if book_dict['isbn13']:
-        ol_book = get_open_library_book_by_isbn(book_dict['isbn13'])
-    if not ol_book and book_dict['isbn']:
-        ol_book = get_open_library_book_by_isbn(book_dict['isbn'])
-    if not ol_book:
-        results = search_open_library(f"{book_dict['title']} {book_dict['author']}", limit=1)
-        ol_book = results[0] if results else None
+    ol_book = openlibrary.find_book(book_dict, cache=open_library_cache, timeout=OPEN_LIBRARY_TIMEOUT)
 
     if not ol_book:
         return jsonify({'error': 'Book not found in Open Library'}), 404
@@ -477,126 +1089,106 @@ def enrich_book(book_id: int):
 @app.route('/api/books/enrich-all', methods=['POST'])
 @require_auth
 def enrich_all_books():
-    """Enrich books by fetching cover IDs from Open Library."""
-    db = get_db()
+    """Start (or resume) background enrichment of book covers from Open Library.
 
-    cursor = db.execute('''
-        SELECT id, isbn, isbn13, title, author
-        FROM books
-        WHERE cover_image_url IS NULL OR cover_image_url LIKE '%covers.openlibrary.org/b/isbn%'
-        LIMIT 50
-    ''')
-    books = cursor.fetchall()
-
-    enriched = 0
-    failed = 0
-
-    for book in books:
-        book_dict = dict_from_row(book)
-        ol_book = None
-
-        if book_dict['isbn13']:
-            ol_book = get_open_library_book_by_isbn(book_dict['isbn13'])
-        if not ol_book and book_dict['isbn']:
-            ol_book = get_open_library_book_by_isbn(book_dict['isbn'])
-        if not ol_book:
-            results = search_open_library(f"{book_dict['title']} {book_dict['author']}", limit=1)
-            ol_book = results[0] if results else None
-
-        if ol_book:
-            info = extract_open_library_info(ol_book)
-            if info['cover_image_url']:
-                db.execute('''
-                    UPDATE books
-                    SET google_books_id = ?,
-                        cover_image_url = ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                ''', (info['open_library_key'], info['cover_image_url'], book_dict['id']))
-                enriched += 1
-            else:
-                failed += 1
-        else:
-            failed += 1
+    Returns immediately; poll /api/books/enrich-all/status for progress.
+    Pass {"resume": false} to start over instead of resuming an interrupted job.
+    """
+    data = request.get_json(silent=True) or {}
+    job = enrichment_engine.start(resume=data.get('resume', True))
+    return jsonify(job), 202
 
-    db.commit()
 
-    remaining = db.execute('''
-        SELECT COUNT(*) FROM books
-        WHERE cover_image_url IS NULL OR cover_image_url LIKE '%covers.openlibrary.org/b/isbn%'
-    ''').fetchone()[0]
+@app.route('/api/books/enrich-all/status', methods=['GET'])
+@require_auth
+def get_enrich_all_status():
+    """Get progress of the latest bulk enrichment job."""
+    job = enrichment_engine.status()
+    if not job:
+        return jsonify({'error': 'No enrichment job found'}), 404
+    return jsonify(job)
 
-    return jsonify({
-        'message': f'Enriched {enriched} books, {failed} not found',
-        'enriched': enriched,
-        'failed': failed,
-        'remaining': remaining,
-    })
+
+@app.route('/api/books/enrich-all/cancel', methods=['POST'])
+@require_auth
+def cancel_enrich_all():
+    """Stop the running bulk enrichment job after its current batch."""
+    job = enrichment_engine.cancel()
+    if not job:
+        return jsonify({'error': 'No enrichment job found'}), 404
+    return jsonify(job)
 
 
 @app.route('/api/stats', methods=['GET'])
 @require_auth
+@revision_etag
 def get_stats():
-    """Get library statistics."""
+    """Get library statistics from the trigger-maintained library_stats rollups."""
     db = get_db()
 
     stats = {}
 
-    cursor = db.execute('SELECT status, COUNT(*) as count FROM user_books GROUP BY status')
-    stats['by_status'] = {row['status']: row['count'] for row in cursor.fetchall()}
+    cursor = db.execute("SELECT key, value FROM library_stats WHERE metric = 'status' AND value > 0")
+    stats['by_status'] = {row['key']: row['value'] for row in cursor.fetchall()}
     stats['total_books'] = sum(stats['by_status'].values())
 
     cursor = db.execute('''
-        SELECT strftime('%Y', finished_reading_at) as year, COUNT(*) as count
-        FROM user_books
-        WHERE finished_reading_at IS NOT NULL
-        GROUP BY year
-        ORDER BY year DESC
+        SELECT key, value FROM library_stats
+        WHERE metric = 'finished_year' AND value > 0
+        ORDER BY key DESC
     ''')
-    stats['books_by_year'] = {row['year']: row['count'] for row in cursor.fetchall() if row['year']}
+    stats['books_by_year'] = {row['key']: row['value'] for row in cursor.fetchall()}
 
     cursor = db.execute('''
-        SELECT AVG(days_to_read) as avg_days
-        FROM library_view
-        WHERE days_to_read IS NOT NULL AND days_to_read >= 0
+        SELECT metric, value FROM library_stats
+        WHERE metric IN ('days_to_read_sum', 'days_to_read_count', 'pages_read')
     ''')
-    result = cursor.fetchone()
-    stats['avg_days_to_read'] = round(result['avg_days'], 1) if result['avg_days'] else None
+    totals = {row['metric']: row['value'] for row in cursor.fetchall()}
+    days_count = totals.get('days_to_read_count')
+    avg_days = totals.get('days_to_read_sum', 0) / days_count if days_count else None
+    stats['avg_days_to_read'] = round(avg_days, 1) if avg_days else None
+    stats['total_pages_read'] = totals.get('pages_read') or 0
 
     cursor = db.execute('''
-        SELECT SUM(b.page_count) as total_pages
-        FROM books b
-        JOIN user_books ub ON b.id = ub.book_id
-        WHERE ub.status = 'finished' AND b.page_count IS NOT NULL
-    ''')
-    result = cursor.fetchone()
-    stats['total_pages_read'] = result['total_pages'] or 0
-
-    cursor = db.execute('''
-        SELECT b.author, COUNT(*) as count
-        FROM books b
-        JOIN user_books ub ON b.id = ub.book_id
-        GROUP BY b.author
-        ORDER BY count DESC
+        SELECT key, value FROM library_stats
+        WHERE metric = 'author' AND value > 0
+        ORDER BY value DESC
         LIMIT 10
     ''')
-    stats['top_authors'] = [{'author': row['author'], 'count': row['count']} for row in cursor.fetchall()]
+    stats['top_authors'] = [{'author': row['key'], 'count': row['value']} for row in cursor.fetchall()]
 
     cursor = db.execute('''
-        SELECT t.name, COUNT(*) as count
-        FROM tags t
-        JOIN user_book_tags ubt ON t.id = ubt.tag_id
-        GROUP BY t.id
-        ORDER BY count DESC
+        SELECT t.name, ls.value
+        FROM library_stats ls
+        JOIN tags t ON t.id = CAST(ls.key AS INTEGER)
+        WHERE ls.metric = 'tag' AND ls.value > 0
+        ORDER BY ls.value DESC
         LIMIT 20
     ''')
-    stats['top_tags'] = [{'tag': row['name'], 'count': row['count']} for row in cursor.fetchall()]
+    stats['top_tags'] = [{'tag': row['name'], 'count': row['value']} for row in cursor.fetchall()]
 
     return jsonify(stats)
 
 
+@app.route('/api/stats/check', methods=['GET'])
+@require_auth
+def check_stats():
+    """Compare the library_stats rollups with a full recompute."""
+    mismatches = library_stats.check(get_db())
+    return jsonify({'consistent': not mismatches, 'mismatches': mismatches})
+
+
+@app.route('/api/stats/rebuild', methods=['POST'])
+@require_auth
+def rebuild_stats():
+    """Rebuild the library_stats rollups from a full recompute."""
+    library_stats.rebuild(get_db())
+    return jsonify({'message': 'Statistics rebuilt'})
+
+
 @app.route('/api/tags', methods=['GET'])
 @require_auth
+@revision_etag
 def get_tags():
     """Get all tags."""
     db = get_db()
@@ -607,7 +1199,7 @@ def get_tags():
         GROUP BY t.id
         ORDER BY book_count DESC
     ''')
-    tags = [dict_from_row(row) for row in cursor.fetchall()]
+    tags = rows_to_dicts(cursor)
     return jsonify(tags)
 
 
@@ -626,6 +1218,54 @@ def search_openlibrary():
     return jsonify({'results': books})
 
 
+@app.route('/api/search/openlibrary/cache', methods=['GET'])
+@require_auth
+def get_openlibrary_cache_stats():
+    """Get Open Library response cache hit/miss counters."""
+    return jsonify(open_library_cache.stats())
+
+
+@app.route('/api/search/openlibrary/cache', methods=['DELETE'])
+@require_auth
+def clear_openlibrary_cache():
+    """Clear the Open Library response cache."""
+    open_library_cache.clear()
+    return '', 204
+
+
+@app.route('/api/response-cache', methods=['GET'])
+@require_auth
+def get_response_cache_stats():
+    """Get response cache hit rate, bytes saved and size for this worker."""
+    return jsonify(response_cache.stats())
+
+
+@app.route('/api/response-cache', methods=['DELETE'])
+@require_auth
+def clear_response_cache():
+    """Clear the response cache of this worker."""
+    response_cache.invalidate()
+    return '', 204
+
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Export request, SQL, Open Library and cache metrics of this worker in Prometheus text format.
+
+    Scrapers authenticate with "Authorization: Bearer <METRICS_TOKEN>" when
+    METRICS_TOKEN is set; otherwise the usual session login applies.
+    """
+    token = os.environ.get('METRICS_TOKEN')
+    authorization = request.headers.get('Authorization', '')
+    if not (token and hmac.compare_digest(authorization, f'Bearer {token}')):
+        return require_auth(render_metrics)()
+    return render_metrics()
+
+
+def render_metrics():
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+
 # --- Book Update API ---
 
 @app.route('/api/books/<int:book_id>', methods=['PATCH'])
@@ -697,70 +1337,209 @@ def update_book(book_id: int):
     db.execute(query, params)
     db.commit()
 
-    cursor = db.execute('SELECT * FROM library_view WHERE book_id = ?', (book_id,))
+    cursor = db.execute(f'SELECT {", ".join(get_library_columns(db))} FROM library_view WHERE book_id = ?', (book_id,))
     updated_book = dict_from_row(cursor.fetchone())
 
     return jsonify(updated_book)
 
 
+OWNERSHIP_FIELDS = ['owns_kindle', 'owns_audible', 'owns_hardcopy']
+
+# Upper bound for explicit ids in a bulk update (filters are unbounded)
+MAX_BULK_IDS = 5000
+
+
+def select_user_book_ids(db, data: dict) -> list[int]:
+    """Resolve a bulk selection to user_book ids.
+
+    The selection is either "ids" (book ids) or "filter", which takes the
+    same status/search parameters as GET /api/books. Raises ValueError if
+    neither is given or ids is not a list of integers.
+    """
+    if 'ids' in data:
+        book_ids = data['ids']
+        if not isinstance(book_ids, list) or not all(
+            isinstance(book_id, int) and not isinstance(book_id, bool) for book_id in book_ids
+        ):
+            raise ValueError('ids must be a list of book ids')
+        if len(book_ids) > MAX_BULK_IDS:
+            raise ValueError(f'At most {MAX_BULK_IDS} ids per request')
+        cursor = db.execute(
+            'SELECT id FROM user_books WHERE book_id IN (SELECT value FROM json_each(?))',
+            (json.dumps(book_ids),)
+        )
+    elif isinstance(data.get('filter'), dict):
+        criteria = data['filter']
+        source, source_params = build_library_source(build_fts_query(criteria.get('search', '')))
+        where, params = build_library_filters(criteria.get('status'))
+        cursor = db.execute(f'SELECT user_book_id FROM {source} {where}', source_params + params)
+    else:
+        raise ValueError('ids or filter is required')
+    return [row[0] for row in cursor]
+
+
+@app.route('/api/books/bulk', methods=['POST'])
+@require_auth
+def bulk_update_books():
+    """Change status, format ownership and tags of many books in one transaction.
+
+    Body: {"ids": [book ids]} or {"filter": {"status": ..., "search": ...}}, plus
+    any of "status", "owns_kindle"/"owns_audible"/"owns_hardcopy", "add_tags"
+    and "remove_tags" (tag names; missing tags are created).
+
+    Status changes get the same side effects as PATCH /api/books/<id>: starting
+    to read sets started_reading_at once, finishing sets finished_reading_at,
+    progress_percent = 100 and current_page = page_count. Books already in the
+    target status are left untouched.
+    """
+    db = get_db()
+    data = request.get_json() or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+
+    status = data.get('status')
+    if status is not None and status not in PIPELINE_STATUSES:
+        return jsonify({'error': f'Invalid status: {status}'}), 400
+    ownership = {field: 1 if data[field] else 0 for field in OWNERSHIP_FIELDS if field in data}
+    for field in ('add_tags', 'remove_tags'):
+        names = data.get(field, [])
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            return jsonify({'error': f'{field} must be a list of tag names'}), 400
+    add_tags = [name.strip() for name in data.get('add_tags', []) if name.strip()]
+    remove_tags = [name.strip() for name in data.get('remove_tags', []) if name.strip()]
+    if status is None and not ownership and not add_tags and not remove_tags:
+        return jsonify({'error': 'No valid changes'}), 400
+
+    try:
+        user_book_ids = select_user_book_ids(db, data)
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    selection = json.dumps(user_book_ids)
+    result = {'matched': len(user_book_ids)}
+
+    if status is not None:
+        cursor = db.execute('''
+            UPDATE user_books
+            SET status = ?1,
+                started_reading_at = CASE WHEN ?1 = 'reading'
+                    THEN COALESCE(started_reading_at, CURRENT_TIMESTAMP) ELSE started_reading_at END,
+                finished_reading_at = CASE WHEN ?1 = 'finished'
+                    THEN CURRENT_TIMESTAMP ELSE finished_reading_at END,
+                progress_percent = CASE WHEN ?1 = 'finished' THEN 100 ELSE progress_percent END,
+                current_page = CASE WHEN ?1 = 'finished' THEN (
+                    SELECT CASE WHEN page_count > 0 THEN page_count ELSE user_books.current_page END
+                    FROM books WHERE books.id = user_books.book_id
+                ) ELSE current_page END,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id IN (SELECT value FROM json_each(?2)) AND status IS NOT ?1
+        ''', (status, selection))
+        result['status_updated'] = cursor.rowcount
+
+    if ownership:
+        assignments = ', '.join(f'{field} = ?' for field in ownership)
+        differs = ' OR '.join(f'{field} IS NOT ?' for field in ownership)
+        cursor = db.execute(f'''
+            UPDATE user_books
+            SET {assignments}, updated_at = CURRENT_TIMESTAMP
+            WHERE id IN (SELECT value FROM json_each(?)) AND ({differs})
+        ''', [*ownership.values(), selection, *ownership.values()])
+        result['ownership_updated'] = cursor.rowcount
+
+    if add_tags:
+        db.executemany('INSERT OR IGNORE INTO tags (name) VALUES (?)', [(name,) for name in add_tags])
+        cursor = db.execute('''
+            INSERT OR IGNORE INTO user_book_tags (user_book_id, tag_id)
+            SELECT ub.value, t.id
+            FROM json_each(?) ub
+            JOIN tags t ON t.name IN (SELECT value FROM json_each(?))
+        ''', (selection, json.dumps(add_tags)))
+        result['tags_added'] = cursor.rowcount
+
+    if remove_tags:
+        cursor = db.execute('''
+            DELETE FROM user_book_tags
+            WHERE user_book_id IN (SELECT value FROM json_each(?))
+              AND tag_id IN (SELECT id FROM tags WHERE name IN (SELECT value FROM json_each(?)))
+        ''', (selection, json.dumps(remove_tags)))
+        result['tags_removed'] = cursor.rowcount
+
+    db.commit()
+
+    return jsonify(result)
+
+
 # --- Dashboard API ---
 
+# Statuses that make a book a candidate for a path's next_book
+UNREAD_STATUSES = ('queued', 'reading', 'owned', 'interested')
+
+# Path counts come from the library_stats rollups; next_book is a seek on
+# idx_learning_path_books_position that stops at the first unread book.
+PATH_ROLLUP_SQL = f'''
+    SELECT
+        lp.id,
+        lp.name,
+        lp.description,
+        lp.objective,
+        lp.color,
+        lp.created_at,
+        COALESCE(total.value, 0) AS total_books,
+        COALESCE(finished.value, 0) AS completed_books,
+        (SELECT b.title FROM learning_path_books lpb
+         JOIN user_books ub ON ub.id = lpb.user_book_id
+         JOIN books b ON b.id = ub.book_id
+         WHERE lpb.learning_path_id = lp.id
+         AND ub.status IN {UNREAD_STATUSES}
+         ORDER BY lpb.position
+         LIMIT 1) AS next_book
+    FROM learning_paths lp
+    LEFT JOIN library_stats total
+        ON total.metric = 'path_books' AND total.key = CAST(lp.id AS TEXT)
+    LEFT JOIN library_stats finished
+        ON finished.metric = 'path_finished' AND finished.key = CAST(lp.id AS TEXT)
+    ORDER BY lp.created_at DESC
+'''
+
+
+def load_path_rollups(db) -> list[dict]:
+    """Get every learning path with total/completed counts and its next unread book."""
+    return rows_to_dicts(db.execute(PATH_ROLLUP_SQL))
+
+
 @app.route('/api/dashboard', methods=['GET'])
 @require_auth
+@revision_etag
+@cached_response
 def get_dashboard():
-    """Get aggregated dashboard data."""
+    """Get aggregated dashboard data.
+
+    fields= and/or view=card limit the columns returned per book.
+    """
     db = get_db()
 
-    cursor = db.execute('''
-        SELECT * FROM library_view
+    try:
+        fields = parse_projection(db)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    columns = build_projection(db, fields)
+
+    cursor = db.execute(f'''
+        SELECT {columns} FROM library_view
         WHERE status = 'reading'
         ORDER BY last_read_at DESC NULLS LAST, priority DESC
     ''')
-    currently_reading = [dict_from_row(row) for row in cursor.fetchall()]
-
-    for book in currently_reading:
-        if not book.get('cover_image_url'):
-            isbn = book.get('isbn13') or book.get('isbn')
-            if isbn:
-                book['cover_image_url'] = get_open_library_cover_url(isbn=isbn, size='L')
+    currently_reading = rows_to_dicts(cursor)
 
-    cursor = db.execute('''
-        SELECT * FROM library_view
+    cursor = db.execute(f'''
+        SELECT {columns} FROM library_view
         WHERE status = 'queued'
         ORDER BY priority DESC, date_added ASC
         LIMIT 10
     ''')
-    queued = [dict_from_row(row) for row in cursor.fetchall()]
+    queued = rows_to_dicts(cursor)
 
-    for book in queued:
-        if not book.get('cover_image_url'):
-            isbn = book.get('isbn13') or book.get('isbn')
-            if isbn:
-                book['cover_image_url'] = get_open_library_cover_url(isbn=isbn, size='L')
-
-    cursor = db.execute('''
-        SELECT
-            lp.id,
-            lp.name,
-            lp.description,
-            lp.color,
-            lp.objective,
-            COUNT(lpb.user_book_id) as total_books,
-            SUM(CASE WHEN ub.status = 'finished' THEN 1 ELSE 0 END) as completed_books,
-            (SELECT lv.title FROM learning_path_books lpb2
-             JOIN library_view lv ON lv.user_book_id = lpb2.user_book_id
-             JOIN user_books ub2 ON ub2.id = lpb2.user_book_id
-             WHERE lpb2.learning_path_id = lp.id
-             AND ub2.status IN ('queued', 'reading', 'owned', 'interested')
-             ORDER BY lpb2.position ASC
-             LIMIT 1) as next_book
-        FROM learning_paths lp
-        LEFT JOIN learning_path_books lpb ON lp.id = lpb.learning_path_id
-        LEFT JOIN user_books ub ON lpb.user_book_id = ub.id
-        GROUP BY lp.id
-        ORDER BY lp.created_at DESC
-    ''')
-    paths = [dict_from_row(row) for row in cursor.fetchall()]
+    paths = load_path_rollups(db)
 
     cursor = db.execute("SELECT value FROM user_settings WHERE key = 'wip_limit'")
     row = cursor.fetchone()
@@ -779,27 +1558,13 @@ def get_dashboard():
 
 @app.route('/api/paths', methods=['GET'])
 @require_auth
+@revision_etag
+@cached_response
 def get_paths():
     """Get all learning paths with book counts and progress."""
     db = get_db()
 
-    cursor = db.execute('''
-        SELECT
-            lp.id,
-            lp.name,
-            lp.description,
-            lp.objective,
-            lp.color,
-            lp.created_at,
-            COUNT(lpb.user_book_id) as total_books,
-            SUM(CASE WHEN ub.status = 'finished' THEN 1 ELSE 0 END) as completed_books
-        FROM learning_paths lp
-        LEFT JOIN learning_path_books lpb ON lp.id = lpb.learning_path_id
-        LEFT JOIN user_books ub ON lpb.user_book_id = ub.id
-        GROUP BY lp.id
-        ORDER BY lp.created_at DESC
-    ''')
-    paths = [dict_from_row(row) for row in cursor.fetchall()]
+    paths = load_path_rollups(db)
 
     return jsonify(paths)
 
@@ -835,6 +1600,8 @@ def create_path():
 
 @app.route('/api/paths/<int:path_id>', methods=['GET'])
 @require_auth
+@revision_etag
+@cached_response
 def get_path(path_id: int):
     """Get a single learning path with its books."""
     db = get_db()
@@ -847,20 +1614,14 @@ def get_path(path_id: int):
 
     path_dict = dict_from_row(path)
 
-    cursor = db.execute('''
-        SELECT lv.*, lpb.position
+    cursor = db.execute(f'''
+        SELECT {build_projection(db, None, prefix='lv.')}, lpb.position
         FROM library_view lv
         JOIN learning_path_books lpb ON lv.user_book_id = lpb.user_book_id
         WHERE lpb.learning_path_id = ?
         ORDER BY lpb.position ASC
     ''', (path_id,))
-    books = [dict_from_row(row) for row in cursor.fetchall()]
-
-    for book in books:
-        if not book.get('cover_image_url'):
-            isbn = book.get('isbn13') or book.get('isbn')
-            if isbn:
-                book['cover_image_url'] = get_open_library_cover_url(isbn=isbn, size='L')
+    books = rows_to_dicts(cursor)
 
     path_dict['books'] = books
     path_dict['total_books'] = len(books)
@@ -916,6 +1677,7 @@ def delete_path(path_id: int):
     if not cursor.fetchone():
         return jsonify({'error': 'Path not found'}), 404
 
+    db.execute('DELETE FROM learning_path_books WHERE learning_path_id = ?', (path_id,))
     db.execute('DELETE FROM learning_paths WHERE id = ?', (path_id,))
     db.commit()
 
@@ -924,28 +1686,32 @@ def delete_path(path_id: int):
 
 @app.route('/api/paths/<int:path_id>/books', methods=['GET'])
 @require_auth
+@revision_etag
 def get_path_books(path_id: int):
-    """Get all books in a learning path."""
+    """Get all books in a learning path.
+
+    fields= and/or view=card limit the columns returned per book.
+    """
     db = get_db()
 
+    try:
+        fields = parse_projection(db)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     cursor = db.execute('SELECT * FROM learning_paths WHERE id = ?', (path_id,))
     if not cursor.fetchone():
         return jsonify({'error': 'Path not found'}), 404
 
-    cursor = db.execute('''
-        SELECT lv.*, lpb.position
+    columns = build_projection(db, fields, prefix='lv.')
+    cursor = db.execute(f'''
+        SELECT {columns}, lpb.position
         FROM library_view lv
         JOIN learning_path_books lpb ON lv.user_book_id = lpb.user_book_id
         WHERE lpb.learning_path_id = ?
         ORDER BY lpb.position ASC
     ''', (path_id,))
-    books = [dict_from_row(row) for row in cursor.fetchall()]
-
-    for book in books:
-        if not book.get('cover_image_url'):
-            isbn = book.get('isbn13') or book.get('isbn')
-            if isbn:
-                book['cover_image_url'] = get_open_library_cover_url(isbn=isbn, size='L')
+    books = rows_to_dicts(cursor)
 
     return jsonify(books)
 
@@ -953,7 +1719,11 @@ def get_path_books(path_id: int):
 @app.route('/api/paths/<int:path_id>/books', methods=['POST'])
 @require_auth
 def add_book_to_path(path_id: int):
-    """Add a book to a learning path."""
+    """Add a book to a learning path.
+
+    The book goes at the end unless "before" or "after" names a user_book_id
+    already in the path.
+    """
     db = get_db()
     data = request.get_json()
 
@@ -976,13 +1746,14 @@ def add_book_to_path(path_id: int):
     if cursor.fetchone():
         return jsonify({'error': 'Book already in path'}), 409
 
-    cursor = db.execute('''
-        SELECT MAX(position) as max_pos FROM learning_path_books WHERE learning_path_id = ?
-    ''', (path_id,))
-    row = cursor.fetchone()
-    next_pos = (row['max_pos'] or 0) + 1
-
-    position = data.get('position', next_pos)
+    # Placed before/after another book in the path, at an explicit rank, or at the end
+    place = 'before' if 'before' in data else 'after' if 'after' in data else None
+    if place:
+        position = path_ranks.position_between(db, path_id, data[place], place)
+        if position is None:
+            return jsonify({'error': f'{place} book not in path'}), 400
+    else:
+        position = data['position'] if 'position' in data else path_ranks.next_position(db, path_id)
 
     db.execute('''
         INSERT INTO learning_path_books (learning_path_id, user_book_id, position)
@@ -1030,22 +1801,59 @@ def reorder_path_books(path_id: int):
     if not book_order:
         return jsonify({'error': 'books list is required'}), 400
 
-    for item in book_order:
-        db.execute('''
-            UPDATE learning_path_books
-            SET position = ?
-            WHERE learning_path_id = ? AND user_book_id = ?
-        ''', (item['position'], path_id, item['user_book_id']))
+    db.executemany('''
+        UPDATE learning_path_books
+        SET position = ?
+        WHERE learning_path_id = ? AND user_book_id = ? AND position IS NOT ?
+    ''', [(item['position'], path_id, item['user_book_id'], item['position']) for item in book_order])
 
     db.commit()
 
     return jsonify({'message': 'Books reordered'})
 
 
+@app.route('/api/paths/<int:path_id>/books/<int:user_book_id>/move', methods=['PATCH'])
+@require_auth
+def move_path_book(path_id: int, user_book_id: int):
+    """Move a book just before or after another book in the same path.
+
+    Body: {"before": user_book_id} or {"after": user_book_id}. Only the moved
+    row is written (see path_ranks).
+    """
+    db = get_db()
+    data = request.get_json() or {}
+
+    place = 'before' if 'before' in data else 'after' if 'after' in data else None
+    if not place:
+        return jsonify({'error': 'before or after is required'}), 400
+    if data[place] == user_book_id:
+        return jsonify({'error': 'Cannot move a book relative to itself'}), 400
+
+    cursor = db.execute('''
+        SELECT 1 FROM learning_path_books
+        WHERE learning_path_id = ? AND user_book_id = ?
+    ''', (path_id, user_book_id))
+    if not cursor.fetchone():
+        return jsonify({'error': 'Book not in path'}), 404
+
+    position = path_ranks.position_between(db, path_id, data[place], place, moving_id=user_book_id)
+    if position is None:
+        return jsonify({'error': f'{place} book not in path'}), 400
+
+    db.execute('''
+        UPDATE learning_path_books SET position = ?
+        WHERE learning_path_id = ? AND user_book_id = ?
+    ''', (position, path_id, user_book_id))
+    db.commit()
+
+    return jsonify({'message': 'Book moved', 'position': position})
+
+
 # --- Settings API ---
 
 @app.route('/api/settings', methods=['GET'])
 @require_auth
+@revision_etag
 def get_settings():
     """Get all user settings."""
     db = get_db()
@@ -1077,50 +1885,196 @@ def update_settings():
     return jsonify(data)
 
 
+# --- Batch API ---
+
+# Routes that may be replayed through POST /api/batch
+BATCH_ENDPOINTS = {
+    'create_book', 'update_book', 'bulk_update_books',
+    'create_path', 'update_path', 'delete_path',
+    'add_book_to_path', 'remove_book_from_path', 'reorder_path_books', 'move_path_book',
+    'update_settings',
+}
+
+MAX_BATCH_OPERATIONS = 500
+
+
+def validate_batch_operation(operation) -> str | None:
+    """Return why a batch operation is malformed, or None if it can be dispatched."""
+    if not isinstance(operation, dict):
+        return 'must be an object'
+    if not isinstance(operation.get('method'), str):
+        return 'method must be a string'
+    path = operation.get('path')
+    if not isinstance(path, str) or not path.startswith('/api/'):
+        return 'path must be a string starting with /api/'
+    if 'body' in operation and not isinstance(operation['body'], dict):
+        return 'body must be an object'
+    return None
+
+
+def run_batch_operation(db, operation: dict) -> tuple[int, object]:
+    """Dispatch one validated batch operation to its route handler. Returns (status, body)."""
+    method = operation['method'].upper()
+    path = operation['path']
+    try:
+        endpoint, view_args = app.url_map.bind('').match(path, method=method)
+    except HTTPException as e:
+        return e.code, {'error': e.description}
+    if endpoint not in BATCH_ENDPOINTS:
+        return 400, {'error': f'{method} {path} is not allowed in a batch'}
+
+    # The batch request is already authenticated; call the handler under require_auth
+    view = app.view_functions[endpoint].__wrapped__
+    with app.test_request_context(path, method=method, json=operation.get('body', {})):
+        g.db = db
+        response = make_response(view(**view_args))
+    return response.status_code, response.get_json(silent=True)
+
+
+@app.route('/api/batch', methods=['POST'])
+@require_auth
+def run_batch():
+    """Apply an ordered list of mutations in a single transaction.
+
+    Body: {"operations": [{"method": "PATCH", "path": "/api/books/1", "body": {...}}, ...],
+           "atomic": false}
+
+    Each operation runs in its own savepoint, so a failed operation is undone
+    on its own and the rest are committed together. With atomic=true the first
+    failure rolls back the whole batch and later operations are not run.
+    """
+    data = request.get_json() or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    operations = data.get('operations')
+    atomic = bool(data.get('atomic', False))
+
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'error': 'operations list is required'}), 400
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return jsonify({'error': f'At most {MAX_BATCH_OPERATIONS} operations per batch'}), 400
+    for index, operation in enumerate(operations):
+        problem = validate_batch_operation(operation)
+        if problem:
+            return jsonify({'error': f'Operation {index}: {problem}', 'index': index}), 400
+
+    conn = get_db()
+    # Handlers commit their own work; inside the batch only the final commit counts
+    db = database.DeferredCommitConnection(conn)
+    results = []
+    failed = False
+
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        for operation in operations:
+            conn.execute('SAVEPOINT batch_operation')
+            try:
+                status, body = run_batch_operation(db, operation)
+            except HTTPException as e:
+                status, body = e.code, {'error': e.description}
+            except Exception as e:
+                status, body = 500, {'error': str(e)}
+            finally:
+                g.db = conn
+
+            if status < 400:
+                conn.execute('RELEASE batch_operation')
+            else:
+                conn.execute('ROLLBACK TO batch_operation')
+                conn.execute('RELEASE batch_operation')
+                failed = True
+            results.append({'status': status, 'body': body})
+
+            if failed and atomic:
+                break
+
+        committed = not (failed and atomic)
+        if committed:
+            conn.commit()
+        else:
+            conn.rollback()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return jsonify({'committed': committed, 'results': results})
+
+
 # --- Pipeline/Books by Status API ---
 
+# Learning path memberships of every book, as a JSON array per user_book_id
+BOOK_PATHS_SQL = '''
+    SELECT lpb.user_book_id,
+           json_group_array(json_object('id', lp.id, 'name', lp.name, 'color', lp.color)) AS paths
+    FROM learning_path_books lpb
+    JOIN learning_paths lp ON lp.id = lpb.learning_path_id
+    GROUP BY lpb.user_book_id
+'''
+
+
+PIPELINE_STATUSES = ['interested', 'owned', 'queued', 'reading', 'finished', 'abandoned']
+
+
+def load_pipeline_board(db, fields: list[str] = None) -> dict[str, list[RawJSON]]:
+    """Load every pipeline card grouped by status, each card serialized by SQLite.
+
+    Runs one ordered query regardless of library size, with each book's
+    learning path memberships joined in. fields limits the library_view
+    columns per card (all by default).
+    """
+    if fields is None:
+        fields = get_library_columns(db)
+    card = json_object_sql(fields, prefix='lv.')
+    cursor = db.execute(f'''
+        WITH memberships AS ({BOOK_PATHS_SQL})
+        SELECT lv.status, json_insert({card}, '$.paths', json(COALESCE(m.paths, '[]')))
+        FROM library_view lv
+        LEFT JOIN memberships m ON m.user_book_id = lv.user_book_id
+        ORDER BY
+            CASE lv.status
+                WHEN 'interested' THEN 0
+                WHEN 'owned' THEN 1
+                WHEN 'queued' THEN 2
+                WHEN 'reading' THEN 3
+                WHEN 'finished' THEN 4
+                WHEN 'abandoned' THEN 5
+            END,
+            CASE WHEN lv.status = 'reading' THEN lv.last_read_at END DESC,
+            CASE WHEN lv.status = 'queued' THEN lv.priority END DESC,
+            CASE WHEN lv.status = 'finished' THEN lv.finished_reading_at END DESC,
+            lv.date_added DESC
+    ''')
+    cursor.row_factory = None
+
+    pipeline = {status: [] for status in PIPELINE_STATUSES}
+    for status, book in cursor:
+        pipeline[status].append(RawJSON(book))
+    return pipeline
+
+
 @app.route('/api/pipeline', methods=['GET'])
 @require_auth
+@revision_etag
+@cached_response
 def get_pipeline():
-    """Get all books organized by status for the pipeline/kanban view."""
+    """Get all books organized by status for the pipeline/kanban view.
+
+    fields= and/or view=card limit the columns returned per book.
+    """
     db = get_db()
 
-    pipeline = {}
-    statuses = ['interested', 'owned', 'queued', 'reading', 'finished', 'abandoned']
+    try:
+        fields = parse_projection(db)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-    for status in statuses:
-        cursor = db.execute('''
-            SELECT * FROM library_view
-            WHERE status = ?
-            ORDER BY
-                CASE WHEN status = 'reading' THEN last_read_at END DESC,
-                CASE WHEN status = 'queued' THEN priority END DESC,
-                CASE WHEN status = 'finished' THEN finished_reading_at END DESC,
-                date_added DESC
-        ''', (status,))
-        books = [dict_from_row(row) for row in cursor.fetchall()]
-
-        for book in books:
-            if not book.get('cover_image_url'):
-                isbn = book.get('isbn13') or book.get('isbn')
-                if isbn:
-                    book['cover_image_url'] = get_open_library_cover_url(isbn=isbn, size='L')
-
-            cursor2 = db.execute('''
-                SELECT lp.id, lp.name, lp.color
-                FROM learning_paths lp
-                JOIN learning_path_books lpb ON lp.id = lpb.learning_path_id
-                WHERE lpb.user_book_id = ?
-            ''', (book['user_book_id'],))
-            book['paths'] = [dict_from_row(row) for row in cursor2.fetchall()]
-
-        pipeline[status] = books
+    pipeline = load_pipeline_board(db, fields)
 
     cursor = db.execute("SELECT value FROM user_settings WHERE key = 'wip_limit'")
     row = cursor.fetchone()
     wip_limit = int(row['value']) if row else 5
 
-    return jsonify({
+    return json_response({
         'pipeline': pipeline,
         'wip_limit': wip_limit,
     })
@@ -1131,84 +2085,119 @@ def get_pipeline():
 @app.route('/api/export/json', methods=['GET'])
 @require_auth
 def export_json():
-    """Export full library data as JSON."""
+    """Export the full library as a streamed JSON array of typed records."""
     db = get_db()
+    response = Response(
+        stream_with_context(library_export.iter_json_array(db)),
+        mimetype='application/json',
+    )
+    response.headers['Content-Disposition'] = 'attachment; filename=book-tracker-export.json'
+    return response
 
-    # Get all books with full details
-    cursor = db.execute('SELECT * FROM library_view')
-    books = [dict_from_row(row) for row in cursor.fetchall()]
-
-    # Get all paths
-    cursor = db.execute('SELECT * FROM learning_paths')
-    paths = [dict_from_row(row) for row in cursor.fetchall()]
-
-    # Get path-book relationships
-    cursor = db.execute('SELECT * FROM learning_path_books')
-    path_books = [dict_from_row(row) for row in cursor.fetchall()]
-
-    # Get all tags
-    cursor = db.execute('SELECT * FROM tags')
-    tags = [dict_from_row(row) for row in cursor.fetchall()]
-
-    # Get all book-tag relationships
-    cursor = db.execute('SELECT * FROM user_book_tags')
-    book_tags = [dict_from_row(row) for row in cursor.fetchall()]
-
-    # Get all notes
-    cursor = db.execute('SELECT * FROM notes')
-    notes = [dict_from_row(row) for row in cursor.fetchall()]
 
-    # Get settings
-    cursor = db.execute('SELECT * FROM user_settings')
-    settings = {row['key']: row['value'] for row in cursor.fetchall()}
+@app.route('/api/export/ndjson', methods=['GET'])
+@require_auth
+def export_ndjson():
+    """Export the full library as streamed NDJSON, one typed record per line."""
+    db = get_db()
+    response = Response(
+        stream_with_context(library_export.iter_ndjson(db)),
+        mimetype='application/x-ndjson',
+    )
+    response.headers['Content-Disposition'] = 'attachment; filename=book-tracker-export.ndjson'
+    return response
 
-    export_data = {
-        'export_version': '1.0',
-        'exported_at': date.today().isoformat(),
-        'books': books,
-        'learning_paths': paths,
-        'learning_path_books': path_books,
-        'tags': tags,
-        'book_tags': book_tags,
-        'notes': notes,
-        'settings': settings,
-    }
 
-    response = jsonify(export_data)
-    response.headers['Content-Disposition'] = 'attachment; filename=book-tracker-export.json'
-    return response
+@app.route('/api/import', methods=['POST'])
+@require_auth
+def import_library():
+    """Restore an NDJSON or JSON export into an empty library, streaming the request body."""
+    db = get_db()
+    try:
+        counts = library_export.import_records(db, library_export.parse_lines(request.stream))
+    except (library_export.ExportFormatError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except sqlite3.IntegrityError as e:
+        # import_records has already rolled back
+        return jsonify({'error': f'Import conflicts with existing data: {e}'}), 409
+
+    return jsonify({'message': 'Library imported', 'counts': counts}), 201
+
+
+EXPORT_CHUNK_SIZE = 500
+
+
+def iter_csv_rows(cursor, columns: list[str], compress: bool = False, first_rows: list = ()):
+    """Yield CSV-encoded chunks of a cursor's rows, reading fetchmany-sized batches.
+
+    Memory stays bounded by one chunk regardless of result size. With compress,
+    the output is a single gzip stream. first_rows are rows already fetched
+    from the cursor.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def flush():
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(data) if compressor else data
+
+    writer.writerow(columns)
+    writer.writerows(first_rows)
+    while True:
+        rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+        if not rows:
+            break
+        writer.writerows(rows)
+        chunk = flush()
+        if chunk:
+            yield chunk
+
+    tail = flush()
+    if compressor:
+        tail += compressor.flush()
+    if tail:
+        yield tail
 
 
 @app.route('/api/export/csv', methods=['GET'])
 @require_auth
 def export_csv():
-    """Export books as CSV."""
-    db = get_db()
+    """Export books as CSV, streamed in chunks.
 
-    cursor = db.execute('SELECT * FROM library_view ORDER BY date_added DESC')
-    books = cursor.fetchall()
-
-    if not books:
-        return jsonify({'error': 'No books to export'}), 404
+    Optional query parameters: columns (comma-separated library_view columns),
+    status (comma-separated statuses) and gzip=1 for a gzip-compressed file.
+    """
+    db = get_db()
 
-    # Get column names from first row
-    columns = books[0].keys()
+    available = get_library_columns(db)
+    columns = [c.strip() for c in request.args.get('columns', '').split(',') if c.strip()] or available
+    unknown = [c for c in columns if c not in available]
+    if unknown:
+        return jsonify({'error': f'Unknown columns: {", ".join(unknown)}'}), 400
 
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=columns)
-    writer.writeheader()
+    query = f'SELECT {", ".join(columns)} FROM library_view'
+    params = []
+    statuses = [s.strip() for s in request.args.get('status', '').split(',') if s.strip()]
+    if statuses:
+        query += f' WHERE status IN ({", ".join("?" * len(statuses))})'
+        params.extend(statuses)
+    query += ' ORDER BY date_added DESC'
 
-    for book in books:
-        writer.writerow(dict_from_row(book))
+    cursor = db.execute(query, params)
+    first_rows = cursor.fetchmany(1)
+    if not first_rows:
+        return jsonify({'error': 'No books to export'}), 404
 
-    csv_content = output.getvalue()
-    output.close()
+    compress = request.args.get('gzip', '').lower() in ('1', 'true')
 
-    from flask import Response
+    filename = 'book-tracker-export.csv.gz' if compress else 'book-tracker-export.csv'
     return Response(
-        csv_content,
-        mimetype='text/csv',
-        headers={'Content-Disposition': 'attachment; filename=book-tracker-export.csv'}
+        stream_with_context(iter_csv_rows(cursor, columns, compress, first_rows)),
+        mimetype='application/gzip' if compress else 'text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
     )
 
 
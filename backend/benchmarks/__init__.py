@@ -0,0 +1 @@
+"""Benchmarks for the Book Tracker backend. Run modules from the backend directory."""
@@ -0,0 +1,109 @@
+"""Bulk status changes must have the same side effects as PATCH /api/books/<id>.
+
+Usage (from backend/): python -m benchmarks.bulk_update
+
+Each case is a pair of books in the same state: one is moved to the target
+status with PATCH /api/books/<id>, the other with POST /api/books/bulk
+(one bulk request per target status). Cases cover every change between
+statuses from a few starting states, with a page count that is positive,
+0 and missing, since finishing copies page_count into current_page only
+when there is one. Each book's changes are compared, with timestamps read
+as kept, set now, or empty. A bulk change to the status a book already has
+must leave it untouched. Exits 1 on any mismatch.
+"""
+
+import itertools
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.fixtures import STATUSES, build_library
+
+# (status, started_reading_at, finished_reading_at, current_page, progress_percent, last_read_at)
+START_STATES = [
+    ('interested', None, None, 0, 0, None),
+    ('reading', '2024-01-02 08:00:00', None, 120, 40, '2024-02-01 09:00:00'),
+    ('finished', '2024-01-02 08:00:00', '2024-03-01 10:00:00', 250, 100, '2024-03-01 10:00:00'),
+]
+PAGE_COUNTS = [300, 0, None]
+
+TIMESTAMP_COLUMNS = ('started_reading_at', 'finished_reading_at', 'last_read_at')
+# Bookkeeping the two paths are free to differ on
+IGNORED_COLUMNS = ('id', 'book_id', 'created_at', 'updated_at')
+
+
+def changes(before: sqlite3.Row, after: sqlite3.Row) -> dict:
+    """The columns a status change touched, with timestamps reduced to 'now' or None."""
+    changed = {}
+    for column in after.keys():
+        if column in IGNORED_COLUMNS or after[column] == before[column]:
+            continue
+        value = after[column]
+        if column in TIMESTAMP_COLUMNS and value is not None:
+            value = 'now'
+        changed[column] = value
+    return changed
+
+
+def main():
+    cases = [
+        (start, page_count, target)
+        for start, page_count, target in itertools.product(START_STATES, PAGE_COUNTS, STATUSES)
+    ]
+    volume = Path(tempfile.mkdtemp(prefix='bt-bench-bulk-'))
+    build_library(volume / 'books.db', 2 * len(cases))
+
+    conn = sqlite3.connect(volume / 'books.db')
+    conn.row_factory = sqlite3.Row
+    for i, ((status, started, finished, current_page, progress, last_read), page_count, _) in enumerate(cases):
+        pair = (2 * i + 1, 2 * i + 2)
+        conn.execute('UPDATE books SET page_count = ? WHERE id IN (?, ?)', (page_count, *pair))
+        conn.execute('''
+            UPDATE user_books
+            SET status = ?, started_reading_at = ?, finished_reading_at = ?,
+                current_page = ?, progress_percent = ?, last_read_at = ?
+            WHERE book_id IN (?, ?)
+        ''', (status, started, finished, current_page, progress, last_read, *pair))
+    conn.commit()
+    before = {row['book_id']: row for row in conn.execute('SELECT * FROM user_books')}
+
+    # The app reads its database location from the environment at import
+    os.environ['RAILWAY_VOLUME_MOUNT_PATH'] = str(volume)
+    import app as app_module
+    client = app_module.app.test_client()
+
+    for i, (_, _, target) in enumerate(cases):
+        response = client.patch(f'/api/books/{2 * i + 1}', json={'status': target})
+        assert response.status_code == 200, (response.status_code, response.get_json())
+    for target in STATUSES:
+        ids = [2 * i + 2 for i, case in enumerate(cases) if case[2] == target]
+        response = client.post('/api/books/bulk', json={'ids': ids, 'status': target})
+        assert response.status_code == 200, (response.status_code, response.get_json())
+
+    after = {row['book_id']: row for row in conn.execute('SELECT * FROM user_books')}
+    conn.close()
+
+    failures = []
+    for i, (start, page_count, target) in enumerate(cases):
+        patched, bulk = 2 * i + 1, 2 * i + 2
+        expected = changes(before[patched], after[patched])
+        actual = changes(before[bulk], after[bulk])
+        if start[0] == target:
+            # Books already in the target status are left untouched
+            expected = {}
+        if actual != expected:
+            failures.append(f'{start[0]} -> {target}, page_count {page_count}: PATCH {expected}, bulk {actual}')
+
+    for failure in failures:
+        print(failure)
+    if failures:
+        print(f'\n{len(failures)} of {len(cases)} status changes differ between PATCH and bulk')
+        sys.exit(1)
+    print(f'{len(cases)} status changes ({len(START_STATES)} starting states x {len(STATUSES)} statuses'
+          f' x page_count {", ".join(map(str, PAGE_COUNTS))}) have the same side effects through PATCH and bulk')
+
+
+if __name__ == '__main__':
+    main()
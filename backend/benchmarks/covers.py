@@ -0,0 +1,111 @@
+"""Cover proxy against a local stub origin: cold, warm and conditional requests.
+
+Usage (from backend/): python -m benchmarks.covers [covers]
+
+A stub covers origin on localhost serves deterministic images with simulated
+latency (one key in ten has no cover). Every cover is requested cold, then
+warm, then with If-None-Match, and a burst of concurrent requests for one
+uncached cover checks that they share a single origin fetch.
+"""
+
+import hashlib
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+DEFAULT_COVERS = 50
+ORIGIN_LATENCY = 0.05
+COVER_BYTES = {'S': 2 * 1024, 'M': 20 * 1024, 'L': 120 * 1024}
+
+
+class StubOrigin(BaseHTTPRequestHandler):
+    """Serves /b/<kind>/<value>-<size>.jpg with bytes derived from the value."""
+
+    requests = []
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        StubOrigin.requests.append(path)
+        time.sleep(ORIGIN_LATENCY)
+        name = path.rsplit('/', 1)[-1].removesuffix('.jpg')
+        value, _, size = name.rpartition('-')
+        if value.endswith('0') or size not in COVER_BYTES:
+            self.send_response(404)
+            self.end_headers()
+            return
+        seed = hashlib.sha256(value.encode()).digest()
+        body = (seed * (COVER_BYTES[size] // len(seed) + 1))[:COVER_BYTES[size]]
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def timed(client, url: str, **kwargs):
+    started = time.perf_counter()
+    response = client.get(url, **kwargs)
+    return time.perf_counter() - started, response
+
+
+def main(n_covers: int):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubOrigin)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    volume = Path(tempfile.mkdtemp(prefix='bt-bench-covers-'))
+    os.environ['RAILWAY_VOLUME_MOUNT_PATH'] = str(volume)
+    os.environ['OPEN_LIBRARY_COVERS_URL'] = f'http://127.0.0.1:{server.server_port}/b'
+    import app as app_module
+    client = app_module.app.test_client()
+
+    urls = [f'/covers/isbn/978{i:010d}-M.jpg' for i in range(1, n_covers + 1)]
+    cold, warm, conditional = [], [], []
+    for url in urls:
+        seconds, response = timed(client, url)
+        cold.append(seconds)
+        if response.status_code == 404:
+            continue
+        assert response.status_code == 200, response.status_code
+        assert 'immutable' in response.headers['Cache-Control']
+        etag = response.headers['ETag']
+
+        seconds, response = timed(client, url)
+        warm.append(seconds)
+        assert response.status_code == 200
+
+        seconds, response = timed(client, url, headers={'If-None-Match': etag})
+        conditional.append(seconds)
+        assert response.status_code == 304
+
+    origin_fetches = len(StubOrigin.requests)
+    for url in urls:
+        client.get(url)
+    assert len(StubOrigin.requests) == origin_fetches, 'cached covers were fetched again'
+
+    StubOrigin.requests.clear()
+    burst_url = '/covers/isbn/9789999999999-L.jpg'
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        statuses = list(pool.map(lambda _: app_module.app.test_client().get(burst_url).status_code, range(16)))
+    assert statuses == [200] * 16, statuses
+
+    server.shutdown()
+    print(f"origin latency {ORIGIN_LATENCY * 1000:.0f}ms, {n_covers} covers ({len(warm)} found)")
+    print(f"{'request':>12} {'median ms':>10} {'p95 ms':>8}")
+    for label, timings in (('cold', cold), ('warm', warm), ('304', conditional)):
+        p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        print(f"{label:>12} {statistics.median(timings) * 1000:>10.2f} {p95 * 1000:>8.2f}")
+    print(f"16 concurrent requests for one uncached cover: {len(StubOrigin.requests)} origin fetch(es)")
+    print(f"cache: {app_module.cover_store.stats()}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COVERS)
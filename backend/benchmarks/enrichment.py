@@ -0,0 +1,246 @@
+"""Bulk enrichment against a local stub Open Library: rate limit, checkpoints, cancel and resume.
+
+Usage (from backend/): python -m benchmarks.enrichment [books]
+
+A stub search.json on localhost answers ISBN lookups with simulated latency:
+most ISBN-13 lookups find a cover, one book in five is not found anywhere,
+and one in seven gets a 500 for its ISBN-13 and is found by its ISBN-10.
+Title and author lookups find nothing. Every step asserts:
+
+    run        POST /api/books/enrich-all, polled through the status endpoint,
+               enriches exactly the books the stub has covers for, commits a
+               checkpoint per batch and never exceeds the concurrency or the
+               token-bucket rate
+    cancel     a cancelled job stops at a batch boundary and stays stopped
+    resume     a new engine (a restarted worker) resumes the cancelled job
+               from its checkpoint; no book is looked up twice
+    heartbeat  a running job whose heartbeat is stale reads as interrupted
+               and is resumed; one with a fresh heartbeat (another worker)
+               is left alone
+
+The stub's 500s are logged as "Open Library API error" lines; they are expected.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from benchmarks.fixtures import build_library
+
+DEFAULT_BOOKS = 60
+STUB_LATENCY = 0.02
+CONCURRENCY = 4
+RATE = 40.0
+BATCH_SIZE = 10
+
+
+def stub_answer(query: str) -> tuple[int, int | None]:
+    """(status, cover id or None) the stub gives for a search query."""
+    if query.startswith('isbn:978'):
+        book_id = int(query[8:])
+        if book_id % 5 == 0:
+            return 200, None
+        if book_id % 7 == 0:
+            return 500, None
+        return 200, book_id
+    if query.startswith('isbn:'):
+        book_id = int(query[5:])
+        return 200, book_id if book_id % 7 == 0 else None
+    return 200, None
+
+
+def has_cover(book_id: int) -> bool:
+    return book_id % 5 != 0 or book_id % 7 == 0
+
+
+class StubOpenLibrary(BaseHTTPRequestHandler):
+    """Serves /search.json per stub_answer, recording each query and the peak concurrency."""
+
+    lock = threading.Lock()
+    queries = []  # (monotonic time, q)
+    in_flight = 0
+    peak_in_flight = 0
+    latency = STUB_LATENCY
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)['q'][0]
+        with StubOpenLibrary.lock:
+            StubOpenLibrary.queries.append((time.monotonic(), query))
+            StubOpenLibrary.in_flight += 1
+            StubOpenLibrary.peak_in_flight = max(StubOpenLibrary.peak_in_flight, StubOpenLibrary.in_flight)
+        try:
+            time.sleep(StubOpenLibrary.latency)
+            status, cover_id = stub_answer(query)
+            docs = [{'key': f'/works/OL{cover_id}W', 'title': 'Found', 'cover_i': cover_id}] if cover_id else []
+            body = json.dumps({'docs': docs}).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with StubOpenLibrary.lock:
+                StubOpenLibrary.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+def reset_stub():
+    with StubOpenLibrary.lock:
+        StubOpenLibrary.queries = []
+        StubOpenLibrary.peak_in_flight = 0
+
+
+def isbn13_lookups() -> list[int]:
+    return [int(q[8:]) for _, q in StubOpenLibrary.queries if q.startswith('isbn:978')]
+
+
+def reset_library(db_path):
+    """Forget covers and jobs, so every book is a candidate again."""
+    conn = sqlite3.connect(db_path)
+    conn.execute('UPDATE books SET cover_image_url = NULL, google_books_id = NULL')
+    conn.execute('DELETE FROM enrichment_jobs')
+    conn.commit()
+    conn.close()
+
+
+def wait_for(predicate, timeout: float = 60, interval: float = 0.02):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(interval)
+    raise AssertionError('Timed out waiting for the enrichment job')
+
+
+def check_run(app_module, n_books: int):
+    client = app_module.app.test_client()
+    reset_stub()
+    started = time.monotonic()
+    response = client.post('/api/books/enrich-all', json={})
+    assert response.status_code == 202, response.status_code
+    assert response.get_json()['status'] == 'running'
+
+    checkpoints = set()
+
+    def completed():
+        job = client.get('/api/books/enrich-all/status').get_json()
+        checkpoints.add(job['last_book_id'])
+        return job if job['status'] == 'completed' else None
+
+    job = wait_for(completed)
+    elapsed = time.monotonic() - started
+
+    expected = sum(1 for book_id in range(1, n_books + 1) if has_cover(book_id))
+    assert (job['total'], job['processed'], job['enriched']) == (n_books, n_books, expected), job
+    assert job['failed'] == n_books - expected, job
+    conn = sqlite3.connect(app_module.DATABASE)
+    covered = {row[0] for row in conn.execute("SELECT id FROM books WHERE cover_image_url LIKE '%/b/id/%'")}
+    conn.close()
+    assert covered == {book_id for book_id in range(1, n_books + 1) if has_cover(book_id)}
+
+    # Checkpoints only ever land on batch boundaries
+    assert checkpoints <= {0, n_books} | set(range(BATCH_SIZE, n_books + 1, BATCH_SIZE)), sorted(checkpoints)
+
+    # The bucket starts full (one token per worker), then refills at RATE per second
+    times = [t for t, _ in StubOpenLibrary.queries]
+    lower_bound = (len(times) - CONCURRENCY) / RATE
+    assert times[-1] - times[0] >= lower_bound * 0.95, (times[-1] - times[0], lower_bound)
+    assert StubOpenLibrary.peak_in_flight <= CONCURRENCY, StubOpenLibrary.peak_in_flight
+    print(f"run        {n_books} books, {len(times)} lookups in {elapsed:.2f}s"
+          f" (rate limit floor {lower_bound:.2f}s), peak concurrency {StubOpenLibrary.peak_in_flight},"
+          f" {job['enriched']} enriched, {len(checkpoints)} checkpoints seen")
+
+
+def check_cancel_and_resume(db_path, n_books: int):
+    from enrichment import EnrichmentEngine
+
+    reset_library(db_path)
+    reset_stub()
+    StubOpenLibrary.latency = 0.1
+    engine = EnrichmentEngine(db_path, concurrency=1, rate=1000, batch_size=5)
+    job = engine.start()
+    wait_for(lambda: engine.status()['processed'] >= 5)
+    engine.cancel()
+    engine._thread.join(timeout=30)
+    cancelled = engine.status()
+    assert cancelled['status'] == 'cancelled', cancelled
+    assert cancelled['processed'] % 5 == 0 and 0 < cancelled['processed'] < n_books, cancelled
+    assert cancelled['last_book_id'] == cancelled['processed'], cancelled
+    time.sleep(0.3)
+    assert engine.status()['processed'] == cancelled['processed'], 'a cancelled job kept running'
+    print(f"cancel     stopped after {cancelled['processed']} of {n_books} books, on a batch boundary")
+
+    # A new engine stands in for a restarted worker
+    StubOpenLibrary.latency = STUB_LATENCY
+    restarted = EnrichmentEngine(db_path, concurrency=CONCURRENCY, rate=1000, batch_size=BATCH_SIZE)
+    resumed = restarted.start(resume=True)
+    assert resumed['id'] == job['id'] and resumed['status'] == 'running', resumed
+    restarted._thread.join(timeout=60)
+    final = restarted.status()
+    assert final['status'] == 'completed' and final['processed'] == n_books, final
+    lookups = isbn13_lookups()
+    assert sorted(lookups) == list(range(1, n_books + 1)), 'a book was skipped or looked up twice'
+    print(f"resume     job {final['id']} finished from its checkpoint; each book looked up once")
+
+
+def check_heartbeat(db_path):
+    from enrichment import EnrichmentEngine
+
+    reset_library(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        INSERT INTO enrichment_jobs (status, total, processed, last_book_id, started_at, updated_at)
+        VALUES ('running', 10, 0, 0, datetime('now', '-1 hour'), datetime('now', '-1 hour'))
+    ''')
+    conn.commit()
+
+    engine = EnrichmentEngine(db_path, rate=1000, batch_size=BATCH_SIZE, stale_after=120)
+    assert engine.status()['status'] == 'interrupted'
+    job = engine.start(resume=True)
+    assert job['status'] == 'running' and engine._thread is not None
+    engine._thread.join(timeout=60)
+    assert engine.status()['status'] == 'completed'
+
+    # A fresh heartbeat means another worker owns the job
+    conn.execute("UPDATE enrichment_jobs SET status = 'running', updated_at = CURRENT_TIMESTAMP")
+    conn.commit()
+    conn.close()
+    other = EnrichmentEngine(db_path, rate=1000, batch_size=BATCH_SIZE, stale_after=120)
+    assert other.status()['status'] == 'running'
+    job = other.start(resume=True)
+    assert job['status'] == 'running' and other._thread is None, 'a job with a live heartbeat was started twice'
+    print("heartbeat  stale job reported interrupted and resumed; live job in another worker left alone")
+
+
+def main(n_books: int):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubOpenLibrary)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    volume = Path(tempfile.mkdtemp(prefix='bt-bench-enrich-'))
+    build_library(volume / 'books.db', n_books)
+    # The app reads these at import
+    os.environ['RAILWAY_VOLUME_MOUNT_PATH'] = str(volume)
+    os.environ['OPEN_LIBRARY_SEARCH_URL'] = f'http://127.0.0.1:{server.server_port}/search.json'
+    os.environ['ENRICH_CONCURRENCY'] = str(CONCURRENCY)
+    os.environ['ENRICH_RATE_LIMIT'] = str(RATE)
+    os.environ['ENRICH_BATCH_SIZE'] = str(BATCH_SIZE)
+    import app as app_module
+
+    check_run(app_module, n_books)
+    check_cancel_and_resume(app_module.DATABASE, n_books)
+    check_heartbeat(app_module.DATABASE)
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BOOKS)
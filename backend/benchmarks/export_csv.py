@@ -0,0 +1,89 @@
+"""Peak memory of the streaming CSV export across library sizes.
+
+Usage (from backend/): python -m benchmarks.export_csv [sizes...]
+
+Each size runs in a fresh process against its own fixture database. Peak
+Python allocation is measured with tracemalloc for the streaming endpoint and
+for the previous fetchall-and-buffer approach, for comparison.
+"""
+
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.fixtures import build_library
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+
+def measure_streaming(client) -> dict:
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = client.get('/api/export/csv')
+    size = sum(len(chunk) for chunk in response.response)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'bytes': size, 'seconds': round(elapsed, 3), 'peak_kib': peak // 1024}
+
+
+def measure_buffered(db_path) -> dict:
+    import sqlite3
+    tracemalloc.start()
+    started = time.perf_counter()
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    books = conn.execute('SELECT * FROM library_view ORDER BY date_added DESC').fetchall()
+    output = io.StringIO()
+    # The previous export had no display_cover_url column
+    fieldnames = [key for key in books[0].keys() if key != 'display_cover_url']
+    writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction='ignore')
+    writer.writeheader()
+    for book in books:
+        writer.writerow(dict(zip(book.keys(), book)))
+    size = len(output.getvalue())
+    conn.close()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'bytes': size, 'seconds': round(elapsed, 3), 'peak_kib': peak // 1024}
+
+
+def run_child():
+    import app as app_module
+    client = app_module.app.test_client()
+    result = {
+        'streaming': measure_streaming(client),
+        'buffered': measure_buffered(app_module.DATABASE),
+    }
+    print(json.dumps(result))
+
+
+def main(sizes: list[int]):
+    workdir = Path(tempfile.mkdtemp(prefix='bt-bench-export-'))
+    print(f"{'books':>9} {'stream peak KiB':>16} {'buffered peak KiB':>18} {'stream s':>9} {'buffered s':>11}")
+    for n in sizes:
+        volume = workdir / str(n)
+        build_library(volume / 'books.db', n)
+        env = dict(os.environ, RAILWAY_VOLUME_MOUNT_PATH=str(volume))
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.export_csv', '--child'],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        s, b = result['streaming'], result['buffered']
+        print(f"{n:>9} {s['peak_kib']:>16} {b['peak_kib']:>18} {s['seconds']:>9} {b['seconds']:>11}")
+
+
+if __name__ == '__main__':
+    if '--child' in sys.argv:
+        run_child()
+    else:
+        main([int(a) for a in sys.argv[1:]] or DEFAULT_SIZES)
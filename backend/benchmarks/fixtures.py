@@ -0,0 +1,139 @@
+"""Deterministic synthetic library databases for benchmarks."""
+
+import random
+import sqlite3
+from pathlib import Path
+
+SCHEMA_PATH = Path(__file__).parent.parent / 'schema.sql'
+
+STATUSES = ['interested', 'owned', 'queued', 'reading', 'finished', 'abandoned']
+WORDS = [
+    'history', 'python', 'garden', 'systems', 'design', 'habits', 'ocean', 'empire', 'mind',
+    'code', 'war', 'peace', 'data', 'light', 'stone', 'river', 'night', 'city', 'craft', 'money',
+]
+
+
+def build_library(db_path, n_books: int, seed: int = 42):
+    """Create a books.db at db_path with n_books books and matching user_books rows."""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    if db_path.exists():
+        db_path.unlink()
+
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    with open(SCHEMA_PATH) as f:
+        conn.executescript(f.read())
+
+    batch = 10000
+    for start in range(0, n_books, batch):
+        ids = range(start + 1, min(start + batch, n_books) + 1)
+        books = []
+        user_books = []
+        for book_id in ids:
+            title = ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 4))).title()
+            books.append((
+                book_id, f'gr{book_id}', f'{book_id:010d}', f'978{book_id:010d}', title,
+                f'Author {rnd.randint(1, max(1, n_books // 8))}', 'Example Press',
+                rnd.randint(80, 900), rnd.randint(1900, 2024),
+                ' '.join(rnd.choice(WORDS) for _ in range(40)),
+            ))
+            status = rnd.choice(STATUSES)
+            added = f'20{rnd.randint(10, 24)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} 12:00:00'
+            finished = f'2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}' if status == 'finished' else None
+            user_books.append((
+                book_id, book_id, status, rnd.choice([None, 1, 2, 3, 4, 5]), added, finished,
+                f'2024-06-{rnd.randint(1, 28):02d}' if status == 'reading' else None,
+                rnd.randint(0, 5),
+            ))
+        conn.executemany('''
+            INSERT INTO books (
+                id, goodreads_id, isbn, isbn13, title, author, publisher,
+                page_count, year_published, description
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', books)
+        conn.executemany('''
+            INSERT INTO user_books (
+                id, book_id, status, my_rating, date_added, finished_reading_at, last_read_at, priority
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', user_books)
+        conn.commit()
+
+    conn.execute("INSERT OR IGNORE INTO user_settings (key, value) VALUES ('wip_limit', '5')")
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def add_learning_paths(db_path, n_paths: int, books_per_path: int = 20, seed: int = 42):
+    """Add n_paths learning paths, each holding books_per_path random books from the library."""
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    user_book_ids = [row[0] for row in conn.execute('SELECT id FROM user_books')]
+
+    for path_id in range(1, n_paths + 1):
+        conn.execute(
+            'INSERT INTO learning_paths (id, name, created_at) VALUES (?, ?, ?)',
+            (path_id, f'Path {path_id}', f'2024-01-01 00:{path_id // 60 % 60:02d}:{path_id % 60:02d}')
+        )
+        members = rnd.sample(user_book_ids, min(books_per_path, len(user_book_ids)))
+        conn.executemany(
+            'INSERT INTO learning_path_books (learning_path_id, user_book_id, position) VALUES (?, ?, ?)',
+            [(path_id, ub_id, (i + 1) * 1024) for i, ub_id in enumerate(members)]
+        )
+    conn.commit()
+    conn.close()
+
+
+def add_library_details(db_path, n_tags: int = 60, seed: int = 42):
+    """Add tags, notes, reading sessions and covers to a library built by build_library.
+
+    Tag popularity is skewed (a few tags on many books), finished and reading
+    books get reading sessions, about one book in five has notes, and half the
+    books have a stored cover.
+    """
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        'INSERT INTO tags (id, name, color) VALUES (?, ?, ?)',
+        [(tag_id, f'{rnd.choice(WORDS)}-{tag_id}', f'#{rnd.randint(0, 0xFFFFFF):06x}') for tag_id in range(1, n_tags + 1)]
+    )
+    conn.execute('''
+        UPDATE books SET cover_image_url = 'https://covers.openlibrary.org/b/id/' || id || '-L.jpg'
+        WHERE id % 2 = 0
+    ''')
+
+    batch = 10000
+    user_books = conn.execute('SELECT id, status, date_added FROM user_books ORDER BY id').fetchall()
+    weights = [1 / rank for rank in range(1, n_tags + 1)]
+    for start in range(0, len(user_books), batch):
+        tags, notes, sessions = [], [], []
+        for ub_id, status, added in user_books[start:start + batch]:
+            for tag_id in set(rnd.choices(range(1, n_tags + 1), weights, k=rnd.randint(0, 4))):
+                tags.append((ub_id, tag_id))
+            if rnd.random() < 0.2:
+                for _ in range(rnd.randint(1, 5)):
+                    notes.append((ub_id, rnd.choice(WORDS).title(), ' '.join(rnd.choice(WORDS) for _ in range(60))))
+            if status in ('reading', 'finished'):
+                for _ in range(rnd.randint(1, 20)):
+                    started = f'2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} 20:00:00'
+                    sessions.append((ub_id, started, started, rnd.randint(5, 60)))
+        conn.executemany('INSERT INTO user_book_tags (user_book_id, tag_id) VALUES (?, ?)', tags)
+        conn.executemany('INSERT INTO notes (user_book_id, title, content) VALUES (?, ?, ?)', notes)
+        conn.executemany(
+            'INSERT INTO reading_sessions (user_book_id, started_at, finished_at, pages_read) VALUES (?, ?, ?, ?)',
+            sessions
+        )
+        conn.commit()
+    conn.close()
+
+
+def build_fixture(db_path, n_books: int, seed: int = 42):
+    """Build a complete synthetic library: books, tags, notes, sessions and learning paths.
+
+    Path count grows with the library (one per 500 books, between 5 and 200).
+    """
+    build_library(db_path, n_books, seed)
+    add_library_details(db_path, seed=seed)
+    add_learning_paths(db_path, min(200, max(5, n_books // 500)), books_per_path=min(20, n_books), seed=seed)
+    return Path(db_path)
@@ -0,0 +1,81 @@
+"""Throughput of the batched Goodreads importer, in rows per second.
+
+Usage (from backend/): python -m benchmarks.goodreads_import [rows...]
+
+For each size, a synthetic Goodreads export is imported into a fresh database
+and then re-imported over it (the incremental upsert path).
+"""
+
+import contextlib
+import csv
+import io
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+from import_goodreads import import_csv
+
+DEFAULT_SIZES = [1000, 20000]
+
+COLUMNS = [
+    'Book Id', 'Title', 'Author', 'Author l-f', 'Additional Authors', 'ISBN', 'ISBN13', 'My Rating',
+    'Average Rating', 'Publisher', 'Binding', 'Number of Pages', 'Year Published',
+    'Original Publication Year', 'Date Read', 'Date Added', 'Bookshelves', 'Bookshelves with positions',
+    'Exclusive Shelf', 'My Review', 'Spoiler', 'Private Notes', 'Read Count', 'Owned Copies',
+]
+SHELVES = ['read', 'currently-reading', 'to-read']
+CUSTOM_SHELVES = [f'shelf-{i}' for i in range(40)]
+
+
+def write_export(path: Path, rows: int, seed: int = 7):
+    """Write a synthetic Goodreads library export CSV."""
+    rnd = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        for i in range(1, rows + 1):
+            shelf = rnd.choice(SHELVES)
+            custom = rnd.sample(CUSTOM_SHELVES, rnd.randint(0, 3))
+            writer.writerow({
+                'Book Id': str(100000 + i),
+                'Title': f'Synthetic Book {i}',
+                'Author': f'Author {rnd.randint(1, rows // 5 + 1)}',
+                'Additional Authors': '',
+                'ISBN': f'="{i:010d}"',
+                'ISBN13': f'="978{i:010d}"',
+                'My Rating': str(rnd.randint(0, 5)),
+                'Average Rating': f'{rnd.uniform(2.5, 4.8):.2f}',
+                'Publisher': 'Example Press',
+                'Binding': 'Paperback',
+                'Number of Pages': str(rnd.randint(80, 900)),
+                'Year Published': str(rnd.randint(1950, 2024)),
+                'Original Publication Year': str(rnd.randint(1900, 2024)),
+                'Date Read': f'2023/{rnd.randint(1, 12):02d}/{rnd.randint(1, 28):02d}' if shelf == 'read' else '',
+                'Date Added': f'2022/{rnd.randint(1, 12):02d}/{rnd.randint(1, 28):02d}',
+                'Bookshelves': ', '.join(custom + [shelf]),
+                'Bookshelves with positions': '',
+                'Exclusive Shelf': shelf,
+                'My Review': '',
+                'Spoiler': '',
+                'Private Notes': '',
+                'Read Count': '1' if shelf == 'read' else '0',
+                'Owned Copies': '0',
+            })
+
+
+def main(sizes: list[int]):
+    workdir = Path(tempfile.mkdtemp(prefix='bt-bench-import-'))
+    print(f"{'rows':>8} {'fresh rows/s':>13} {'re-import rows/s':>17}")
+    for rows in sizes:
+        csv_path = workdir / f'export-{rows}.csv'
+        db_path = workdir / f'books-{rows}.db'
+        write_export(csv_path, rows)
+        with contextlib.redirect_stdout(io.StringIO()):
+            fresh = import_csv(str(csv_path), str(db_path))
+            again = import_csv(str(csv_path), str(db_path))
+        print(f"{rows:>8} {fresh['rows_per_second']:>13} {again['rows_per_second']:>17}")
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or DEFAULT_SIZES)
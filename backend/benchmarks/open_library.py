@@ -0,0 +1,170 @@
+"""Open Library client against a local stub server: keep-alive, gzip, coalescing, timeouts.
+
+Usage (from backend/): python -m benchmarks.open_library [searches]
+
+A stub search.json on localhost answers with simulated latency, gzips when
+asked and keeps connections alive. Sequential searches run through a fresh
+urllib.request.urlopen per lookup (the previous client) and through the
+pooled client, comparing latency, connections and bytes on the wire. Then a
+burst of identical concurrent searches checks that they share one request,
+an idle connection dropped by the server is retried, and a body trickled
+slower than the timeout budget fails within the budget.
+
+Over plain HTTP on localhost the saving is the TCP connect only; against
+openlibrary.org each reused connection also skips a TLS handshake.
+"""
+
+import gzip
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_SEARCHES = 200
+SERVER_LATENCY = 0.005
+CONCURRENT_SEARCHES = 16
+# Seconds the stub keeps an idle connection open
+IDLE_TIMEOUT = 0.5
+
+
+class StubOpenLibrary(BaseHTTPRequestHandler):
+    """Serves /search.json with `limit` fake docs, and /slow as a trickled body."""
+
+    protocol_version = 'HTTP/1.1'
+    timeout = IDLE_TIMEOUT
+    lock = threading.Lock()
+    connections = 0
+    requests = 0
+    bytes_sent = 0
+    delay = SERVER_LATENCY
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out as separate writes; without this, Nagle and
+        # delayed ACKs add ~40ms to every response on a kept-alive connection
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with StubOpenLibrary.lock:
+            StubOpenLibrary.connections += 1
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        with StubOpenLibrary.lock:
+            StubOpenLibrary.requests += 1
+        if url.path == '/slow':
+            self.send_response(200)
+            self.send_header('Content-Length', '20')
+            self.end_headers()
+            try:
+                for _ in range(20):
+                    time.sleep(0.1)
+                    self.wfile.write(b'x')
+                    self.wfile.flush()
+            except ConnectionError:
+                pass  # the client gave up
+            return
+
+        time.sleep(StubOpenLibrary.delay)
+        params = urllib.parse.parse_qs(url.query)
+        limit = int(params.get('limit', ['5'])[0])
+        docs = [{
+            'key': f'/works/OL{i}W', 'title': f"{params['q'][0]} {i}", 'author_name': ['Author'],
+            'isbn': ['9780000000001', '0000000001'], 'subject': ['Fiction'] * 20,
+        } for i in range(limit)]
+        body = json.dumps({'numFound': limit, 'docs': docs}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with StubOpenLibrary.lock:
+            StubOpenLibrary.bytes_sent += len(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def reset_counts():
+    StubOpenLibrary.connections = StubOpenLibrary.requests = StubOpenLibrary.bytes_sent = 0
+
+
+def urlopen_search(query: str, limit: int) -> list[dict]:
+    """The client before the pool: a new connection per lookup, no compression."""
+    import openlibrary
+    params = urllib.parse.urlencode({'q': query, 'limit': limit, 'fields': openlibrary.SEARCH_FIELDS})
+    with urllib.request.urlopen(f'{openlibrary.OPEN_LIBRARY_SEARCH}?{params}', timeout=10) as response:
+        return json.loads(response.read().decode()).get('docs', [])
+
+
+def main(n_searches: int):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubOpenLibrary)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}'
+    # The search URL is read when openlibrary is imported
+    os.environ['OPEN_LIBRARY_SEARCH_URL'] = f'{base}/search.json'
+    import http_client
+    import openlibrary
+
+    print(f"stub latency {SERVER_LATENCY * 1000:.0f}ms, {n_searches} sequential searches of 10 docs")
+    print(f"{'client':>10} {'median ms':>10} {'p95 ms':>8} {'connections':>12} {'KiB sent':>9}")
+    results = {}
+    for label, fetch in (('urlopen', urlopen_search), ('pooled', openlibrary.fetch_search)):
+        reset_counts()
+        timings = []
+        for i in range(n_searches):
+            started = time.perf_counter()
+            results[label] = fetch(f'query {i % 10}', 10)
+            timings.append(time.perf_counter() - started)
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        print(f"{label:>10} {statistics.median(timings) * 1000:>10.2f} {p95 * 1000:>8.2f}"
+              f" {StubOpenLibrary.connections:>12} {StubOpenLibrary.bytes_sent / 1024:>9.1f}")
+    assert results['urlopen'] == results['pooled'], 'gzip decoding changed the response'
+
+    # Identical searches while one is in flight share it; the stub is slowed so they overlap
+    StubOpenLibrary.delay = 0.2
+    barrier = threading.Barrier(CONCURRENT_SEARCHES)
+
+    def burst(search):
+        barrier.wait()
+        return search('the same title', limit=3)
+
+    for label, search in (('fetch_search', openlibrary.fetch_search), ('search', openlibrary.search)):
+        reset_counts()
+        with ThreadPoolExecutor(max_workers=CONCURRENT_SEARCHES) as pool:
+            found = list(pool.map(lambda _: burst(search), range(CONCURRENT_SEARCHES)))
+        assert all(len(docs) == 3 for docs in found), found
+        print(f"{CONCURRENT_SEARCHES} concurrent identical searches via {label}: {StubOpenLibrary.requests} request(s)")
+    assert StubOpenLibrary.requests == 1
+    StubOpenLibrary.delay = SERVER_LATENCY
+
+    # The stub drops idle connections; the next search retries on a new one
+    client = http_client.HTTPClient(idle_timeout=60)
+    client.get(f'{base}/search.json?q=warm&limit=1')
+    time.sleep(IDLE_TIMEOUT * 2)
+    reset_counts()
+    assert json.loads(client.get(f'{base}/search.json?q=stale&limit=1').body)['docs']
+    print(f"search over a connection the server dropped: {StubOpenLibrary.connections} new connection(s)")
+
+    # One budget for the whole call, however steadily the bytes arrive
+    started = time.perf_counter()
+    try:
+        client.get(f'{base}/slow', timeout=0.5)
+        raise AssertionError('a 2s body finished within a 0.5s budget')
+    except TimeoutError:
+        pass
+    print(f"2s trickled body with a 0.5s budget: gave up after {time.perf_counter() - started:.2f}s")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SEARCHES)
@@ -0,0 +1,84 @@
+"""Learning path progress query: aggregate over memberships vs library_stats rollups.
+
+Usage (from backend/): python -m benchmarks.path_rollups [paths...]
+
+Each size builds a 5,000-book library with that many 20-book paths and times
+the previous dashboard query against load_path_rollups (median of several runs),
+checking that both return the same rows.
+"""
+
+import os
+import statistics
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.fixtures import add_learning_paths, build_library
+
+DEFAULT_SIZES = [10, 100, 1000]
+N_BOOKS = 5000
+RUNS = 5
+
+# get_dashboard's learning path query before the library_stats rollups
+CORRELATED_SQL = '''
+    SELECT
+        lp.id,
+        lp.name,
+        lp.description,
+        lp.color,
+        lp.objective,
+        COUNT(lpb.user_book_id) as total_books,
+        SUM(CASE WHEN ub.status = 'finished' THEN 1 ELSE 0 END) as completed_books,
+        (SELECT lv.title FROM learning_path_books lpb2
+         JOIN library_view lv ON lv.user_book_id = lpb2.user_book_id
+         JOIN user_books ub2 ON ub2.id = lpb2.user_book_id
+         WHERE lpb2.learning_path_id = lp.id
+         AND ub2.status IN ('queued', 'reading', 'owned', 'interested')
+         ORDER BY lpb2.position ASC
+         LIMIT 1) as next_book
+    FROM learning_paths lp
+    LEFT JOIN learning_path_books lpb ON lp.id = lpb.learning_path_id
+    LEFT JOIN user_books ub ON lpb.user_book_id = ub.id
+    GROUP BY lp.id
+    ORDER BY lp.created_at DESC
+'''
+
+
+def time_query(conn, sql: str) -> tuple[float, list]:
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        rows = conn.execute(sql).fetchall()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), rows
+
+
+def main(sizes: list[int]):
+    workdir = Path(tempfile.mkdtemp(prefix='bt-bench-paths-'))
+    print(f"{'paths':>7} {'correlated ms':>14} {'rollup ms':>10} {'speedup':>8}")
+    for n in sizes:
+        volume = workdir / str(n)
+        db_path = build_library(volume / 'books.db', N_BOOKS)
+        add_learning_paths(db_path, n)
+
+        # The app reads its database location from the environment at import
+        os.environ['RAILWAY_VOLUME_MOUNT_PATH'] = str(volume)
+        from app import PATH_ROLLUP_SQL
+
+        conn = sqlite3.connect(db_path)
+        old_seconds, old_rows = time_query(conn, CORRELATED_SQL)
+        new_seconds, new_rows = time_query(conn, PATH_ROLLUP_SQL)
+        conn.close()
+
+        old = {row[0]: (row[5], row[6], row[7]) for row in old_rows}
+        new = {row[0]: (row[6], row[7], row[8]) for row in new_rows}
+        if old != new:
+            raise AssertionError(f'Rollups differ from the correlated query at {n} paths')
+
+        print(f"{n:>7} {old_seconds * 1000:>14.1f} {new_seconds * 1000:>10.1f} {old_seconds / new_seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,122 @@
+"""Query count check: read endpoints must run the same number of statements at any library size.
+
+Usage (from backend/):
+    python -m benchmarks.query_counts [--sizes 100,2000]
+
+Each size gets a fresh fixture (benchmarks.fixtures.build_fixture) and a fresh
+process. Every route in ROUTES is requested twice with the response cache
+cleared, and the statements of the second request are counted with a trace
+callback on the pooled connections. The first request warms one-off reads
+such as the library_view column list; statements run by triggers are not
+counted. Exits 1 when a route's count differs between sizes, which is how an
+N+1 query (one statement per book) shows up.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.fixtures import build_fixture
+
+DEFAULT_SIZES = [100, 2000]
+
+# Routes whose statement count must not grow with the library
+ROUTES = [
+    '/api/pipeline',
+    '/api/pipeline?view=card',
+    '/api/dashboard',
+    '/api/dashboard?view=card',
+    '/api/books',
+    # A sorted page reads a second index walk (NULL sort values) only when the
+    # first one runs out, so keep the page small enough for both sizes to fill
+    '/api/books?view=card&status=reading&sort=title&per_page=10',
+    '/api/stats',
+    '/api/paths',
+    '/api/paths/1',
+    '/api/tags',
+]
+
+
+def measure(n_books: int) -> dict[str, int]:
+    """Count the statements of each route against a fixture of n_books. Runs in its own process."""
+    volume = Path(tempfile.mkdtemp(prefix='bt-query-counts-'))
+    build_fixture(volume / 'books.db', n_books)
+    os.environ['RAILWAY_VOLUME_MOUNT_PATH'] = str(volume)
+    import app as app_module
+
+    statements = []
+
+    def trace(sql):
+        # Statements run by triggers are reported as comments
+        if not sql.startswith('--'):
+            statements.append(sql)
+
+    def traced(acquire):
+        def acquire_traced():
+            conn = acquire()
+            conn.set_trace_callback(trace)
+            return conn
+        return acquire_traced
+
+    pool = app_module.db_pool
+    pool.acquire_reader = traced(pool.acquire_reader)
+    pool.acquire_writer = traced(pool.acquire_writer)
+
+    client = app_module.app.test_client()
+    counts = {}
+    for url in ROUTES:
+        for _ in range(2):
+            app_module.response_cache.invalidate()
+            statements.clear()
+            response = client.get(url)
+            response.get_data()
+            response.close()
+            if response.status_code != 200:
+                raise RuntimeError(f'GET {url} returned {response.status_code}')
+        counts[url] = len(statements)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='library sizes to compare')
+    parser.add_argument('--measure', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure)))
+        return
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    if len(sizes) < 2:
+        parser.error('--sizes needs at least two sizes to compare')
+    results = {}
+    for size in sizes:
+        # The app reads its database location once, at import
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.query_counts', '--measure', str(size)],
+            cwd=Path(__file__).parent.parent, capture_output=True, text=True, check=True,
+        ).stdout
+        results[size] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{'route':<62}" + ''.join(f'{size:>8}' for size in sizes))
+    failures = []
+    for url in ROUTES:
+        counts = [results[size][url] for size in sizes]
+        varies = len(set(counts)) > 1
+        print(f"{url:<62}" + ''.join(f'{count:>8}' for count in counts) + ('  <- grows' if varies else ''))
+        if varies:
+            failures.append(url)
+
+    if failures:
+        print(f"\n{len(failures)} route(s) run more statements on a larger library: {', '.join(failures)}")
+        sys.exit(1)
+    print(f"\nStatement counts are the same at {', '.join(map(str, sizes))} books")
+
+
+if __name__ == '__main__':
+    main()
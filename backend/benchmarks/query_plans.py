@@ -0,0 +1,244 @@
+"""Query plan audit: EXPLAIN QUERY PLAN for every statement shape the API runs.
+
+Usage (from backend/):
+    python -m benchmarks.query_plans [--size 1000] [--all]
+    python -m benchmarks.query_plans --check     # exit 1 on a scan or temp B-tree missing from the baseline
+    python -m benchmarks.query_plans --update    # accept the current plans as the new baseline
+
+Statements are captured with a trace callback while every benchmark suite
+route runs once against a seeded fixture, along with each sort, order,
+status and search combination of GET /api/books (first page, first page
+without a total, and a cursor page). Statements that differ only in literal
+values are one shape. Each shape is planned once, and plan steps that read a
+whole table or index (SCAN) or sort into a temporary B-tree are flagged.
+
+--check compares the flagged steps with query_plans_baseline.json. It fails
+when a shape has a flagged step the baseline does not list, which includes a
+new or edited statement that needs a scan. Review the report and re-run with
+--update to accept a plan on purpose. Plans do not depend on the fixture
+size (the fixtures are not ANALYZEd), so the default small size is enough.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import urllib.parse
+from pathlib import Path
+
+from benchmarks.suite import ROUTES, get_fixture, load_context
+
+DEFAULT_SIZE = 1000
+BASELINE_PATH = Path(__file__).parent / 'query_plans_baseline.json'
+
+# Transaction control and pragmas have no plan
+UNPLANNED_PREFIXES = ('BEGIN', 'COMMIT', 'END', 'ROLLBACK', 'SAVEPOINT', 'RELEASE', 'PRAGMA')
+
+# FTS5 reads and writes its shadow tables with its own statements, which name them 'main'.'books_fts_...'
+FTS5_INTERNAL = "'main'."
+
+# Table-valued functions over a bound parameter, not stored data
+PARAMETER_TABLES = ('json_each', 'json_tree')
+
+BOOK_FILTERS = [{}, {'status': 'reading'}]
+BOOK_SEARCHES = ['', 'python']
+
+
+def book_list_urls(sorts: list[str]) -> list[str]:
+    """First-page URLs for every sort, order, status and search combination of GET /api/books."""
+    urls = []
+    for search in BOOK_SEARCHES:
+        for sort in sorts + (['relevance'] if search else []):
+            # Relevance always sorts best match first, whatever the order
+            for order in (['asc'] if sort == 'relevance' else ['asc', 'desc']):
+                for filters in BOOK_FILTERS:
+                    params = {'sort': sort, 'order': order, 'per_page': 2, **filters}
+                    if search:
+                        params['search'] = search
+                    urls.append('/api/books?' + urllib.parse.urlencode(params))
+    return urls
+
+
+def shape_id(sql: str) -> str:
+    return hashlib.sha1(sql.encode()).hexdigest()[:12]
+
+
+def collect_statements(volume: Path) -> dict[str, dict]:
+    """Run the routes against the database in volume. Returns {shape: {'sql', 'sources'}}."""
+    os.environ['RAILWAY_VOLUME_MOUNT_PATH'] = str(volume)
+    import app as app_module
+    from database import normalize_sql
+
+    shapes = {}
+    source = None
+
+    def trace(sql):
+        # Statements run by triggers are reported as comments; plan only top-level ones
+        if sql.startswith('--') or FTS5_INTERNAL in sql or sql.lstrip().upper().startswith(UNPLANNED_PREFIXES):
+            return
+        entry = shapes.setdefault(normalize_sql(sql), {'sql': sql, 'sources': []})
+        if source not in entry['sources']:
+            entry['sources'].append(source)
+
+    def traced(acquire):
+        def acquire_traced():
+            conn = acquire()
+            conn.set_trace_callback(trace)
+            return conn
+        return acquire_traced
+
+    pool = app_module.db_pool
+    pool.acquire_reader = traced(pool.acquire_reader)
+    pool.acquire_writer = traced(pool.acquire_writer)
+
+    client = app_module.app.test_client()
+
+    def call(label, method, url, body=None):
+        nonlocal source
+        source = label
+        app_module.response_cache.invalidate()
+        response = client.open(url, method=method, json=body)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{method} {url} returned {response.status_code}: {response.get_data()[:200]!r}')
+        # Reading the whole body also runs the queries of streamed exports
+        response.get_data()
+        response.close()
+        return response.get_json(silent=True)
+
+    ctx = load_context(app_module.DATABASE)
+    for name, build_request, _ in ROUTES:
+        call(name, *build_request(0, ctx))
+
+    for url in book_list_urls(app_module.VALID_BOOK_SORTS):
+        label = 'books ' + url.split('?', 1)[1]
+        page = call(label, 'GET', url)
+        call(label, 'GET', url + '&include_total=false')
+        if page['next_cursor']:
+            call(label, 'GET', url + '&' + urllib.parse.urlencode({'cursor': page['next_cursor']}))
+
+    return shapes
+
+
+def explain(conn: sqlite3.Connection, sql: str) -> list[str]:
+    """Get the plan steps of a statement, indented by depth."""
+    depth = {0: -1}
+    steps = []
+    for node_id, parent, _, detail in conn.execute('EXPLAIN QUERY PLAN ' + sql):
+        depth[node_id] = depth.get(parent, -1) + 1
+        steps.append('  ' * depth[node_id] + detail)
+    return steps
+
+
+def flagged_steps(steps: list[str]) -> list[str]:
+    """Pick the steps that scan a whole table or index or build a temporary B-tree.
+
+    Scans of materialized subqueries and CTEs, constant rows, json_each over a
+    parameter and full-text MATCH lookups do not read stored rows and are not
+    flagged.
+    """
+    details = [step.strip() for step in steps]
+    intermediate = {d.split(' ', 1)[1] for d in details if d.startswith(('MATERIALIZE ', 'CO-ROUTINE '))}
+    flagged = []
+    for detail in details:
+        if detail.startswith('SCAN '):
+            target = detail.split(' ')[1]
+            if target in intermediate or target in PARAMETER_TABLES or target.startswith('(') or detail == 'SCAN CONSTANT ROW':
+                continue
+            # FTS5 marks a MATCH constraint with M in the index string, e.g. INDEX 0:=M5
+            if 'VIRTUAL TABLE INDEX' in detail and 'M' in detail.rsplit(':', 1)[1]:
+                continue
+            flagged.append(detail)
+        elif 'TEMP B-TREE' in detail:
+            flagged.append(detail)
+    return sorted(set(flagged))
+
+
+def audit(size: int) -> dict[str, dict]:
+    """Collect and plan every statement shape against a copy of the fixture for size."""
+    fixture, _ = get_fixture(size)
+    volume = Path(tempfile.mkdtemp(prefix='bt-query-plans-'))
+    try:
+        shutil.copy(fixture, volume / 'books.db')
+        shapes = collect_statements(volume)
+        conn = sqlite3.connect(volume / 'books.db')
+        report = {}
+        for normalized, entry in shapes.items():
+            steps = explain(conn, entry['sql'])
+            report[shape_id(normalized)] = {
+                'sql': normalized,
+                'sources': entry['sources'],
+                'plan': steps,
+                'flags': flagged_steps(steps),
+            }
+        conn.close()
+    finally:
+        shutil.rmtree(volume, ignore_errors=True)
+    return report
+
+
+def print_report(report: dict[str, dict], show_all: bool):
+    for key, shape in sorted(report.items(), key=lambda item: item[1]['sources'][0]):
+        if not (shape['flags'] or show_all):
+            continue
+        sources = shape['sources'][0] + (f" (+{len(shape['sources']) - 1} more)" if len(shape['sources']) > 1 else '')
+        print(f"{key}  {sources}")
+        print(f"    {shape['sql'][:160]}{'...' if len(shape['sql']) > 160 else ''}")
+        for step in (shape['plan'] if show_all else shape['flags']):
+            print(f"    {'!' if step.strip() in shape['flags'] else ' '} {step}")
+        print()
+
+    scans = sum(1 for shape in report.values() if any(f.startswith('SCAN') for f in shape['flags']))
+    temp = sum(1 for shape in report.values() if any('TEMP B-TREE' in f for f in shape['flags']))
+    print(f"{len(report)} statement shapes: {scans} with full scans, {temp} with temp B-trees")
+
+
+def check(report: dict[str, dict], baseline: dict[str, dict]) -> list[str]:
+    """List flagged steps that the baseline does not accept."""
+    problems = []
+    for key, shape in sorted(report.items()):
+        accepted = set(baseline.get(key, {}).get('flags', []))
+        for flag in shape['flags']:
+            if flag not in accepted:
+                problems.append(f"{key} {shape['sources'][0]}: {flag}\n    {shape['sql'][:160]}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE, help='books in the seeded fixture')
+    parser.add_argument('--all', action='store_true', help='print every shape with its full plan')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--check', action='store_true', help='fail on flagged steps missing from the baseline')
+    mode.add_argument('--update', action='store_true', help='write the current flagged steps as the baseline')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    report = audit(args.size)
+
+    if args.update:
+        baseline = {
+            key: {'sql': shape['sql'][:160], 'flags': shape['flags']}
+            for key, shape in sorted(report.items()) if shape['flags']
+        }
+        args.baseline.write_text(json.dumps(baseline, indent=1, sort_keys=True) + '\n')
+        print(f"Baseline of {len(baseline)} flagged shapes written to {args.baseline}")
+        return
+
+    print_report(report, args.all)
+    if args.check:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        problems = check(report, baseline)
+        if problems:
+            print(f"\n{len(problems)} plan step(s) not in {args.baseline.name}:")
+            for problem in problems:
+                print(f"  {problem}")
+            sys.exit(1)
+        print(f"All flagged steps are accepted by {args.baseline.name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Row serialization microbenchmarks: per-row dicts and cover fix-ups vs SQLite JSON.
+
+Usage (from backend/): python -m benchmarks.serialization [rows...]
+
+Each size serializes that many library_view rows (all columns and view=card)
+three ways, timing the median of several runs from query to JSON body:
+
+    previous  fetchall, dict_from_row per row, cover fallback loop, jsonify
+    dicts     rows_to_dicts (column names read once per cursor), jsonify
+    sqlite    json_object_sql per row, spliced into the body by json_response
+"""
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.fixtures import build_library
+
+DEFAULT_SIZES = [100, 1000, 10000]
+N_BOOKS = 10000
+RUNS = 7
+
+
+def main(sizes: list[int]):
+    volume = Path(tempfile.mkdtemp(prefix='bt-bench-serialize-'))
+    build_library(volume / 'books.db', N_BOOKS)
+
+    # The app reads its database location from the environment at import
+    os.environ['RAILWAY_VOLUME_MOUNT_PATH'] = str(volume)
+    import app as app_module
+    from flask import jsonify
+
+    db = app_module.database.connect(app_module.DATABASE)
+    # Half the books have a stored cover; the rest use the ISBN fallback
+    db.execute("UPDATE books SET cover_image_url = 'https://covers.openlibrary.org/b/id/' || id || '-L.jpg' WHERE id % 2 = 0")
+    db.commit()
+    all_columns = app_module.get_library_columns(db)
+
+    def previous(columns, n):
+        # Before display_cover_url, the stored cover was filled in row by row
+        select = ', '.join(columns + [c for c in ('isbn', 'isbn13') if c not in columns])
+        rows = db.execute(f'SELECT {select} FROM library_view LIMIT ?', (n,)).fetchall()
+        books = [app_module.dict_from_row(row) for row in rows]
+        for book in books:
+            if not book.get('cover_image_url'):
+                isbn = book.get('isbn13') or book.get('isbn')
+                if isbn:
+                    book['cover_image_url'] = f"{app_module.OPEN_LIBRARY_COVERS}/isbn/{isbn}-L.jpg"
+            for extra in ('isbn', 'isbn13'):
+                if extra not in columns:
+                    del book[extra]
+        return jsonify({'books': books}).get_data()
+
+    def dicts(columns, n):
+        cursor = db.execute(f'SELECT {app_module.build_projection(db, columns)} FROM library_view LIMIT ?', (n,))
+        return jsonify({'books': app_module.rows_to_dicts(cursor)}).get_data()
+
+    def sqlite(columns, n):
+        cursor = db.execute(f'SELECT {app_module.json_object_sql(columns)} FROM library_view LIMIT ?', (n,))
+        cursor.row_factory = None
+        books = [app_module.RawJSON(row[0]) for row in cursor]
+        return app_module.json_response({'books': books}).get_data()
+
+    approaches = [('previous', previous), ('dicts', dicts), ('sqlite', sqlite)]
+    print(f"{'rows':>6} {'columns':>8} " + ' '.join(f'{name + " ms":>12}' for name, _ in approaches) + f" {'speedup':>8}")
+    with app_module.app.app_context():
+        for n in sizes:
+            for label, columns in (('all', all_columns), ('card', app_module.LIBRARY_PROJECTIONS['card'])):
+                medians = []
+                bodies = []
+                for _, approach in approaches:
+                    timings = []
+                    for _ in range(RUNS):
+                        started = time.perf_counter()
+                        body = approach(columns, n)
+                        timings.append(time.perf_counter() - started)
+                    medians.append(statistics.median(timings))
+                    bodies.append(json.loads(body))
+                if not bodies[0] == bodies[1] == bodies[2]:
+                    raise AssertionError(f'Serializers disagree at {n} rows ({label})')
+                print(f"{n:>6} {label:>8} " + ' '.join(f'{m * 1000:>12.1f}' for m in medians)
+                      + f" {medians[0] / medians[2]:>7.1f}x")
+    db.close()
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,341 @@
+"""Benchmark suite: every API route against synthetic libraries of several sizes.
+
+Usage (from backend/):
+    python -m benchmarks.suite run [--sizes 1000,10000] [--out results.json] [--iterations 20] [--routes pipeline,dashboard]
+    python -m benchmarks.suite compare base.json head.json [--latency 1.25] [--memory 1.25]
+
+run builds (or reuses) a fixture per size with benchmarks.fixtures.build_fixture,
+then drives each route through the Flask test client in a fresh process per
+size and records p50/p95 latency, SQL statements per request, peak Python
+memory and response size. Fixtures are cached under the system temp directory
+and rebuilt when fixtures.py or schema.sql change; 100k and 1M books take
+minutes to build the first time.
+
+compare checks head against base and exits non-zero when a route is slower
+or uses more memory than the thresholds allow, or runs more statements.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.fixtures import SCHEMA_PATH, build_fixture
+
+DEFAULT_SIZES = [1000, 10000]
+DEFAULT_ITERATIONS = 20
+# Each route stops early once its samples take this long (but keeps at least MIN_SAMPLES)
+ROUTE_TIME_BUDGET = 10.0
+MIN_SAMPLES = 3
+
+# Differences smaller than these are noise, whatever the ratio
+LATENCY_FLOOR_MS = 2.0
+MEMORY_FLOOR_KIB = 256
+
+FIXTURE_DIR = Path(tempfile.gettempdir()) / 'bt-bench-fixtures'
+
+
+def fixture_version() -> str:
+    """Hash of the generator and schema, so cached fixtures are rebuilt when either changes."""
+    digest = hashlib.sha1()
+    for path in (Path(__file__).parent / 'fixtures.py', SCHEMA_PATH):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:10]
+
+
+def get_fixture(n_books: int) -> tuple[Path, float]:
+    """Get the cached fixture for a size, building it if needed. Returns (path, build seconds)."""
+    path = FIXTURE_DIR / f'books-{n_books}-{fixture_version()}.db'
+    if path.exists():
+        return path, 0.0
+    started = time.perf_counter()
+    partial = path.with_suffix('.partial')
+    build_fixture(partial, n_books)
+    partial.rename(path)
+    return path, time.perf_counter() - started
+
+
+# --- Routes ---
+#
+# Each route is (name, build_request, heavy). build_request(i, ctx) returns
+# (method, url, json_body) for iteration i; ctx holds ids picked from the
+# fixture. Writes are chosen so that repeating them keeps the library valid.
+# Routes that call Open Library or need an empty library are not included.
+
+def _get(url):
+    return lambda i, ctx: ('GET', url.format(**ctx), None)
+
+
+ROUTES = [
+    ('books', _get('/api/books'), False),
+    ('books_card', _get('/api/books?view=card&per_page=100'), False),
+    ('books_search', _get('/api/books?search=python%20garden'), False),
+    ('books_sorted', _get('/api/books?sort=title&order=asc&include_total=false'), False),
+    ('books_ids', _get('/api/books?ids={book_ids}&include=tags,notes,paths'), False),
+    ('book', _get('/api/books/{book_id}'), False),
+    ('book_tags', _get('/api/books/{book_id}?include=tags'), False),
+    ('stats', _get('/api/stats'), False),
+    ('stats_check', _get('/api/stats/check'), True),
+    ('tags', _get('/api/tags'), False),
+    ('dashboard', _get('/api/dashboard'), False),
+    ('dashboard_card', _get('/api/dashboard?view=card'), False),
+    ('pipeline', _get('/api/pipeline'), True),
+    ('pipeline_card', _get('/api/pipeline?view=card'), True),
+    ('paths', _get('/api/paths'), False),
+    ('path', _get('/api/paths/{path_id}'), False),
+    ('path_books', _get('/api/paths/{path_id}/books'), False),
+    ('settings', _get('/api/settings'), False),
+    ('export_json', _get('/api/export/json'), True),
+    ('export_ndjson', _get('/api/export/ndjson'), True),
+    ('export_csv', _get('/api/export/csv'), True),
+    ('update_book', lambda i, ctx: ('PATCH', f"/api/books/{ctx['book_id']}", {'current_page': i + 1}), False),
+    ('update_status', lambda i, ctx: (
+        'PATCH', f"/api/books/{ctx['book_id']}", {'status': 'reading' if i % 2 else 'queued'}
+    ), False),
+    ('bulk_update', lambda i, ctx: (
+        'POST', '/api/books/bulk', {'ids': ctx['bulk_ids'], 'add_tags': ['bench'] if i % 2 else [],
+                                    'remove_tags': [] if i % 2 else ['bench']}
+    ), False),
+    ('create_book', lambda i, ctx: (
+        'POST', '/api/books', {'title': f"Benchmark Book {ctx['run']}-{i}", 'author': 'Bench', 'status': 'interested'}
+    ), False),
+    ('update_path', lambda i, ctx: ('PATCH', f"/api/paths/{ctx['path_id']}", {'description': f'Pass {i}'}), False),
+    ('move_path_book', lambda i, ctx: (
+        'PATCH', f"/api/paths/{ctx['path_id']}/books/{ctx['path_books'][i % 2]}/move",
+        {'after': ctx['path_books'][-1 - i % 2]}
+    ), False),
+    ('reorder_path', lambda i, ctx: (
+        'PATCH', f"/api/paths/{ctx['path_id']}/books/reorder",
+        {'books': [{'user_book_id': ub_id, 'position': (p + 1) * 1024}
+                   for p, ub_id in enumerate(ctx['path_books'][::-1] if i % 2 else ctx['path_books'])]}
+    ), False),
+    ('update_settings', lambda i, ctx: ('PATCH', '/api/settings', {'wip_limit': str(5 + i % 2)}), False),
+    ('batch', lambda i, ctx: ('POST', '/api/batch', {'operations': [
+        {'method': 'PATCH', 'path': f'/api/books/{book_id}', 'body': {'priority': i % 5}}
+        for book_id in ctx['bulk_ids'][:50]
+    ]}), False),
+]
+
+
+def load_context(db_path) -> dict:
+    conn = sqlite3.connect(db_path)
+    n_books = conn.execute('SELECT MAX(id) FROM books').fetchone()[0]
+    path_id = conn.execute('SELECT MIN(id) FROM learning_paths').fetchone()[0]
+    path_books = [row[0] for row in conn.execute(
+        'SELECT user_book_id FROM learning_path_books WHERE learning_path_id = ? ORDER BY position', (path_id,)
+    )]
+    conn.close()
+    return {
+        'book_id': n_books // 2,
+        'book_ids': ','.join(str(i) for i in range(1, min(n_books, 50) + 1)),
+        'bulk_ids': list(range(1, min(n_books, 200) + 1)),
+        'path_id': path_id,
+        'path_books': path_books,
+        'run': int(time.time()),
+    }
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    if len(samples) < 2:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method='inclusive')[pct - 1]
+
+
+def run_child(iterations: int, route_names: list[str] | None):
+    import app as app_module
+
+    statements = []
+
+    def trace(sql):
+        # Statements run by triggers are reported as comments; count only top-level ones
+        if not sql.startswith('--'):
+            statements.append(sql)
+
+    def traced(acquire):
+        def acquire_traced():
+            conn = acquire()
+            conn.set_trace_callback(trace)
+            return conn
+        return acquire_traced
+
+    pool = app_module.db_pool
+    pool.acquire_reader = traced(pool.acquire_reader)
+    pool.acquire_writer = traced(pool.acquire_writer)
+
+    client = app_module.app.test_client()
+    ctx = load_context(app_module.DATABASE)
+
+    def call(method, url, body):
+        # Measure the work itself, not a response cache hit
+        app_module.response_cache.invalidate()
+        response = client.open(url, method=method, json=body)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{method} {url} returned {response.status_code}: {response.get_data()[:200]!r}')
+        # Streamed bodies are consumed chunk by chunk, as a client would
+        if response.is_streamed:
+            return sum(len(chunk) for chunk in response.response)
+        return len(response.get_data())
+
+    results = {}
+    for name, build_request, heavy in ROUTES:
+        if route_names and name not in route_names:
+            continue
+        method, url, body = build_request(0, ctx)
+        call(method, url, body)  # warm up
+
+        samples = []
+        started = time.perf_counter()
+        for i in range(1, (max(MIN_SAMPLES, iterations // 5) if heavy else iterations) + 1):
+            method, url, body = build_request(i, ctx)
+            statements.clear()
+            t0 = time.perf_counter()
+            size = call(method, url, body)
+            samples.append(time.perf_counter() - t0)
+            if len(samples) >= MIN_SAMPLES and time.perf_counter() - started > ROUTE_TIME_BUDGET:
+                break
+        queries = len(statements)
+
+        # Memory is measured on a separate call so tracing does not skew the timings
+        method, url, body = build_request(len(samples) + 1, ctx)
+        tracemalloc.start()
+        call(method, url, body)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[f'{method} {name}'] = {
+            'url': url,
+            'samples': len(samples),
+            'p50_ms': round(percentile(samples, 50) * 1000, 3),
+            'p95_ms': round(percentile(samples, 95) * 1000, 3),
+            'queries': queries,
+            'peak_kib': peak // 1024,
+            'bytes': size,
+        }
+    print(json.dumps(results))
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes: list[int], out: Path, iterations: int, route_names: list[str] | None):
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'iterations': iterations,
+            'fixture_version': fixture_version(),
+        },
+        'sizes': {},
+    }
+    workdir = Path(tempfile.mkdtemp(prefix='bt-bench-suite-'))
+    for n in sizes:
+        fixture, build_seconds = get_fixture(n)
+        volume = workdir / str(n)
+        volume.mkdir()
+        shutil.copyfile(fixture, volume / 'books.db')
+
+        env = dict(os.environ, RAILWAY_VOLUME_MOUNT_PATH=str(volume))
+        args = [sys.executable, '-m', 'benchmarks.suite', '--child', '--iterations', str(iterations)]
+        if route_names:
+            args += ['--routes', ','.join(route_names)]
+        child = subprocess.run(args, env=env, capture_output=True, text=True)
+        if child.returncode != 0:
+            sys.exit(f'Benchmark at {n} books failed:\n{child.stderr}')
+        routes = json.loads(child.stdout.strip().splitlines()[-1])
+        report['sizes'][str(n)] = {'fixture_build_seconds': round(build_seconds, 1), 'routes': routes}
+        shutil.rmtree(volume)
+
+        print(f"\n{n} books")
+        print(f"{'route':<22} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'peak KiB':>9} {'bytes':>10}")
+        for name, r in routes.items():
+            print(f"{name:<22} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['queries']:>8} {r['peak_kib']:>9} {r['bytes']:>10}")
+
+    out.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {out}")
+
+
+def compare(base_path: Path, head_path: Path, latency: float, memory: float) -> int:
+    base = json.loads(base_path.read_text())
+    head = json.loads(head_path.read_text())
+    print(f"base {base['meta'].get('commit')} vs head {head['meta'].get('commit')}")
+
+    regressions = []
+    for size, head_size in head['sizes'].items():
+        base_routes = base['sizes'].get(size, {}).get('routes', {})
+        print(f"\n{size} books")
+        print(f"{'route':<22} {'p50 ms':^22} {'p95 ms':^22} {'queries':^12} {'peak KiB':^18}")
+        for name, h in head_size['routes'].items():
+            b = base_routes.get(name)
+            if b is None:
+                continue
+            problems = []
+            for metric in ('p50_ms', 'p95_ms'):
+                if h[metric] > b[metric] * latency and h[metric] - b[metric] > LATENCY_FLOOR_MS:
+                    problems.append(metric)
+            if h['queries'] > b['queries']:
+                problems.append('queries')
+            if h['peak_kib'] > b['peak_kib'] * memory and h['peak_kib'] - b['peak_kib'] > MEMORY_FLOOR_KIB:
+                problems.append('peak_kib')
+            if problems:
+                regressions.append((size, name, problems))
+            flag = '  <- ' + ', '.join(problems) if problems else ''
+            print(
+                f"{name:<22} {b['p50_ms']:>9.2f} -> {h['p50_ms']:<9.2f} {b['p95_ms']:>9.2f} -> {h['p95_ms']:<9.2f}"
+                f" {b['queries']:>4} -> {h['queries']:<4} {b['peak_kib']:>7} -> {h['peak_kib']:<7}{flag}"
+            )
+
+    print(f"\n{len(regressions)} regressions (latency x{latency}, memory x{memory}, any extra query)")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Book Tracker API benchmark suite')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS, help=argparse.SUPPRESS)
+    parser.add_argument('--routes', type=lambda s: s.split(','), default=None, help=argparse.SUPPRESS)
+    commands = parser.add_subparsers(dest='command')
+
+    run_parser = commands.add_parser('run', help='benchmark every route and write JSON results')
+    run_parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    run_parser.add_argument('--routes', type=lambda s: s.split(','), default=None)
+    run_parser.add_argument('--sizes', type=lambda s: [int(n) for n in s.split(',')], default=DEFAULT_SIZES)
+    run_parser.add_argument('--out', type=Path, default=Path('benchmark-results.json'))
+
+    compare_parser = commands.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('base', type=Path)
+    compare_parser.add_argument('head', type=Path)
+    compare_parser.add_argument('--latency', type=float, default=1.25, help='allowed p50/p95 ratio')
+    compare_parser.add_argument('--memory', type=float, default=1.25, help='allowed peak memory ratio')
+
+    args = parser.parse_args()
+    if args.child:
+        run_child(args.iterations, args.routes)
+    elif args.command == 'run':
+        run(args.sizes, args.out, args.iterations, args.routes)
+    elif args.command == 'compare':
+        sys.exit(compare(args.base, args.head, args.latency, args.memory))
+    else:
+        parser.print_help()
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""Local proxy cache for Open Library cover images.
+
+Covers are fetched from the origin once per (kind, value, size) and kept on
+disk, content-addressed by SHA-256:
+
+    <root>/objects/ab/ab12...ef     image bytes
+    <root>/refs/isbn/<isbn>-M       "<sha256> <content type>", or "missing"
+
+Identical images (Open Library serves the same file under several keys) are
+stored once. A ref never changes once written, so responses can be cached as
+immutable; only "missing" refs expire, after negative_ttl seconds, so a cover
+added upstream later is eventually picked up.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import http_client
+import metrics
+
+COVER_KINDS = ('id', 'isbn', 'olid')
+COVER_SIZES = ('S', 'M', 'L')
+COVER_VALUE = re.compile(r'^[A-Za-z0-9]{1,40}$')
+
+# Covers larger than this are not stored (the route redirects to the origin)
+MAX_COVER_BYTES = 5 * 1024 * 1024
+
+MISSING = 'missing'
+
+
+class CoverStore:
+    """Content-addressed disk cache in front of a covers origin."""
+
+    def __init__(self, root, origin: str, negative_ttl: int, timeout: float = 10,
+                 client: http_client.HTTPClient = None):
+        self.root = Path(root)
+        self.origin = origin.rstrip('/')
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self.client = client or http_client.HTTPClient()
+        self._lock = threading.Lock()
+        self._fetching = {}  # ref path -> Lock held while that cover is being fetched
+        self._counters = {'hits': 0, 'negative_hits': 0, 'misses': 0, 'stores': 0, 'errors': 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    @staticmethod
+    def is_valid(kind: str, value: str, size: str) -> bool:
+        """Check a cover key before it is used to build paths or URLs."""
+        return kind in COVER_KINDS and size in COVER_SIZES and bool(COVER_VALUE.match(value))
+
+    def origin_url(self, kind: str, value: str, size: str) -> str:
+        """Get the origin URL for a cover."""
+        return f'{self.origin}/{kind}/{value}-{size}.jpg'
+
+    def _ref_path(self, kind: str, value: str, size: str) -> Path:
+        return self.root / 'refs' / kind / f'{value}-{size}'
+
+    def object_path(self, digest: str) -> Path:
+        """Get the path of a stored image by its SHA-256."""
+        return self.root / 'objects' / digest[:2] / digest
+
+    def _write_atomic(self, path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _read_ref(self, ref: Path) -> tuple[str, str] | str | None:
+        """Get (digest, content type) for a ref, MISSING for a live negative entry, or None."""
+        try:
+            text = ref.read_text().strip()
+        except FileNotFoundError:
+            return None
+        if text == MISSING:
+            if time.time() - ref.stat().st_mtime <= self.negative_ttl:
+                return MISSING
+            return None
+        digest, content_type = text.split(' ', 1)
+        if not self.object_path(digest).exists():
+            return None
+        return digest, content_type
+
+    def _fetch(self, kind: str, value: str, size: str) -> tuple[bytes, str] | None:
+        """Download a cover. Returns None if the origin has no cover for the key."""
+        # default=false makes the origin answer 404 instead of a blank placeholder
+        url = self.origin_url(kind, value, size) + '?default=false'
+        try:
+            with metrics.time_open_library('covers'):
+                response = self.client.get(url, timeout=self.timeout, max_bytes=MAX_COVER_BYTES)
+        except http_client.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+        return response.body, response.content_type
+
+    def get(self, kind: str, value: str, size: str) -> tuple[str, str] | None:
+        """Get (digest, content type) of a cover, fetching it on first use.
+
+        Returns None if the origin has no such cover. Network errors raise and
+        are not cached. Concurrent requests for the same cover share one fetch.
+        """
+        ref = self._ref_path(kind, value, size)
+        entry = self._read_ref(ref)
+        if entry is not None:
+            self._count('negative_hits' if entry == MISSING else 'hits')
+            return None if entry == MISSING else entry
+
+        with self._lock:
+            fetch_lock = self._fetching.setdefault(str(ref), threading.Lock())
+        try:
+            with fetch_lock:
+                # Another thread may have stored it while this one waited
+                entry = self._read_ref(ref)
+                if entry is None:
+                    entry = self._store(kind, value, size, ref)
+        finally:
+            with self._lock:
+                self._fetching.pop(str(ref), None)
+
+        return None if entry == MISSING else entry
+
+    def _store(self, kind: str, value: str, size: str, ref: Path) -> tuple[str, str] | str:
+        self._count('misses')
+        try:
+            result = self._fetch(kind, value, size)
+        except Exception:
+            self._count('errors')
+            raise
+
+        if result is None:
+            self._write_atomic(ref, MISSING.encode())
+            return MISSING
+        data, content_type = result
+        digest = hashlib.sha256(data).hexdigest()
+        if not self.object_path(digest).exists():
+            self._write_atomic(self.object_path(digest), data)
+        self._write_atomic(ref, f'{digest} {content_type}'.encode())
+        self._count('stores')
+        return digest, content_type
+
+    def stats(self) -> dict:
+        """Get hit/miss counters for this process plus the stored object count and size."""
+        objects = [p for p in (self.root / 'objects').glob('*/*') if not p.name.startswith('.tmp-')]
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters['hits'] + counters['negative_hits'] + counters['misses']
+        counters['objects'] = len(objects)
+        counters['bytes'] = sum(p.stat().st_size for p in objects)
+        counters['hit_rate'] = round((counters['hits'] + counters['negative_hits']) / lookups, 3) if lookups else None
+        return counters
@@ -0,0 +1,182 @@
+"""Pooled SQLite connections with a tuned pragma profile.
+
+Each gunicorn worker keeps a small pool of read-only connections and a single
+writer connection. With WAL journaling, readers work from their own snapshot
+and never wait on the writer, and reusing connections keeps the page cache and
+prepared statement cache warm between requests.
+"""
+
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+# Applied to every pooled connection, in order (journal_mode is persistent per database)
+DEFAULT_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'cache_size': -int(os.environ.get('SQLITE_CACHE_SIZE_KB', 64 * 1024)),  # negative = KiB
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'temp_store': 'MEMORY',
+}
+
+STATEMENT_CACHE_SIZE = int(os.environ.get('SQLITE_STATEMENT_CACHE', 256))
+
+
+def connect(db_path, pragmas: dict = None, readonly: bool = False) -> sqlite3.Connection:
+    """Open a connection with the pragma profile applied."""
+    pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+    conn = sqlite3.connect(
+        db_path,
+        timeout=pragmas.get('busy_timeout', 5000) / 1000,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.row_factory = sqlite3.Row
+    for name, value in pragmas.items():
+        conn.execute(f'PRAGMA {name} = {value}')
+    if readonly:
+        conn.execute('PRAGMA query_only = ON')
+    return conn
+
+
+class ConnectionPool:
+    """Per-process pool of read connections plus one serialized writer connection."""
+
+    def __init__(self, db_path, pragmas: dict = None, max_readers: int = 4):
+        self.db_path = db_path
+        self.pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+        self.max_readers = max_readers
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._readers = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+    def _check_pid(self):
+        # Connections must not cross a fork; a forked worker starts its own pool
+        if self._pid != os.getpid():
+            self._reset()
+
+    def acquire_reader(self) -> sqlite3.Connection:
+        """Take a read-only connection, opening one if the pool is not full."""
+        self._check_pid()
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._reader_lock:
+            if self._reader_count < self.max_readers:
+                self._reader_count += 1
+                return connect(self.db_path, self.pragmas, readonly=True)
+        return self._readers.get()
+
+    def acquire_writer(self) -> sqlite3.Connection:
+        """Take the writer connection, waiting while another thread holds it."""
+        self._check_pid()
+        self._writer_lock.acquire()
+        if self._writer is None:
+            self._writer = connect(self.db_path, self.pragmas)
+        return self._writer
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, rolling back anything left uncommitted."""
+        if conn.in_transaction:
+            conn.rollback()
+        if conn is self._writer:
+            self._writer_lock.release()
+        else:
+            self._readers.put(conn)
+
+
+class DeferredCommitConnection:
+    """Wraps a connection so commit() is a no-op.
+
+    Lets several request handlers, each of which commits its own work, run
+    inside one outer transaction that the caller commits or rolls back.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.connection = conn
+
+    def commit(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+# Literals in SQL text: quoted strings, then numbers that are not part of a name
+SQL_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+SQL_NUMBER_LITERAL = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b')
+SQL_PLACEHOLDER_LIST = re.compile(r'\?(?:\s*,\s*\?)+')
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """Reduce a statement to its shape so repeats with different values compare equal.
+
+    Literals become ?, runs of placeholders (IN lists) collapse to one and
+    whitespace is squeezed.
+    """
+    sql = SQL_STRING_LITERAL.sub('?', sql)
+    sql = SQL_NUMBER_LITERAL.sub('?', sql)
+    sql = SQL_PLACEHOLDER_LIST.sub('?', sql)
+    return ' '.join(sql.split())
+
+
+class InstrumentedConnection:
+    """Wraps a connection to count and time the statements run through it.
+
+    Only execute/executemany/executescript are timed, which covers preparing
+    and stepping to the first row; rows fetched later from the returned
+    cursor are not included.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.connection = conn
+        self.statements = 0
+        self.seconds = 0.0
+        self.slowest = (0.0, None)  # (seconds, sql)
+        self.by_statement = {}  # normalized sql -> executions
+
+    def _timed(self, method, sql: str, *args):
+        started = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.statements += 1
+            self.seconds += elapsed
+            if elapsed > self.slowest[0]:
+                self.slowest = (elapsed, sql)
+            key = normalize_sql(sql)
+            self.by_statement[key] = self.by_statement.get(key, 0) + 1
+
+    def execute(self, sql: str, *args):
+        return self._timed(self.connection.execute, sql, *args)
+
+    def executemany(self, sql: str, *args):
+        return self._timed(self.connection.executemany, sql, *args)
+
+    def executescript(self, sql: str):
+        return self._timed(self.connection.executescript, sql)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Get (normalized sql, executions) for statements run more than threshold times."""
+        return sorted(
+            ((sql, count) for sql, count in self.by_statement.items() if count > threshold),
+            key=lambda item: -item[1],
+        )
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
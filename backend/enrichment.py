@@ -0,0 +1,193 @@
+"""Background bulk enrichment of book covers from Open Library.
+
+A job walks every book still missing an Open Library cover in id order.
+Lookups run on a bounded thread pool behind a token-bucket rate limit, and
+results are written in batches. Each batch commit also advances the job's
+checkpoint (last_book_id) in the enrichment_jobs table, so an interrupted job
+can be resumed and any gunicorn worker can report its progress.
+"""
+
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import database
+import openlibrary
+
+# Books whose cover is missing or is only a guessed ISBN cover URL
+CANDIDATE_FILTER = "(cover_image_url IS NULL OR cover_image_url LIKE '%covers.openlibrary.org/b/isbn%')"
+
+# Jobs that may be picked up again by a resumed run
+RESUMABLE_STATUSES = ('running', 'cancelled', 'failed')
+
+
+class EnrichmentEngine:
+    """Runs at most one enrichment job at a time, outside the request cycle."""
+
+    def __init__(self, db_path, cache: openlibrary.OpenLibraryCache = None, concurrency: int = 4,
+                 rate: float = 2.0, batch_size: int = 25, stale_after: int = 120):
+        self.db_path = db_path
+        self.cache = cache
+        self.concurrency = concurrency
+        self.rate = rate
+        self.batch_size = batch_size
+        self.stale_after = stale_after
+        self._thread = None
+
+    def _connect(self):
+        return database.connect(self.db_path)
+
+    def _is_alive(self, conn, job: sqlite3.Row) -> bool:
+        """Check whether a running job is still heartbeating (in any worker)."""
+        if job['status'] != 'running':
+            return False
+        if self._thread and self._thread.is_alive():
+            return True
+        age = conn.execute(
+            "SELECT (julianday('now') - julianday(?)) * 86400",
+            (job['updated_at'],)
+        ).fetchone()[0]
+        return age is not None and age < self.stale_after
+
+    def start(self, resume: bool = True) -> dict:
+        """Start a job, or resume the latest interrupted one. Returns the job status.
+
+        If a job is already running, its status is returned unchanged.
+        """
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            latest = conn.execute('SELECT * FROM enrichment_jobs ORDER BY id DESC LIMIT 1').fetchone()
+
+            if latest and self._is_alive(conn, latest):
+                conn.rollback()
+                return dict(latest)
+
+            if resume and latest and latest['status'] in RESUMABLE_STATUSES:
+                job_id = latest['id']
+                remaining = conn.execute(
+                    f'SELECT COUNT(*) FROM books WHERE {CANDIDATE_FILTER} AND id > ?',
+                    (latest['last_book_id'],)
+                ).fetchone()[0]
+                conn.execute('''
+                    UPDATE enrichment_jobs
+                    SET status = 'running', total = processed + ?, error = NULL,
+                        updated_at = CURRENT_TIMESTAMP, finished_at = NULL
+                    WHERE id = ?
+                ''', (remaining, job_id))
+            else:
+                total = conn.execute(f'SELECT COUNT(*) FROM books WHERE {CANDIDATE_FILTER}').fetchone()[0]
+                cursor = conn.execute('''
+                    INSERT INTO enrichment_jobs (status, total, started_at, updated_at)
+                    VALUES ('running', ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                ''', (total,))
+                job_id = cursor.lastrowid
+
+            conn.commit()
+            job = conn.execute('SELECT * FROM enrichment_jobs WHERE id = ?', (job_id,)).fetchone()
+        finally:
+            conn.close()
+
+        self._thread = threading.Thread(target=self._run, args=(job_id,), daemon=True)
+        self._thread.start()
+        return dict(job)
+
+    def status(self, job_id: int = None) -> dict | None:
+        """Get a job's status (the latest job by default)."""
+        conn = self._connect()
+        try:
+            if job_id is None:
+                job = conn.execute('SELECT * FROM enrichment_jobs ORDER BY id DESC LIMIT 1').fetchone()
+            else:
+                job = conn.execute('SELECT * FROM enrichment_jobs WHERE id = ?', (job_id,)).fetchone()
+            if not job:
+                return None
+            result = dict(job)
+            if job['status'] == 'running' and not self._is_alive(conn, job):
+                result['status'] = 'interrupted'
+        finally:
+            conn.close()
+        return result
+
+    def cancel(self) -> dict | None:
+        """Ask the running job to stop after its current batch."""
+        conn = self._connect()
+        try:
+            conn.execute('''
+                UPDATE enrichment_jobs SET status = 'cancelled', updated_at = CURRENT_TIMESTAMP
+                WHERE id = (SELECT MAX(id) FROM enrichment_jobs) AND status = 'running'
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+        return self.status()
+
+    def _lookup(self, book: dict, limiter: openlibrary.TokenBucket) -> tuple[int, dict | None]:
+        ol_book = openlibrary.find_book(book, cache=self.cache, limiter=limiter)
+        info = openlibrary.extract_open_library_info(ol_book) if ol_book else None
+        return book['id'], info
+
+    def _run(self, job_id: int):
+        limiter = openlibrary.TokenBucket(self.rate, capacity=self.concurrency)
+        conn = self._connect()
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                while True:
+                    job = conn.execute('SELECT * FROM enrichment_jobs WHERE id = ?', (job_id,)).fetchone()
+                    if job['status'] != 'running':
+                        return
+
+                    books = [dict(row) for row in conn.execute(f'''
+                        SELECT id, isbn, isbn13, title, author
+                        FROM books
+                        WHERE {CANDIDATE_FILTER} AND id > ?
+                        ORDER BY id
+                        LIMIT ?
+                    ''', (job['last_book_id'], self.batch_size))]
+
+                    if not books:
+                        conn.execute('''
+                            UPDATE enrichment_jobs
+                            SET status = 'completed', updated_at = CURRENT_TIMESTAMP,
+                                finished_at = CURRENT_TIMESTAMP
+                            WHERE id = ?
+                        ''', (job_id,))
+                        conn.commit()
+                        return
+
+                    results = list(pool.map(lambda b: self._lookup(b, limiter), books))
+                    updates = [
+                        (info['open_library_key'], info['cover_image_url'], book_id)
+                        for book_id, info in results
+                        if info and info['cover_image_url']
+                    ]
+
+                    # Results and checkpoint are committed together
+                    conn.executemany('''
+                        UPDATE books
+                        SET google_books_id = ?,
+                            cover_image_url = ?,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    ''', updates)
+                    conn.execute('''
+                        UPDATE enrichment_jobs
+                        SET last_book_id = ?,
+                            processed = processed + ?,
+                            enriched = enriched + ?,
+                            failed = failed + ?,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    ''', (books[-1]['id'], len(books), len(updates), len(books) - len(updates), job_id))
+                    conn.commit()
+        except Exception as e:
+            conn.rollback()
+            conn.execute('''
+                UPDATE enrichment_jobs
+                SET status = 'failed', error = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (str(e), job_id))
+            conn.commit()
+            print(f"Enrichment job {job_id} failed: {e}")
+        finally:
+            conn.close()
@@ -0,0 +1,249 @@
+"""Shared outbound HTTP client with keep-alive connections and request coalescing.
+
+urllib.request.urlopen opens, and for HTTPS handshakes, a new connection for
+every request. HTTPClient keeps idle http.client connections per host and
+reuses them, asks for gzip and decodes it, and follows redirects. Each call
+has one timeout budget that covers connecting, redirects and reading the
+body, so a slow trickle of bytes cannot stretch it the way a per-read socket
+timeout can.
+
+SingleFlight lets concurrent callers asking for the same key share one call.
+"""
+
+import http.client
+import ssl
+import threading
+import time
+import urllib.parse
+import zlib
+
+import metrics
+
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+READ_CHUNK = 64 * 1024
+
+
+class HTTPError(Exception):
+    """A response with an error status; code is the status, as on urllib.error.HTTPError."""
+
+    def __init__(self, url: str, code: int, reason: str):
+        super().__init__(f'HTTP {code} {reason}: {url}')
+        self.url = url
+        self.code = code
+        self.reason = reason
+
+
+class Response:
+    """A response whose body has been read (and decoded) in full."""
+
+    def __init__(self, url: str, status: int, headers: http.client.HTTPMessage, body: bytes):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get_content_type()
+
+
+class HTTPClient:
+    """Thread-safe GET client keeping up to max_idle_per_host idle connections per host.
+
+    A connection is used by one request at a time and goes back to the pool
+    once its response has been read in full. Idle connections older than
+    idle_timeout are closed instead of reused, since servers drop them.
+    """
+
+    def __init__(self, user_agent: str = 'book-tracker', timeout: float = 10, max_idle_per_host: int = 8,
+                 idle_timeout: float = 30):
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_timeout = idle_timeout
+        self._ssl_context = ssl.create_default_context()
+        self._idle = {}  # (scheme, host, port) -> [(connection, idle since)]
+        self._lock = threading.Lock()
+
+    def get(self, url: str, timeout: float = None, max_bytes: int = None, headers: dict = None) -> Response:
+        """GET a URL, following redirects, within timeout seconds in total.
+
+        Raises HTTPError for 4xx/5xx responses, TimeoutError when the budget
+        runs out, and ValueError when the decoded body exceeds max_bytes.
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+        for _ in range(MAX_REDIRECTS + 1):
+            status, reason, response_headers, body = self._request(url, deadline, max_bytes, headers)
+            location = response_headers.get('Location')
+            if status in REDIRECT_STATUSES and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+            if status >= 400:
+                raise HTTPError(url, status, reason)
+            return Response(url, status, response_headers, body)
+        raise HTTPError(url, status, 'Too many redirects')
+
+    def close(self):
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn, _ in connections:
+                conn.close()
+
+    @staticmethod
+    def _remaining(deadline: float) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError('Request timed out')
+        return remaining
+
+    def _arm(self, conn: http.client.HTTPConnection, deadline: float):
+        """Limit the next socket operation to what is left of the budget."""
+        conn.timeout = self._remaining(deadline)
+        if conn.sock:
+            conn.sock.settimeout(conn.timeout)
+
+    def _take(self, origin: tuple) -> http.client.HTTPConnection | None:
+        now = time.monotonic()
+        stale = []
+        conn = None
+        with self._lock:
+            idle = self._idle.get(origin, [])
+            while idle:
+                candidate, since = idle.pop()
+                if now - since < self.idle_timeout:
+                    conn = candidate
+                    break
+                stale.append(candidate)
+        for candidate in stale:
+            candidate.close()
+        return conn
+
+    def _release(self, origin: tuple, conn: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(origin, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def _connect(self, origin: tuple) -> http.client.HTTPConnection:
+        scheme, host, port = origin
+        metrics.outbound_connections.inc(host=host, state='opened')
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, port, context=self._ssl_context)
+        return http.client.HTTPConnection(host, port)
+
+    def _request(self, url: str, deadline: float, max_bytes: int | None, headers: dict | None) -> tuple:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f'Unsupported URL: {url}')
+        origin = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        target = urllib.parse.urlunsplit(('', '', parts.path or '/', parts.query, ''))
+        request_headers = {'User-Agent': self.user_agent, 'Accept-Encoding': 'gzip', **(headers or {})}
+
+        conn = self._take(origin)
+        reused = conn is not None
+        while True:
+            if conn is None:
+                conn = self._connect(origin)
+            else:
+                metrics.outbound_connections.inc(host=origin[1], state='reused')
+            try:
+                self._arm(conn, deadline)
+                conn.request('GET', target, headers=request_headers)
+                response = conn.getresponse()
+                break
+            except ConnectionError:
+                conn.close()
+                if not reused:
+                    raise
+                # The server closed the idle connection first; GET is safe to retry once
+                conn, reused = None, False
+            except BaseException:
+                conn.close()
+                raise
+
+        try:
+            body = self._read_body(conn, response, deadline, max_bytes)
+        except BaseException:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(origin, conn)
+        return response.status, response.reason, response.headers, body
+
+    def _read_body(self, conn: http.client.HTTPConnection, response: http.client.HTTPResponse,
+                   deadline: float, max_bytes: int | None) -> bytes:
+        """Read and gunzip the body, re-arming the socket timeout before each read."""
+        gzipped = response.getheader('Content-Encoding', '').lower() == 'gzip'
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else None
+        chunks = []
+        size = 0
+        while True:
+            self._arm(conn, deadline)
+            chunk = response.read1(READ_CHUNK)
+            if not chunk:
+                break
+            if decoder:
+                # Bounding the output keeps a small gzip bomb from inflating past max_bytes
+                chunk = decoder.decompress(chunk, max_bytes - size + 1) if max_bytes else decoder.decompress(chunk)
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise ValueError(f'Response is larger than {max_bytes} bytes')
+            chunks.append(chunk)
+        # read1() does not mark a fully read response closed, and the connection
+        # refuses another request until it is
+        response.close()
+        if decoder:
+            chunks.append(decoder.flush())
+        return b''.join(chunks)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls by key: one runs, the rest wait for its outcome."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call in flight
+
+    def do(self, key, fn, timeout: float = None) -> tuple:
+        """Run fn() unless a call for key is in flight, then share its result or exception.
+
+        Returns (result, shared). A caller that joins a call waits at most
+        timeout seconds for it and then raises TimeoutError.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError('Timed out waiting for an identical request in flight')
+            if call.error:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
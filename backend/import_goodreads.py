@@ -4,8 +4,19 @@
 import csv
 import sqlite3
 import re
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+
+import library_stats
+
+# Triggers that maintain derived tables (search index, statistics rollups,
+# library revision, sort key copies). Per-row maintenance dominates bulk import
+# time, so they are suspended during an import and the derived state is rebuilt
+# once at the end.
+DERIVED_TRIGGER_PREFIXES = ('books_fts_', 'library_stats_', 'library_revision_', 'user_books_sort_')
 
 
 def clean_isbn(isbn_str: str) -> str | None:
@@ -17,8 +28,9 @@ def clean_isbn(isbn_str: str) -> str | None:
     return cleaned if cleaned else None
 
 
+@lru_cache(maxsize=8192)
 def parse_date(date_str: str) -> str | None:
-    """Parse Goodreads date format (YYYY/MM/DD) to ISO format."""
+    """Parse Goodreads date format (YYYY/MM/DD) to ISO format. Cached, as dates repeat heavily."""
     if not date_str:
         return None
     try:
@@ -31,11 +43,11 @@ def parse_date(date_str: str) -> str | None:
 def map_shelf_to_status(shelf: str) -> str:
     """Map Goodreads shelf names to our status enum."""
     mapping = {
-        'read': 'read',
-        'currently-reading': 'currently_reading',
-        'to-read': 'want_to_read',
+        'read': 'finished',
+        'currently-reading': 'reading',
+        'to-read': 'interested',
     }
-    return mapping.get(shelf, 'want_to_read')
+    return mapping.get(shelf, 'interested')
 
 
 def parse_bookshelves(shelves_str: str) -> list[str]:
@@ -49,8 +61,200 @@ def parse_bookshelves(shelves_str: str) -> list[str]:
     return [s for s in shelves if s and s not in excluded]
 
 
-def import_csv(csv_path: str, db_path: str):
-    """Import Goodreads CSV export into SQLite database."""
+def parse_int(value: str) -> int | None:
+    """Parse an optional integer field."""
+    return int(value) if value else None
+
+
+def parse_row(row: dict) -> dict:
+    """Parse one Goodreads CSV row into the fields we store. Raises ValueError on bad data."""
+    date_read = parse_date(row['Date Read'])
+    my_rating = parse_int(row['My Rating'])
+    return {
+        'goodreads_id': row['Book Id'],
+        'isbn': clean_isbn(row['ISBN']),
+        'isbn13': clean_isbn(row['ISBN13']),
+        'title': row['Title'],
+        'author': row['Author'],
+        'additional_authors': row['Additional Authors'] or None,
+        'publisher': row['Publisher'] or None,
+        'binding': row['Binding'] or None,
+        'page_count': parse_int(row['Number of Pages']),
+        'year_published': parse_int(row['Year Published']),
+        'original_publication_year': parse_int(row['Original Publication Year']),
+        'goodreads_avg_rating': float(row['Average Rating']) if row['Average Rating'] else None,
+        'status': map_shelf_to_status(row['Exclusive Shelf']),
+        'my_rating': my_rating if my_rating and my_rating > 0 else None,
+        'date_added': parse_date(row['Date Added']),
+        'date_read': date_read,
+        'read_count': parse_int(row['Read Count']) or 0,
+        'owned_copies': parse_int(row['Owned Copies']) or 0,
+        'review': row['My Review'] or None,
+        'shelves': parse_bookshelves(row['Bookshelves']),
+    }
+
+
+def iter_chunks(reader, size: int):
+    """Yield lists of up to size parsed rows, plus the number of rows skipped in each."""
+    chunk = []
+    skipped = 0
+    for row in reader:
+        try:
+            chunk.append(parse_row(row))
+        except (KeyError, ValueError) as e:
+            print(f"  Skipping row {row.get('Book Id')!r}: {e}")
+            skipped += 1
+        if len(chunk) >= size:
+            yield chunk, skipped
+            chunk, skipped = [], 0
+    if chunk or skipped:
+        yield chunk, skipped
+
+
+def fetch_id_map(cursor, query: str, keys: list) -> dict:
+    """Run a 'SELECT key, id ... IN (...)' query for many keys at once."""
+    placeholders = ', '.join('?' * len(keys))
+    cursor.execute(query.format(placeholders=placeholders), keys)
+    return dict(cursor.fetchall())
+
+
+def import_chunk(cursor, records: list[dict], tags_cache: dict, report: dict):
+    """Import one chunk of parsed rows with set-based statements."""
+    goodreads_ids = [r['goodreads_id'] for r in records]
+    existing = fetch_id_map(
+        cursor, 'SELECT goodreads_id, id FROM books WHERE goodreads_id IN ({placeholders})', goodreads_ids
+    )
+    report['new_books'] += sum(1 for gid in set(goodreads_ids) if gid not in existing)
+    report['updated_books'] += sum(1 for gid in set(goodreads_ids) if gid in existing)
+
+    # Catalog fields come from Goodreads; enrichment fields (cover, description) are kept
+    cursor.executemany('''
+        INSERT INTO books (
+            goodreads_id, isbn, isbn13, title, author, additional_authors,
+            publisher, binding, page_count, year_published,
+            original_publication_year, goodreads_avg_rating
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(goodreads_id) DO UPDATE SET
+            isbn = excluded.isbn,
+            isbn13 = excluded.isbn13,
+            title = excluded.title,
+            author = excluded.author,
+            additional_authors = excluded.additional_authors,
+            publisher = excluded.publisher,
+            binding = excluded.binding,
+            page_count = excluded.page_count,
+            year_published = excluded.year_published,
+            original_publication_year = excluded.original_publication_year,
+            goodreads_avg_rating = excluded.goodreads_avg_rating,
+            updated_at = CURRENT_TIMESTAMP
+    ''', [(
+        r['goodreads_id'], r['isbn'], r['isbn13'], r['title'], r['author'], r['additional_authors'],
+        r['publisher'], r['binding'], r['page_count'], r['year_published'],
+        r['original_publication_year'], r['goodreads_avg_rating'],
+    ) for r in records])
+
+    book_ids = fetch_id_map(
+        cursor, 'SELECT goodreads_id, id FROM books WHERE goodreads_id IN ({placeholders})', goodreads_ids
+    )
+
+    # Re-imports refresh Goodreads fields but never clobber progress tracked in the app.
+    # A book finished on Goodreads since the last import is promoted to finished.
+    cursor.executemany('''
+        INSERT INTO user_books (
+            book_id, status, my_rating, date_added, finished_reading_at,
+            read_count, owned_copies, goodreads_review
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(book_id) DO UPDATE SET
+            status = CASE WHEN excluded.status = 'finished' THEN 'finished' ELSE user_books.status END,
+            my_rating = COALESCE(excluded.my_rating, user_books.my_rating),
+            finished_reading_at = COALESCE(excluded.finished_reading_at, user_books.finished_reading_at),
+            read_count = excluded.read_count,
+            owned_copies = excluded.owned_copies,
+            goodreads_review = COALESCE(excluded.goodreads_review, user_books.goodreads_review),
+            updated_at = CURRENT_TIMESTAMP
+    ''', [(
+        book_ids[r['goodreads_id']], r['status'], r['my_rating'], r['date_added'], r['date_read'],
+        r['read_count'], r['owned_copies'], r['review'],
+    ) for r in records])
+
+    user_book_ids = fetch_id_map(
+        cursor, 'SELECT book_id, id FROM user_books WHERE book_id IN ({placeholders})', list(book_ids.values())
+    )
+    user_book_by_gid = {gid: user_book_ids[book_id] for gid, book_id in book_ids.items()}
+
+    # Reading sessions for finished books, skipping ones already imported
+    sessions = [
+        (user_book_by_gid[r['goodreads_id']], r['date_read'])
+        for r in records
+        if r['status'] == 'finished' and r['date_read']
+    ]
+    cursor.executemany('''
+        INSERT INTO reading_sessions (user_book_id, finished_at)
+        SELECT ?1, ?2
+        WHERE NOT EXISTS (
+            SELECT 1 FROM reading_sessions WHERE user_book_id = ?1 AND finished_at = ?2
+        )
+    ''', sessions)
+
+    # Custom tags/bookshelves: create missing tags in one pass, then link
+    new_names = sorted({name for r in records for name in r['shelves']} - tags_cache.keys())
+    if new_names:
+        cursor.executemany('INSERT OR IGNORE INTO tags (name) VALUES (?)', [(name,) for name in new_names])
+        report['new_tags'] += cursor.rowcount if cursor.rowcount > 0 else 0
+        tags_cache.update(fetch_id_map(
+            cursor, 'SELECT name, id FROM tags WHERE name IN ({placeholders})', new_names
+        ))
+
+    cursor.executemany('''
+        INSERT OR IGNORE INTO user_book_tags (user_book_id, tag_id)
+        VALUES (?, ?)
+    ''', [
+        (user_book_by_gid[r['goodreads_id']], tags_cache[name])
+        for r in records
+        for name in r['shelves']
+    ])
+
+    report['rows'] += len(records)
+
+
+@contextmanager
+def derived_triggers_suspended(cursor):
+    """Drop derived-table triggers for the enclosed work, then rebuild and restore them.
+
+    Must run inside the import transaction so a rollback restores the triggers.
+    """
+    cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")
+    triggers = [(name, sql) for name, sql in cursor.fetchall() if name.startswith(DERIVED_TRIGGER_PREFIXES)]
+    for name, _ in triggers:
+        cursor.execute(f'DROP TRIGGER {name}')
+
+    yield
+
+    names = {name for name, _ in triggers}
+    if any(name.startswith('books_fts_') for name in names):
+        cursor.execute("INSERT INTO books_fts (books_fts) VALUES ('rebuild')")
+    if any(name.startswith('library_stats_') for name in names):
+        library_stats.rebuild(cursor.connection, commit=False)
+    if any(name.startswith('library_revision_') for name in names):
+        cursor.execute('UPDATE library_revision SET revision = revision + 1 WHERE id = 1')
+    if any(name.startswith('user_books_sort_') for name in names):
+        cursor.execute('''
+            UPDATE user_books SET (sort_title, sort_author, sort_page_count, sort_year_published) = (
+                SELECT title, author, page_count, year_published FROM books WHERE books.id = user_books.book_id
+            )
+        ''')
+    for _, sql in triggers:
+        cursor.execute(sql)
+
+
+def import_csv(csv_path: str, db_path: str, dry_run: bool = False, chunk_size: int = 500) -> dict:
+    """Import Goodreads CSV export into SQLite database.
+
+    Rows are parsed once and written in chunks with executemany, all in one
+    transaction. Books are upserted by goodreads_id, so re-importing a newer
+    export updates the catalog without touching progress tracked in the app.
+    With dry_run the transaction is rolled back and only the report is produced.
+    """
     # Read schema and create database
     schema_path = Path(__file__).parent / 'schema.sql'
     conn = sqlite3.connect(db_path)
@@ -60,87 +264,29 @@ def import_csv(csv_path: str, db_path: str):
     with open(schema_path) as f:
         cursor.executescript(f.read())
 
-    # Read CSV
-    with open(csv_path, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    report = {'rows': 0, 'skipped': 0, 'new_books': 0, 'updated_books': 0, 'new_tags': 0}
+    tags_cache = dict(cursor.execute('SELECT name, id FROM tags').fetchall())  # name -> id
 
-        books_inserted = 0
-        tags_cache = {}  # name -> id
-
-        for row in reader:
-            # Insert book
-            cursor.execute('''
-                INSERT OR IGNORE INTO books (
-                    goodreads_id, isbn, isbn13, title, author, additional_authors,
-                    publisher, binding, page_count, year_published,
-                    original_publication_year, goodreads_avg_rating
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                row['Book Id'],
-                clean_isbn(row['ISBN']),
-                clean_isbn(row['ISBN13']),
-                row['Title'],
-                row['Author'],
-                row['Additional Authors'] or None,
-                row['Publisher'] or None,
-                row['Binding'] or None,
-                int(row['Number of Pages']) if row['Number of Pages'] else None,
-                int(row['Year Published']) if row['Year Published'] else None,
-                int(row['Original Publication Year']) if row['Original Publication Year'] else None,
-                float(row['Average Rating']) if row['Average Rating'] else None,
-            ))
-
-            # Get book ID (may have been inserted earlier if duplicate)
-            cursor.execute('SELECT id FROM books WHERE goodreads_id = ?', (row['Book Id'],))
-            book_id = cursor.fetchone()[0]
-
-            # Insert user_book relationship
-            status = map_shelf_to_status(row['Exclusive Shelf'])
-            my_rating = int(row['My Rating']) if row['My Rating'] and int(row['My Rating']) > 0 else None
-
-            cursor.execute('''
-                INSERT OR REPLACE INTO user_books (
-                    book_id, status, my_rating, date_added, finished_reading_at,
-                    read_count, owned_copies, goodreads_review
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                book_id,
-                status,
-                my_rating,
-                parse_date(row['Date Added']),
-                parse_date(row['Date Read']),
-                int(row['Read Count']) if row['Read Count'] else 0,
-                int(row['Owned Copies']) if row['Owned Copies'] else 0,
-                row['My Review'] if row['My Review'] else None,
-            ))
-
-            # Get user_book ID
-            cursor.execute('SELECT id FROM user_books WHERE book_id = ?', (book_id,))
-            user_book_id = cursor.fetchone()[0]
-
-            # Create reading session if book was read
-            if status == 'read' and parse_date(row['Date Read']):
-                cursor.execute('''
-                    INSERT INTO reading_sessions (user_book_id, finished_at)
-                    VALUES (?, ?)
-                ''', (user_book_id, parse_date(row['Date Read'])))
-
-            # Process custom tags/bookshelves
-            custom_shelves = parse_bookshelves(row['Bookshelves'])
-            for shelf_name in custom_shelves:
-                # Get or create tag
-                if shelf_name not in tags_cache:
-                    cursor.execute('INSERT OR IGNORE INTO tags (name) VALUES (?)', (shelf_name,))
-                    cursor.execute('SELECT id FROM tags WHERE name = ?', (shelf_name,))
-                    tags_cache[shelf_name] = cursor.fetchone()[0]
-
-                tag_id = tags_cache[shelf_name]
-                cursor.execute('''
-                    INSERT OR IGNORE INTO user_book_tags (user_book_id, tag_id)
-                    VALUES (?, ?)
-                ''', (user_book_id, tag_id))
-
-            books_inserted += 1
+    started = time.perf_counter()
+    cursor.execute('BEGIN')
+    with open(csv_path, newline='', encoding='utf-8') as f, derived_triggers_suspended(cursor):
+        reader = csv.DictReader(f)
+        for records, skipped in iter_chunks(reader, chunk_size):
+            report['skipped'] += skipped
+            if records:
+                import_chunk(cursor, records, tags_cache, report)
+    report['seconds'] = round(time.perf_counter() - started, 3)
+    report['rows_per_second'] = round(report['rows'] / report['seconds']) if report['seconds'] else None
+
+    if dry_run:
+        conn.rollback()
+        print("Dry run - no changes written.")
+        print(f"  Rows parsed: {report['rows']} ({report['skipped']} skipped)")
+        print(f"  New books: {report['new_books']}")
+        print(f"  Books to update: {report['updated_books']}")
+        print(f"  New tags: {report['new_tags']}")
+        conn.close()
+        return report
 
     conn.commit()
 
@@ -155,6 +301,8 @@ def import_csv(csv_path: str, db_path: str):
     total_tags = cursor.fetchone()[0]
 
     print(f"Import complete!")
+    print(f"  Rows imported: {report['rows']} ({report['skipped']} skipped, {report['rows_per_second']} rows/s)")
+    print(f"  New books: {report['new_books']}, updated: {report['updated_books']}")
     print(f"  Total books: {total_books}")
     print(f"  Status breakdown:")
     for status, count in status_counts.items():
@@ -162,12 +310,16 @@ def import_csv(csv_path: str, db_path: str):
     print(f"  Custom tags imported: {total_tags}")
 
     conn.close()
+    return report
 
 
 if __name__ == '__main__':
-    import sys
+    import argparse
 
-    csv_path = sys.argv[1] if len(sys.argv) > 1 else '../goodreads_library_export.csv'
-    db_path = sys.argv[2] if len(sys.argv) > 2 else 'books.db'
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('csv_path', nargs='?', default='../goodreads_library_export.csv')
+    parser.add_argument('db_path', nargs='?', default='books.db')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would change without writing')
+    args = parser.parse_args()
 
-    import_csv(csv_path, db_path)
+    import_csv(args.csv_path, args.db_path, dry_run=args.dry_run)
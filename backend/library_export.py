@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Streaming full-library export and import.
+
+The export is a sequence of typed records, one per line:
+
+    {"type": "header", "format": "book-tracker", "version": 2, ...}
+    {"type": "books", "data": {...}}
+    ...
+    {"type": "end", "counts": {"books": 120, ...}}
+
+It is written either as NDJSON or as a JSON array with one record per line,
+and always reads from a single snapshot transaction so the tables are
+consistent with each other. Derived tables (search index, statistics rollups,
+caches, job state) are not exported; triggers rebuild them on import.
+
+Usage: python library_export.py export <file.ndjson> [db_path]
+       python library_export.py import <file.ndjson> [db_path]
+"""
+
+import json
+import sqlite3
+from datetime import date
+from pathlib import Path
+import os
+
+EXPORT_FORMAT = 'book-tracker'
+EXPORT_VERSION = 2
+
+# Exported in dependency order so an import can replay them as-is
+EXPORT_TABLES = [
+    'books',
+    'user_books',
+    'tags',
+    'user_book_tags',
+    'learning_paths',
+    'learning_path_books',
+    'notes',
+    'reading_sessions',
+    'user_settings',
+]
+
+# Columns copied from other tables by triggers, which refill them on import
+DERIVED_COLUMNS = {
+    'user_books': ('sort_title', 'sort_author', 'sort_page_count', 'sort_year_published'),
+}
+
+# Seeded with defaults by schema/migrations, so imported rows replace them
+UPSERTED_TABLES = ('user_settings',)
+
+CHUNK_SIZE = 500
+
+
+class ExportFormatError(Exception):
+    """Raised when an export file cannot be imported."""
+
+
+def get_database_path():
+    """Get database path, supporting Railway volume mount."""
+    volume_path = os.environ.get('RAILWAY_VOLUME_MOUNT_PATH')
+    if volume_path:
+        return Path(volume_path) / 'books.db'
+    return Path(__file__).parent / 'books.db'
+
+
+def iter_records(conn: sqlite3.Connection):
+    """Yield every export record as a dict, reading from one snapshot transaction."""
+    if not conn.in_transaction:
+        conn.execute('BEGIN')
+    try:
+        yield {
+            'type': 'header',
+            'format': EXPORT_FORMAT,
+            'version': EXPORT_VERSION,
+            'exported_at': date.today().isoformat(),
+            'tables': EXPORT_TABLES,
+        }
+
+        counts = {}
+        for table in EXPORT_TABLES:
+            select = '*'
+            if table in DERIVED_COLUMNS:
+                select = ', '.join(
+                    row[1] for row in conn.execute(f'PRAGMA table_info({table})')
+                    if row[1] not in DERIVED_COLUMNS[table]
+                )
+            cursor = conn.execute(f'SELECT {select} FROM {table} ORDER BY rowid')
+            columns = [col[0] for col in cursor.description]
+            counts[table] = 0
+            while True:
+                rows = cursor.fetchmany(CHUNK_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield {'type': table, 'data': dict(zip(columns, row))}
+                counts[table] += len(rows)
+
+        yield {'type': 'end', 'counts': counts}
+    finally:
+        conn.rollback()
+
+
+def iter_ndjson(conn: sqlite3.Connection):
+    """Yield the export as NDJSON lines."""
+    for record in iter_records(conn):
+        yield json.dumps(record) + '\n'
+
+
+def iter_json_array(conn: sqlite3.Connection):
+    """Yield the export as a JSON array, one record per line."""
+    separator = '[\n'
+    for record in iter_records(conn):
+        yield separator + json.dumps(record)
+        separator = ',\n'
+    yield '\n]\n'
+
+
+def parse_lines(lines):
+    """Parse records from NDJSON or line-per-record JSON array lines."""
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode()
+        line = line.strip()
+        if line in ('', '[', ']'):
+            continue
+        if line.startswith('['):
+            line = line[1:]
+        yield json.loads(line.rstrip(','))
+
+
+def import_records(conn: sqlite3.Connection, records) -> dict:
+    """Restore export records into an empty database in one transaction.
+
+    Every exported table except user_settings must be empty. Returns the
+    number of rows restored per table; a row that still conflicts with the
+    database raises sqlite3.IntegrityError after the rollback.
+    """
+    records = iter(records)
+    header = next(records, None)
+    if not header or header.get('type') != 'header' or header.get('format') != EXPORT_FORMAT:
+        raise ExportFormatError('Missing export header')
+    if header.get('version') != EXPORT_VERSION:
+        raise ExportFormatError(f"Unsupported export version: {header.get('version')}")
+
+    for table in EXPORT_TABLES:
+        if table in UPSERTED_TABLES:
+            continue
+        if conn.execute(f'SELECT 1 FROM {table} LIMIT 1').fetchone():
+            raise ExportFormatError(f'Import requires an empty database ({table} has rows)')
+
+    table_columns = {
+        table: {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+        for table in EXPORT_TABLES
+    }
+    counts = {table: 0 for table in EXPORT_TABLES}
+    pending_table = None
+    pending = []
+
+    def flush():
+        if not pending:
+            return
+        columns = [c for c in pending[0] if c in table_columns[pending_table]]
+        placeholders = ', '.join('?' * len(columns))
+        verb = 'INSERT OR REPLACE' if pending_table in UPSERTED_TABLES else 'INSERT'
+        conn.executemany(
+            f'{verb} INTO {pending_table} ({", ".join(columns)}) VALUES ({placeholders})',
+            [[row.get(c) for c in columns] for row in pending]
+        )
+        counts[pending_table] += len(pending)
+        pending.clear()
+
+    try:
+        end = None
+        for record in records:
+            record_type = record.get('type')
+            if record_type == 'end':
+                end = record
+                break
+            if record_type not in table_columns:
+                raise ExportFormatError(f'Unknown record type: {record_type}')
+            if record_type != pending_table or len(pending) >= CHUNK_SIZE:
+                flush()
+                pending_table = record_type
+            pending.append(record['data'])
+        flush()
+
+        if end is None:
+            raise ExportFormatError('Export is truncated (no end record)')
+        expected = end.get('counts', {})
+        mismatched = [t for t in EXPORT_TABLES if expected.get(t, 0) != counts[t]]
+        if mismatched:
+            raise ExportFormatError(f"Row counts do not match the export for: {', '.join(mismatched)}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return counts
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) < 3 or sys.argv[1] not in ('export', 'import'):
+        print(__doc__)
+        sys.exit(2)
+
+    command, file_path = sys.argv[1], sys.argv[2]
+    db_path = sys.argv[3] if len(sys.argv) > 3 else get_database_path()
+    conn = sqlite3.connect(db_path)
+
+    if command == 'export':
+        with open(file_path, 'w') as f:
+            f.writelines(iter_ndjson(conn))
+        print(f"Exported library to {file_path}")
+    else:
+        # Restoring into a fresh file needs the schema first
+        with open(Path(__file__).parent / 'schema.sql') as f:
+            conn.executescript(f.read())
+        with open(file_path) as f:
+            counts = import_records(conn, parse_lines(f))
+        print("Import complete!")
+        for table, count in counts.items():
+            print(f"  {table}: {count}")
+    conn.close()
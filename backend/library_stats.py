@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Maintenance for the trigger-maintained library_stats rollup table.
+
+library_stats holds (metric, key, value) counters that triggers on user_books,
+books, user_book_tags and learning_path_books keep current, so /api/stats and
+the learning path summaries read a handful of rows instead of aggregating the
+whole library:
+
+    status              key = status              number of books
+    finished_year       key = YYYY                books finished that year
+    days_to_read_sum    key = ''                  sum of non-negative days_to_read
+    days_to_read_count  key = ''                  books counted in the sum
+    pages_read          key = ''                  pages of finished books
+    author              key = author              books by that author
+    tag                 key = tag id              books with that tag
+    path_books          key = learning path id    books in that path
+    path_finished       key = learning path id    finished books in that path
+
+Usage: python library_stats.py [check|rebuild] [db_path]
+"""
+
+import sqlite3
+from pathlib import Path
+import os
+
+# Full recompute of every rollup, used to rebuild and to verify the triggers
+RECOMPUTE_SQL = '''
+    SELECT 'status' AS metric, status AS key, COUNT(*) AS value
+    FROM user_books
+    GROUP BY status
+    UNION ALL
+    SELECT 'finished_year', strftime('%Y', finished_reading_at), COUNT(*)
+    FROM user_books
+    WHERE strftime('%Y', finished_reading_at) IS NOT NULL
+    GROUP BY 2
+    UNION ALL
+    SELECT 'days_to_read_sum', '', SUM(days) FROM (
+        SELECT CAST(julianday(finished_reading_at) - julianday(date_added) AS INTEGER) AS days
+        FROM user_books
+    ) WHERE days >= 0 HAVING COUNT(*) > 0
+    UNION ALL
+    SELECT 'days_to_read_count', '', COUNT(*) FROM (
+        SELECT CAST(julianday(finished_reading_at) - julianday(date_added) AS INTEGER) AS days
+        FROM user_books
+    ) WHERE days >= 0 HAVING COUNT(*) > 0
+    UNION ALL
+    SELECT 'pages_read', '', SUM(b.page_count)
+    FROM books b
+    JOIN user_books ub ON b.id = ub.book_id
+    WHERE ub.status = 'finished' AND b.page_count IS NOT NULL
+    HAVING COUNT(*) > 0
+    UNION ALL
+    SELECT 'author', b.author, COUNT(*)
+    FROM books b
+    JOIN user_books ub ON b.id = ub.book_id
+    GROUP BY b.author
+    UNION ALL
+    SELECT 'tag', tag_id, COUNT(*)
+    FROM user_book_tags
+    GROUP BY tag_id
+    UNION ALL
+    SELECT 'path_books', learning_path_id, COUNT(*)
+    FROM learning_path_books
+    GROUP BY learning_path_id
+    UNION ALL
+    SELECT 'path_finished', lpb.learning_path_id, COUNT(*)
+    FROM learning_path_books lpb
+    JOIN user_books ub ON ub.id = lpb.user_book_id
+    WHERE ub.status = 'finished'
+    GROUP BY lpb.learning_path_id
+'''
+
+
+def get_database_path():
+    """Get database path, supporting Railway volume mount."""
+    volume_path = os.environ.get('RAILWAY_VOLUME_MOUNT_PATH')
+    if volume_path:
+        return Path(volume_path) / 'books.db'
+    return Path(__file__).parent / 'books.db'
+
+
+def rebuild(conn: sqlite3.Connection, commit: bool = True):
+    """Replace every rollup with a full recompute."""
+    conn.execute('DELETE FROM library_stats')
+    conn.execute(f'INSERT INTO library_stats (metric, key, value) SELECT metric, key, value FROM ({RECOMPUTE_SQL})')
+    if commit:
+        conn.commit()
+
+
+def check(conn: sqlite3.Connection) -> list[dict]:
+    """Compare the rollups with a full recompute. Returns the mismatching counters."""
+    expected = {(row[0], str(row[1])): row[2] for row in conn.execute(RECOMPUTE_SQL) if row[2]}
+    actual = {(row[0], str(row[1])): row[2] for row in conn.execute('SELECT metric, key, value FROM library_stats') if row[2]}
+
+    mismatches = []
+    for metric, key in sorted(expected.keys() | actual.keys()):
+        if expected.get((metric, key)) != actual.get((metric, key)):
+            mismatches.append({
+                'metric': metric,
+                'key': key,
+                'expected': expected.get((metric, key), 0),
+                'actual': actual.get((metric, key), 0),
+            })
+    return mismatches
+
+
+if __name__ == '__main__':
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'check'
+    db_path = sys.argv[2] if len(sys.argv) > 2 else get_database_path()
+
+    conn = sqlite3.connect(db_path)
+    if command == 'rebuild':
+        rebuild(conn)
+        print("library_stats rebuilt")
+    elif command == 'check':
+        mismatches = check(conn)
+        for m in mismatches:
+            print(f"  {m['metric']}[{m['key']}]: expected {m['expected']}, found {m['actual']}")
+        print(f"{len(mismatches)} mismatched counters")
+        conn.close()
+        sys.exit(1 if mismatches else 0)
+    else:
+        print(f"Unknown command: {command}")
+        sys.exit(2)
+    conn.close()
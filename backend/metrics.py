@@ -0,0 +1,208 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Counters and histograms live in this module so that the app, the Open
+Library client and the cover store can all record into them without passing
+a registry around. Values are per process: under gunicorn each worker keeps
+its own, and a scrape of /api/metrics sees whichever worker answered it.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; the Prometheus client library defaults
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def format_labels(labels: dict) -> str:
+    """Render a label set as {name="value",...}, or '' for no labels."""
+    if not labels:
+        return ''
+    escaped = (
+        f'{name}="' + str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"') + '"'
+        for name, value in labels.items()
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def format_value(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}  # label values -> count
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, dict(zip(self.labels, key)), value
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._values = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the with-block, including when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self):
+        with self._lock:
+            values = {key: list(counts) for key, counts in self._values.items()}
+        for key, counts in sorted(values.items()):
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else format_value(float(bound))
+                yield f'{self.name}_bucket', {**labels, 'le': le}, cumulative
+            yield f'{self.name}_sum', labels, counts[-1]
+            yield f'{self.name}_count', labels, cumulative
+
+
+class Registry:
+    """Named metrics plus collectors that read counters owned by other objects."""
+
+    def __init__(self):
+        self._metrics = []
+        self._stats = []  # (cache name, stats function, counter keys)
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_cache(self, cache: str, stats, counters: tuple[str, ...]):
+        """Export a cache's stats() dict: keys in counters as counters, other numbers as gauges."""
+        self._stats.append((cache, stats, counters))
+
+    def _cache_families(self) -> dict:
+        families = {}  # metric name -> (kind, help, [(labels, value)])
+        for cache, stats, counters in self._stats:
+            for key, value in stats().items():
+                if not isinstance(value, (int, float)) or isinstance(value, bool):
+                    continue
+                if key in counters:
+                    name, kind, help = f'bt_cache_{key}_total', 'counter', f'Cache {key.replace("_", " ")} since start'
+                else:
+                    name, kind, help = f'bt_cache_{key}', 'gauge', f'Cache {key.replace("_", " ")}'
+                families.setdefault(name, (kind, help, []))[2].append(({'cache': cache}, value))
+        return families
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+        for name, (kind, help, samples) in sorted(self._cache_families().items()):
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+http_request_duration = REGISTRY.histogram(
+    'bt_http_request_duration_seconds', 'Request handling time by route template',
+    labels=('method', 'route'),
+)
+http_requests = REGISTRY.counter(
+    'bt_http_requests_total', 'Requests by route template and status code',
+    labels=('method', 'route', 'status'),
+)
+sql_statements = REGISTRY.histogram(
+    'bt_sql_statements_per_request', 'SQL statements executed per request',
+    labels=('route',), buckets=STATEMENT_BUCKETS,
+)
+sql_seconds = REGISTRY.counter(
+    'bt_sql_seconds_total', 'Time spent executing SQL statements', labels=('route',),
+)
+sql_n_plus_one = REGISTRY.counter(
+    'bt_sql_n_plus_one_total', 'Requests in which one statement ran more often than the N+1 threshold',
+    labels=('route',),
+)
+sql_slow_statements = REGISTRY.counter(
+    'bt_sql_slow_statements_total', 'Statements slower than the slow statement threshold', labels=('route',),
+)
+open_library_duration = REGISTRY.histogram(
+    'bt_open_library_request_duration_seconds', 'Outbound Open Library request time', labels=('endpoint',),
+)
+open_library_errors = REGISTRY.counter(
+    'bt_open_library_errors_total', 'Failed outbound Open Library requests', labels=('endpoint',),
+)
+open_library_coalesced = REGISTRY.counter(
+    'bt_open_library_coalesced_total', 'Open Library lookups answered by an identical one already in flight',
+    labels=('endpoint',),
+)
+outbound_connections = REGISTRY.counter(
+    'bt_outbound_connections_total', 'Outbound HTTP connections opened, or reused from the keep-alive pool',
+    labels=('host', 'state'),
+)
+
+
+@contextmanager
+def time_open_library(endpoint: str):
+    """Time an outbound Open Library request and count it as an error if it raises.
+
+    A 404 is an answer (no such cover), not a failure, and is not counted.
+    """
+    with open_library_duration.time(endpoint=endpoint):
+        try:
+            yield
+        except Exception as e:
+            if getattr(e, 'code', None) != 404:
+                open_library_errors.inc(endpoint=endpoint)
+            raise
@@ -15,13 +15,19 @@ def get_database_path():
         return Path(volume_path) / 'books.db'
     return Path(__file__).parent / 'books.db'
 
+# Seconds to wait for another process applying the same migration
+MIGRATION_LOCK_TIMEOUT = 300
+
 def migrate():
     """Run v1 migration."""
     db_path = get_database_path()
     print(f"Migrating database at: {db_path}")
 
-    conn = sqlite3.connect(db_path)
+    # Workers run this at the same time on boot. The write lock, held from the
+    # check below to the commit, lets only the first apply it; the rest wait.
+    conn = sqlite3.connect(db_path, timeout=MIGRATION_LOCK_TIMEOUT)
     cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
 
     # Get existing columns in user_books
     cursor.execute("PRAGMA table_info(user_books)")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Book Tracker v10 Migration
+Adds display_cover_url to library_view: the stored cover, or the Open Library
+cover for the ISBN, so list endpoints no longer fill it in row by row.
+cover_image_url stays the stored value.
+"""
+
+import sqlite3
+from pathlib import Path
+import os
+
+def get_database_path():
+    """Get database path, supporting Railway volume mount."""
+    volume_path = os.environ.get('RAILWAY_VOLUME_MOUNT_PATH')
+    if volume_path:
+        return Path(volume_path) / 'books.db'
+    return Path(__file__).parent / 'books.db'
+
+# Seconds to wait for another process applying the same migration
+MIGRATION_LOCK_TIMEOUT = 300
+
+def migrate():
+    """Run v10 migration. Safe to run repeatedly."""
+    db_path = get_database_path()
+
+    # Workers run this at the same time on boot. The write lock, held from the
+    # check below to the commit, lets only the first apply it; the rest wait.
+    conn = sqlite3.connect(db_path, timeout=MIGRATION_LOCK_TIMEOUT)
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+
+    cursor.execute("""
+        SELECT sql FROM sqlite_master
+        WHERE type='view' AND name='library_view'
+    """)
+    row = cursor.fetchone()
+    if row and 'display_cover_url' in row[0]:
+        conn.close()
+        return
+
+    print(f"Migrating database at: {db_path}")
+
+    print("Updating library_view...")
+    cursor.execute("DROP VIEW IF EXISTS library_view")
+    cursor.execute("""
+        CREATE VIEW library_view AS
+        SELECT
+            b.id as book_id,
+            b.goodreads_id,
+            b.google_books_id,
+            b.isbn,
+            b.isbn13,
+            b.title,
+            b.author,
+            b.additional_authors,
+            b.publisher,
+            b.binding,
+            b.page_count,
+            b.year_published,
+            b.original_publication_year,
+            b.description,
+            b.cover_image_url,
+            -- Stored cover, or the Open Library cover for the ISBN (what the API shows)
+            COALESCE(
+                NULLIF(b.cover_image_url, ''),
+                'https://covers.openlibrary.org/b/isbn/' || COALESCE(NULLIF(b.isbn13, ''), NULLIF(b.isbn, '')) || '-L.jpg'
+            ) as display_cover_url,
+            b.goodreads_avg_rating,
+            ub.id as user_book_id,
+            ub.status,
+            ub.my_rating,
+            ub.date_added,
+            ub.started_reading_at,
+            ub.finished_reading_at,
+            ub.read_count,
+            ub.owned_copies,
+            ub.is_private,
+            ub.goodreads_review,
+            ub.current_page,
+            ub.progress_percent,
+            ub.last_read_at,
+            ub.why_reading,
+            ub.priority,
+            ub.owns_kindle,
+            ub.owns_audible,
+            ub.owns_hardcopy,
+            ub.idea_source,
+            ub.source_book_id,
+            ub.date_captured,
+            -- Calculate days from added to read (for metrics)
+            CAST(julianday(ub.finished_reading_at) - julianday(ub.date_added) AS INTEGER) as days_to_read,
+            -- Calculate if book is stale (not touched in 30+ days)
+            CASE WHEN ub.status = 'reading' AND ub.last_read_at IS NOT NULL
+                 AND julianday('now') - julianday(ub.last_read_at) > 30
+                 THEN 1 ELSE 0 END as is_stale
+        FROM books b
+        JOIN user_books ub ON b.id = ub.book_id
+    """)
+
+    conn.commit()
+    conn.close()
+
+    print("Migration complete!")
+
+if __name__ == '__main__':
+    migrate()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Book Tracker v11 Migration
+Index-backed sorting for the library list. The book columns it sorts by are
+mirrored onto user_books (kept current by triggers), so that every sort key
+can be indexed on its own and after status.
+"""
+
+import sqlite3
+from pathlib import Path
+import os
+
+def get_database_path():
+    """Get database path, supporting Railway volume mount."""
+    volume_path = os.environ.get('RAILWAY_VOLUME_MOUNT_PATH')
+    if volume_path:
+        return Path(volume_path) / 'books.db'
+    return Path(__file__).parent / 'books.db'
+
+# Seconds to wait for another process applying the same migration
+MIGRATION_LOCK_TIMEOUT = 300
+
+# Copies of books.title, author, page_count and year_published
+SORT_COLUMNS = [
+    ('sort_title', 'TEXT'),
+    ('sort_author', 'TEXT'),
+    ('sort_page_count', 'INTEGER'),
+    ('sort_year_published', 'INTEGER'),
+]
+
+# Each sort key alone serves the unfiltered list; after status, the status filter
+INDEXES = [
+    ('idx_user_books_rating', 'my_rating'),
+    ('idx_user_books_sort_title', 'sort_title'),
+    ('idx_user_books_sort_author', 'sort_author'),
+    ('idx_user_books_sort_page_count', 'sort_page_count'),
+    ('idx_user_books_sort_year', 'sort_year_published'),
+    ('idx_user_books_status_date_added', 'status, date_added'),
+    ('idx_user_books_status_finished', 'status, finished_reading_at'),
+    ('idx_user_books_status_rating', 'status, my_rating'),
+    ('idx_user_books_status_title', 'status, sort_title'),
+    ('idx_user_books_status_author', 'status, sort_author'),
+    ('idx_user_books_status_page_count', 'status, sort_page_count'),
+    ('idx_user_books_status_year', 'status, sort_year_published'),
+]
+
+def migrate():
+    """Run v11 migration. Safe to run repeatedly."""
+    db_path = get_database_path()
+
+    # Workers run this at the same time on boot. The write lock, held from the
+    # check below to the commit, lets only the first apply it; the rest wait.
+    conn = sqlite3.connect(db_path, timeout=MIGRATION_LOCK_TIMEOUT)
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type='trigger' AND name='user_books_sort_ai'
+    """)
+    if cursor.fetchone():
+        conn.close()
+        return
+
+    print(f"Migrating database at: {db_path}")
+
+    cursor.execute("PRAGMA table_info(user_books)")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+    for col_name, col_type in SORT_COLUMNS:
+        if col_name not in existing_columns:
+            print(f"Adding column: user_books.{col_name}")
+            cursor.execute(f"ALTER TABLE user_books ADD COLUMN {col_name} {col_type}")
+
+    print("Creating sort key triggers")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS user_books_sort_ai AFTER INSERT ON user_books BEGIN
+            UPDATE user_books SET (sort_title, sort_author, sort_page_count, sort_year_published) = (
+                SELECT title, author, page_count, year_published FROM books WHERE id = new.book_id
+            ) WHERE id = new.id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS user_books_sort_au AFTER UPDATE OF book_id ON user_books BEGIN
+            UPDATE user_books SET (sort_title, sort_author, sort_page_count, sort_year_published) = (
+                SELECT title, author, page_count, year_published FROM books WHERE id = new.book_id
+            ) WHERE id = new.id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS user_books_sort_books_au
+        AFTER UPDATE OF title, author, page_count, year_published ON books BEGIN
+            UPDATE user_books SET (sort_title, sort_author, sort_page_count, sort_year_published) =
+                (new.title, new.author, new.page_count, new.year_published)
+            WHERE book_id = new.id;
+        END
+    """)
+
+    print("Backfilling sort keys...")
+    cursor.execute("""
+        UPDATE user_books SET (sort_title, sort_author, sort_page_count, sort_year_published) = (
+            SELECT title, author, page_count, year_published FROM books WHERE books.id = user_books.book_id
+        )
+    """)
+
+    for index_name, columns in INDEXES:
+        print(f"Creating index: {index_name}")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON user_books({columns})")
+
+    conn.commit()
+    conn.close()
+
+    print("Migration complete!")
+
+if __name__ == '__main__':
+    migrate()
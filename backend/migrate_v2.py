@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Book Tracker v2 Migration
+Adds an FTS5 full-text index over the books catalog fields for library search.
+"""
+
+import sqlite3
+from pathlib import Path
+import os
+
+def get_database_path():
+    """Get database path, supporting Railway volume mount."""
+    volume_path = os.environ.get('RAILWAY_VOLUME_MOUNT_PATH')
+    if volume_path:
+        return Path(volume_path) / 'books.db'
+    return Path(__file__).parent / 'books.db'
+
+# Seconds to wait for another process applying the same migration
+MIGRATION_LOCK_TIMEOUT = 300
+
+def migrate():
+    """Run v2 migration. Safe to run repeatedly."""
+    db_path = get_database_path()
+
+    # Workers run this at the same time on boot. The write lock, held from the
+    # check below to the commit, lets only the first apply it; the rest wait.
+    conn = sqlite3.connect(db_path, timeout=MIGRATION_LOCK_TIMEOUT)
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type='table' AND name='books_fts'
+    """)
+    if cursor.fetchone():
+        conn.close()
+        return
+
+    print(f"Migrating database at: {db_path}")
+
+    # External-content FTS5 table: the text lives in books, the index in books_fts
+    print("Creating table: books_fts")
+    cursor.execute("""
+        CREATE VIRTUAL TABLE books_fts USING fts5(
+            title,
+            author,
+            additional_authors,
+            publisher,
+            description,
+            content='books',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    """)
+
+    # Keep the index in sync with the books table
+    print("Creating triggers: books_fts_ai, books_fts_ad, books_fts_au")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+            INSERT INTO books_fts (rowid, title, author, additional_authors, publisher, description)
+            VALUES (new.id, new.title, new.author, new.additional_authors, new.publisher, new.description);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+            INSERT INTO books_fts (books_fts, rowid, title, author, additional_authors, publisher, description)
+            VALUES ('delete', old.id, old.title, old.author, old.additional_authors, old.publisher, old.description);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS books_fts_au
+        AFTER UPDATE OF title, author, additional_authors, publisher, description ON books BEGIN
+            INSERT INTO books_fts (books_fts, rowid, title, author, additional_authors, publisher, description)
+            VALUES ('delete', old.id, old.title, old.author, old.additional_authors, old.publisher, old.description);
+            INSERT INTO books_fts (rowid, title, author, additional_authors, publisher, description)
+            VALUES (new.id, new.title, new.author, new.additional_authors, new.publisher, new.description);
+        END
+    """)
+
+    # Backfill the index from existing books
+    print("Backfilling books_fts...")
+    cursor.execute("INSERT INTO books_fts (books_fts) VALUES ('rebuild')")
+
+    conn.commit()
+    conn.close()
+
+    print("Migration complete!")
+
+if __name__ == '__main__':
+    migrate()
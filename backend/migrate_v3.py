@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Book Tracker v3 Migration
+Adds the persistent Open Library response cache table.
+"""
+
+import sqlite3
+from pathlib import Path
+import os
+
+def get_database_path():
+    """Get database path, supporting Railway volume mount."""
+    volume_path = os.environ.get('RAILWAY_VOLUME_MOUNT_PATH')
+    if volume_path:
+        return Path(volume_path) / 'books.db'
+    return Path(__file__).parent / 'books.db'
+
+# Seconds to wait for another process applying the same migration
+MIGRATION_LOCK_TIMEOUT = 300
+
+def migrate():
+    """Run v3 migration. Safe to run repeatedly."""
+    db_path = get_database_path()
+
+    # Workers run this at the same time on boot. The write lock, held from the
+    # check below to the commit, lets only the first apply it; the rest wait.
+    conn = sqlite3.connect(db_path, timeout=MIGRATION_LOCK_TIMEOUT)
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type='table' AND name='open_library_cache'
+    """)
+    if cursor.fetchone():
+        conn.close()
+        return
+
+    print(f"Migrating database at: {db_path}")
+
+    print("Creating table: open_library_cache")
+    cursor.execute("""
+        CREATE TABLE open_library_cache (
+            cache_key TEXT PRIMARY KEY,
+            response TEXT NOT NULL,
+            found INTEGER NOT NULL,
+            fetched_at REAL NOT NULL,
+            last_used_at REAL NOT NULL
+        )
+    """)
+
+    print("Creating index: idx_open_library_cache_last_used")
+    cursor.execute("CREATE INDEX idx_open_library_cache_last_used ON open_library_cache(last_used_at)")
+
+    conn.commit()
+    conn.close()
+
+    print("Migration complete!")
+
+if __name__ == '__main__':
+    migrate()
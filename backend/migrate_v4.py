@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Book Tracker v4 Migration
+Adds the enrichment_jobs table used to checkpoint background bulk enrichment.
+"""
+
+import sqlite3
+from pathlib import Path
+import os
+
+def get_database_path():
+    """Get database path, supporting Railway volume mount."""
+    volume_path = os.environ.get('RAILWAY_VOLUME_MOUNT_PATH')
+    if volume_path:
+        return Path(volume_path) / 'books.db'
+    return Path(__file__).parent / 'books.db'
+
+# Seconds to wait for another process applying the same migration
+MIGRATION_LOCK_TIMEOUT = 300
+
+def migrate():
+    """Run v4 migration. Safe to run repeatedly."""
+    db_path = get_database_path()
+
+    # Workers run this at the same time on boot. The write lock, held from the
+    # check below to the commit, lets only the first apply it; the rest wait.
+    conn = sqlite3.connect(db_path, timeout=MIGRATION_LOCK_TIMEOUT)
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type='table' AND name='enrichment_jobs'
+    """)
+    if cursor.fetchone():
+        conn.close()
+        return
+
+    print(f"Migrating database at: {db_path}")
+
+    print("Creating table: enrichment_jobs")
+    cursor.execute("""
+        CREATE TABLE enrichment_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            status TEXT CHECK(status IN ('running', 'completed', 'cancelled', 'failed')) NOT NULL,
+            last_book_id INTEGER DEFAULT 0,
+            total INTEGER DEFAULT 0,
+            processed INTEGER DEFAULT 0,
+            enriched INTEGER DEFAULT 0,
+            failed INTEGER DEFAULT 0,
+            error TEXT,
+            started_at TIMESTAMP,
+            updated_at TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    """)
+
+    conn.commit()
+    conn.close()
+
+    print("Migration complete!")
+
+if __name__ == '__main__':
+    migrate()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Book Tracker v5 Migration
+Adds the library_stats rollup table, its maintenance triggers, and backfills it.
+"""
+
+import sqlite3
+from pathlib import Path
+import os
+
+def get_database_path():
+    """Get database path, supporting Railway volume mount."""
+    volume_path = os.environ.get('RAILWAY_VOLUME_MOUNT_PATH')
+    if volume_path:
+        return Path(volume_path) / 'books.db'
+    return Path(__file__).parent / 'books.db'
+
+# Seconds to wait for another process applying the same migration
+MIGRATION_LOCK_TIMEOUT = 300
+
+def migrate():
+    """Run v5 migration. Safe to run repeatedly."""
+    db_path = get_database_path()
+
+    # Workers run this at the same time on boot. The write lock, held from the
+    # check below to the commit, lets only the first apply it; the rest wait.
+    conn = sqlite3.connect(db_path, timeout=MIGRATION_LOCK_TIMEOUT)
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type='table' AND name='library_stats'
+    """)
+    if cursor.fetchone():
+        conn.close()
+        return
+
+    print(f"Migrating database at: {db_path}")
+
+    print("Creating table: library_stats")
+    cursor.execute("""
+        CREATE TABLE library_stats (
+            metric TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (metric, key)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_library_stats_value ON library_stats(metric, value)")
+
+    print("Creating library_stats triggers")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS library_stats_user_books_ai AFTER INSERT ON user_books BEGIN
+            INSERT INTO library_stats (metric, key, value)
+            SELECT metric, key, value FROM (
+                SELECT 'status' AS metric, new.status AS key, 1 AS value
+                UNION ALL
+                SELECT 'finished_year', strftime('%Y', new.finished_reading_at), 1
+                WHERE strftime('%Y', new.finished_reading_at) IS NOT NULL
+                UNION ALL
+                SELECT 'days_to_read_sum', '', CAST(julianday(new.finished_reading_at) - julianday(new.date_added) AS INTEGER)
+                WHERE CAST(julianday(new.finished_reading_at) - julianday(new.date_added) AS INTEGER) >= 0
+                UNION ALL
+                SELECT 'days_to_read_count', '', 1
+                WHERE CAST(julianday(new.finished_reading_at) - julianday(new.date_added) AS INTEGER) >= 0
+                UNION ALL
+                SELECT 'pages_read', '', b.page_count FROM books b
+                WHERE b.id = new.book_id AND new.status = 'finished' AND b.page_count IS NOT NULL
+                UNION ALL
+                SELECT 'author', b.author, 1 FROM books b WHERE b.id = new.book_id
+            ) WHERE true
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS library_stats_user_books_ad AFTER DELETE ON user_books BEGIN
+            INSERT INTO library_stats (metric, key, value)
+            SELECT metric, key, value FROM (
+                SELECT 'status' AS metric, old.status AS key, -1 AS value
+                UNION ALL
+                SELECT 'finished_year', strftime('%Y', old.finished_reading_at), -1
+                WHERE strftime('%Y', old.finished_reading_at) IS NOT NULL
+                UNION ALL
+                SELECT 'days_to_read_sum', '', -CAST(julianday(old.finished_reading_at) - julianday(old.date_added) AS INTEGER)
+                WHERE CAST(julianday(old.finished_reading_at) - julianday(old.date_added) AS INTEGER) >= 0
+                UNION ALL
+                SELECT 'days_to_read_count', '', -1
+                WHERE CAST(julianday(old.finished_reading_at) - julianday(old.date_added) AS INTEGER) >= 0
+                UNION ALL
+                SELECT 'pages_read', '', -b.page_count FROM books b
+                WHERE b.id = old.book_id AND old.status = 'finished' AND b.page_count IS NOT NULL
+                UNION ALL
+                SELECT 'author', b.author, -1 FROM books b WHERE b.id = old.book_id
+            ) WHERE true
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS library_stats_user_books_au
+        AFTER UPDATE OF book_id, status, date_added, finished_reading_at ON user_books BEGIN
+            INSERT INTO library_stats (metric, key, value)
+            SELECT metric, key, value FROM (
+                SELECT 'status' AS metric, old.status AS key, -1 AS value
+                UNION ALL
+                SELECT 'finished_year', strftime('%Y', old.finished_reading_at), -1
+                WHERE strftime('%Y', old.finished_reading_at) IS NOT NULL
+                UNION ALL
+                SELECT 'days_to_read_sum', '', -CAST(julianday(old.finished_reading_at) - julianday(old.date_added) AS INTEGER)
+                WHERE CAST(julianday(old.finished_reading_at) - julianday(old.date_added) AS INTEGER) >= 0
+                UNION ALL
+                SELECT 'days_to_read_count', '', -1
+                WHERE CAST(julianday(old.finished_reading_at) - julianday(old.date_added) AS INTEGER) >= 0
+                UNION ALL
+                SELECT 'pages_read', '', -b.page_count FROM books b
+                WHERE b.id = old.book_id AND old.status = 'finished' AND b.page_count IS NOT NULL
+                UNION ALL
+                SELECT 'author', b.author, -1 FROM books b WHERE b.id = old.book_id
+            ) WHERE true
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO library_stats (metric, key, value)
+            SELECT metric, key, value FROM (
+                SELECT 'status' AS metric, new.status AS key, 1 AS value
+                UNION ALL
+                SELECT 'finished_year', strftime('%Y', new.finished_reading_at), 1
+                WHERE strftime('%Y', new.finished_reading_at) IS NOT NULL
+                UNION ALL
+                SELECT 'days_to_read_sum', '', CAST(julianday(new.finished_reading_at) - julianday(new.date_added) AS INTEGER)
+                WHERE CAST(julianday(new.finished_reading_at) - julianday(new.date_added) AS INTEGER) >= 0
+                UNION ALL
+                SELECT 'days_to_read_count', '', 1
+                WHERE CAST(julianday(new.finished_reading_at) - julianday(new.date_added) AS INTEGER) >= 0
+                UNION ALL
+                SELECT 'pages_read', '', b.page_count FROM books b
+                WHERE b.id = new.book_id AND new.status = 'finished' AND b.page_count IS NOT NULL
+                UNION ALL
+                SELECT 'author', b.author, 1 FROM books b WHERE b.id = new.book_id
+            ) WHERE true
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS library_stats_books_au AFTER UPDATE OF author, page_count ON books BEGIN
+            INSERT INTO library_stats (metric, key, value)
+            SELECT metric, key, value FROM (
+                SELECT 'author' AS metric, old.author AS key, -1 AS value FROM user_books ub
+                WHERE ub.book_id = old.id
+                UNION ALL
+                SELECT 'pages_read', '', -old.page_count FROM user_books ub
+                WHERE ub.book_id = old.id AND ub.status = 'finished' AND old.page_count IS NOT NULL
+            ) WHERE true
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO library_stats (metric, key, value)
+            SELECT metric, key, value FROM (
+                SELECT 'author' AS metric, new.author AS key, 1 AS value FROM user_books ub
+                WHERE ub.book_id = new.id
+                UNION ALL
+                SELECT 'pages_read', '', new.page_count FROM user_books ub
+                WHERE ub.book_id = new.id AND ub.status = 'finished' AND new.page_count IS NOT NULL
+            ) WHERE true
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS library_stats_tags_ai AFTER INSERT ON user_book_tags BEGIN
+            INSERT INTO library_stats (metric, key, value) VALUES ('tag', new.tag_id, 1)
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS library_stats_tags_ad AFTER DELETE ON user_book_tags BEGIN
+            INSERT INTO library_stats (metric, key, value) VALUES ('tag', old.tag_id, -1)
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS library_stats_tags_au AFTER UPDATE OF tag_id ON user_book_tags BEGIN
+            INSERT INTO library_stats (metric, key, value) VALUES ('tag', old.tag_id, -1)
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO library_stats (metric, key, value) VALUES ('tag', new.tag_id, 1)
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+        END
+    """)
+
+    # Backfill from the current library
+    print("Backfilling library_stats...")
+    from library_stats import rebuild
+    rebuild(conn)
+
+    conn.close()
+
+    print("Migration complete!")
+
+if __name__ == '__main__':
+    migrate()
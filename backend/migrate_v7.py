@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Book Tracker v7 Migration
+Adds the library_revision counter and the triggers that bump it on every
+write to library data.
+"""
+
+import sqlite3
+from pathlib import Path
+import os
+
+# Tables whose writes change what the read endpoints return
+REVISION_TABLES = [
+    'books',
+    'user_books',
+    'tags',
+    'user_book_tags',
+    'learning_paths',
+    'learning_path_books',
+    'notes',
+    'reading_sessions',
+    'user_settings',
+]
+
+def get_database_path():
+    """Get database path, supporting Railway volume mount."""
+    volume_path = os.environ.get('RAILWAY_VOLUME_MOUNT_PATH')
+    if volume_path:
+        return Path(volume_path) / 'books.db'
+    return Path(__file__).parent / 'books.db'
+
+# Seconds to wait for another process applying the same migration
+MIGRATION_LOCK_TIMEOUT = 300
+
+def migrate():
+    """Run v7 migration. Safe to run repeatedly."""
+    db_path = get_database_path()
+
+    # Workers run this at the same time on boot. The write lock, held from the
+    # check below to the commit, lets only the first apply it; the rest wait.
+    conn = sqlite3.connect(db_path, timeout=MIGRATION_LOCK_TIMEOUT)
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type='table' AND name='library_revision'
+    """)
+    if cursor.fetchone():
+        conn.close()
+        return
+
+    print(f"Migrating database at: {db_path}")
+
+    print("Creating table: library_revision")
+    cursor.execute("""
+        CREATE TABLE library_revision (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            epoch TEXT NOT NULL,
+            revision INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO library_revision (id, epoch, revision)
+        VALUES (1, lower(hex(randomblob(4))), 0)
+    """)
+
+    print("Creating library_revision triggers")
+    for table in REVISION_TABLES:
+        for suffix, event in (('ai', 'INSERT'), ('ad', 'DELETE'), ('au', 'UPDATE')):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS library_revision_{table}_{suffix} AFTER {event} ON {table} BEGIN
+                    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+                END
+            """)
+
+    conn.commit()
+    conn.close()
+
+    print("Migration complete!")
+
+if __name__ == '__main__':
+    migrate()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Book Tracker v9 Migration
+Adds per-path book and finished counts to library_stats, kept current by
+triggers on learning_path_books and user_books.
+"""
+
+import sqlite3
+from pathlib import Path
+import os
+
+def get_database_path():
+    """Get database path, supporting Railway volume mount."""
+    volume_path = os.environ.get('RAILWAY_VOLUME_MOUNT_PATH')
+    if volume_path:
+        return Path(volume_path) / 'books.db'
+    return Path(__file__).parent / 'books.db'
+
+# Seconds to wait for another process applying the same migration
+MIGRATION_LOCK_TIMEOUT = 300
+
+def migrate():
+    """Run v9 migration. Safe to run repeatedly."""
+    db_path = get_database_path()
+
+    # Workers run this at the same time on boot. The write lock, held from the
+    # check below to the commit, lets only the first apply it; the rest wait.
+    conn = sqlite3.connect(db_path, timeout=MIGRATION_LOCK_TIMEOUT)
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type='trigger' AND name='library_stats_paths_ai'
+    """)
+    if cursor.fetchone():
+        conn.close()
+        return
+
+    print(f"Migrating database at: {db_path}")
+
+    # Deleted paths used to leave their memberships behind
+    print("Removing memberships of deleted learning paths...")
+    cursor.execute("""
+        DELETE FROM learning_path_books
+        WHERE learning_path_id NOT IN (SELECT id FROM learning_paths)
+    """)
+
+    print("Creating learning path rollup triggers")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS library_stats_paths_ai AFTER INSERT ON learning_path_books BEGIN
+            INSERT INTO library_stats (metric, key, value)
+            SELECT metric, key, value FROM (
+                SELECT 'path_books' AS metric, new.learning_path_id AS key, 1 AS value
+                UNION ALL
+                SELECT 'path_finished', new.learning_path_id, 1 FROM user_books ub
+                WHERE ub.id = new.user_book_id AND ub.status = 'finished'
+            ) WHERE true
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS library_stats_paths_ad AFTER DELETE ON learning_path_books BEGIN
+            INSERT INTO library_stats (metric, key, value)
+            SELECT metric, key, value FROM (
+                SELECT 'path_books' AS metric, old.learning_path_id AS key, -1 AS value
+                UNION ALL
+                SELECT 'path_finished', old.learning_path_id, -1 FROM user_books ub
+                WHERE ub.id = old.user_book_id AND ub.status = 'finished'
+            ) WHERE true
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS library_stats_paths_au
+        AFTER UPDATE OF learning_path_id, user_book_id ON learning_path_books BEGIN
+            INSERT INTO library_stats (metric, key, value)
+            SELECT metric, key, value FROM (
+                SELECT 'path_books' AS metric, old.learning_path_id AS key, -1 AS value
+                UNION ALL
+                SELECT 'path_finished', old.learning_path_id, -1 FROM user_books ub
+                WHERE ub.id = old.user_book_id AND ub.status = 'finished'
+                UNION ALL
+                SELECT 'path_books', new.learning_path_id, 1
+                UNION ALL
+                SELECT 'path_finished', new.learning_path_id, 1 FROM user_books ub
+                WHERE ub.id = new.user_book_id AND ub.status = 'finished'
+            ) WHERE true
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS library_stats_paths_user_books_au
+        AFTER UPDATE OF status ON user_books
+        WHEN (old.status = 'finished') != (new.status = 'finished') BEGIN
+            INSERT INTO library_stats (metric, key, value)
+            SELECT 'path_finished', lpb.learning_path_id, CASE WHEN new.status = 'finished' THEN 1 ELSE -1 END
+            FROM learning_path_books lpb
+            WHERE lpb.user_book_id = new.id
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS library_stats_paths_user_books_ad
+        AFTER DELETE ON user_books WHEN old.status = 'finished' BEGIN
+            INSERT INTO library_stats (metric, key, value)
+            SELECT 'path_finished', lpb.learning_path_id, -1
+            FROM learning_path_books lpb
+            WHERE lpb.user_book_id = old.id
+            ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+        END
+    """)
+
+    print("Backfilling library_stats...")
+    from library_stats import rebuild
+    rebuild(conn, commit=False)
+
+    conn.commit()
+    conn.close()
+
+    print("Migration complete!")
+
+if __name__ == '__main__':
+    migrate()
@@ -0,0 +1,270 @@
+"""Open Library search client with a persistent SQLite response cache."""
+
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+
+import database
+import http_client
+import metrics
+
+OPEN_LIBRARY_SEARCH = os.environ.get('OPEN_LIBRARY_SEARCH_URL', 'https://openlibrary.org/search.json')
+OPEN_LIBRARY_COVERS = 'https://covers.openlibrary.org/b'
+SEARCH_FIELDS = 'key,title,author_name,first_publish_year,cover_i,isbn,number_of_pages_median,publisher,subject'
+
+# Seconds a search may take in total, including waiting on an identical search in flight
+SEARCH_TIMEOUT = 10
+
+# Shared by every Open Library request in this process, covers included
+client = http_client.HTTPClient(user_agent='book-tracker')
+
+# Searches in flight by cache key
+_searches = http_client.SingleFlight()
+
+# A cache hit refreshes last_used_at only once it is older than this fraction
+# of the entry's TTL, so most hits read without taking the write lock
+CACHE_TOUCH_FRACTION = 0.1
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so equivalent lookups share a cache entry."""
+    return re.sub(r'\s+', ' ', query or '').strip().lower()
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the rate of outbound requests."""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class OpenLibraryCache:
+    """SQLite-backed cache of Open Library search responses.
+
+    Entries are keyed by normalized query, limit and field list. Empty
+    ("not found") responses are cached too, with their own TTL. When the
+    table grows past max_entries the least recently used entries are evicted.
+
+    Each worker process keeps one connection for the cache, used by one
+    thread at a time. It is separate from the request pool, so a lookup made
+    while a request holds a pooled connection cannot wait on the pool.
+    """
+
+    def __init__(self, db_path, ttl: int, negative_ttl: int, max_entries: int):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'negative_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self._conn = None
+        self._conn_pid = None
+        self._conn_lock = threading.Lock()
+
+    @contextmanager
+    def _connection(self):
+        """Use this worker's cache connection, opening it on first use."""
+        with self._conn_lock:
+            # Connections must not cross a fork; a forked worker opens its own
+            if self._conn is None or self._conn_pid != os.getpid():
+                self._conn = database.connect(self.db_path)
+                self._conn_pid = os.getpid()
+            try:
+                yield self._conn
+            finally:
+                if self._conn.in_transaction:
+                    self._conn.rollback()
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] += amount
+
+    @staticmethod
+    def make_key(query: str, limit: int, fields: str) -> str:
+        """Build the cache key for a search."""
+        return f'{normalize_query(query)}|{limit}|{fields}'
+
+    def get(self, key: str) -> list[dict] | None:
+        """Get cached docs for a key, or None on a miss or expired entry."""
+        now = time.time()
+        with self._connection() as conn:
+            row = conn.execute(
+                'SELECT response, found, fetched_at, last_used_at FROM open_library_cache WHERE cache_key = ?',
+                (key,)
+            ).fetchone()
+            if row:
+                response, found, fetched_at, last_used_at = row
+                ttl = self.ttl if found else self.negative_ttl
+                if now - fetched_at > ttl:
+                    row = None
+                elif now - last_used_at > ttl * CACHE_TOUCH_FRACTION:
+                    conn.execute(
+                        'UPDATE open_library_cache SET last_used_at = ? WHERE cache_key = ?',
+                        (now, key)
+                    )
+                    conn.commit()
+
+        if row is None:
+            self._count('misses')
+            return None
+        self._count('hits' if found else 'negative_hits')
+        return json.loads(response)
+
+    def set(self, key: str, docs: list[dict]):
+        """Store docs for a key and evict least recently used entries over the cap."""
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute('''
+                INSERT INTO open_library_cache (cache_key, response, found, fetched_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    response = excluded.response,
+                    found = excluded.found,
+                    fetched_at = excluded.fetched_at,
+                    last_used_at = excluded.last_used_at
+            ''', (key, json.dumps(docs), 1 if docs else 0, now, now))
+
+            total = conn.execute('SELECT COUNT(*) FROM open_library_cache').fetchone()[0]
+            overflow = total - self.max_entries
+            if overflow > 0:
+                conn.execute('''
+                    DELETE FROM open_library_cache WHERE cache_key IN (
+                        SELECT cache_key FROM open_library_cache
+                        ORDER BY last_used_at ASC
+                        LIMIT ?
+                    )
+                ''', (overflow,))
+                self._count('evictions', overflow)
+            conn.commit()
+
+        self._count('stores')
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._connection() as conn:
+            conn.execute('DELETE FROM open_library_cache')
+            conn.commit()
+
+    def stats(self) -> dict:
+        """Get hit/miss counters for this process plus the current entry count."""
+        with self._connection() as conn:
+            entries = conn.execute('SELECT COUNT(*) FROM open_library_cache').fetchone()[0]
+
+        with self._lock:
+            counters = dict(self._counters)
+
+        lookups = counters['hits'] + counters['negative_hits'] + counters['misses']
+        counters['entries'] = entries
+        counters['max_entries'] = self.max_entries
+        counters['hit_rate'] = round((counters['hits'] + counters['negative_hits']) / lookups, 3) if lookups else None
+        return counters
+
+
+def fetch_search(query: str, limit: int, fields: str = SEARCH_FIELDS, timeout: float = SEARCH_TIMEOUT) -> list[dict]:
+    """Query the Open Library search API. Raises on network or decode errors."""
+    params = urllib.parse.urlencode({
+        'q': query,
+        'limit': limit,
+        'fields': fields,
+    })
+    url = f"{OPEN_LIBRARY_SEARCH}?{params}"
+
+    with metrics.time_open_library('search'):
+        response = client.get(url, timeout=timeout)
+        data = json.loads(response.body.decode())
+    return data.get('docs', [])
+
+
+def search(query: str, limit: int = 5, cache: OpenLibraryCache = None, fields: str = SEARCH_FIELDS,
+           limiter: TokenBucket = None, timeout: float = SEARCH_TIMEOUT) -> list[dict]:
+    """Search Open Library, serving repeats from the cache when one is given.
+
+    Identical searches already in flight (same cache key) share that request
+    instead of sending their own. Only network requests take a token from the
+    limiter; cache hits and shared requests are free. Failed requests return
+    an empty list and are not cached, so a transient outage is not remembered
+    as "not found".
+    """
+    key = OpenLibraryCache.make_key(query, limit, fields)
+    if cache:
+        docs = cache.get(key)
+        if docs is not None:
+            return docs
+
+    def fetch():
+        if limiter:
+            limiter.acquire()
+        docs = fetch_search(query, limit, fields, timeout)
+        if cache:
+            cache.set(key, docs)
+        return docs
+
+    try:
+        docs, shared = _searches.do(key, fetch, timeout=timeout)
+    except Exception as e:
+        print(f"Open Library API error: {e}")
+        return []
+
+    if shared:
+        metrics.open_library_coalesced.inc(endpoint='search')
+    return docs
+
+
+def find_book(book: dict, cache: OpenLibraryCache = None, limiter: TokenBucket = None,
+              timeout: float = SEARCH_TIMEOUT) -> dict | None:
+    """Find the Open Library record for a book by ISBN-13, then ISBN-10, then title and author.
+
+    The timeout applies to each search.
+    """
+    for isbn in (book.get('isbn13'), book.get('isbn')):
+        if isbn:
+            results = search(f'isbn:{isbn}', limit=1, cache=cache, limiter=limiter, timeout=timeout)
+            if results:
+                return results[0]
+
+    results = search(f"{book['title']} {book['author']}", limit=1, cache=cache, limiter=limiter, timeout=timeout)
+    return results[0] if results else None
+
+
+def extract_open_library_info(ol_book: dict) -> dict:
+    """Extract relevant info from Open Library search result."""
+    cover_id = ol_book.get('cover_i')
+    isbns = ol_book.get('isbn', [])
+
+    isbn13 = next((i for i in isbns if len(i) == 13), None)
+    isbn10 = next((i for i in isbns if len(i) == 10), None)
+
+    return {
+        'open_library_key': ol_book.get('key'),
+        'title': ol_book.get('title'),
+        'authors': ol_book.get('author_name', []),
+        'first_publish_year': ol_book.get('first_publish_year'),
+        'page_count': ol_book.get('number_of_pages_median'),
+        'publishers': ol_book.get('publisher', [])[:3],
+        'subjects': ol_book.get('subject', [])[:10],
+        'cover_image_url': f"{OPEN_LIBRARY_COVERS}/id/{cover_id}-L.jpg" if cover_id else None,
+        'cover_image_medium': f"{OPEN_LIBRARY_COVERS}/id/{cover_id}-M.jpg" if cover_id else None,
+        'isbn_10': isbn10,
+        'isbn_13': isbn13,
+    }
@@ -0,0 +1,80 @@
+"""Gap-based ordering of books within a learning path.
+
+learning_path_books.position is a sparse rank: books are spaced
+POSITION_GAP apart, so a book can be moved or inserted between two
+neighbours by writing only its own row (the midpoint of their ranks).
+When two neighbours end up adjacent the path is renormalized, which
+rewrites every rank in that path once and restores the full gap.
+"""
+
+import sqlite3
+
+POSITION_GAP = 1024
+
+RENORMALIZE_SQL = '''
+    UPDATE learning_path_books
+    SET position = ranked.rank * ?
+    FROM (
+        SELECT learning_path_id, user_book_id,
+               ROW_NUMBER() OVER (
+                   PARTITION BY learning_path_id
+                   ORDER BY position, created_at, user_book_id
+               ) AS rank
+        FROM learning_path_books
+        WHERE learning_path_id = ? OR ? IS NULL
+    ) AS ranked
+    WHERE learning_path_books.learning_path_id = ranked.learning_path_id
+      AND learning_path_books.user_book_id = ranked.user_book_id
+'''
+
+
+def renormalize(conn: sqlite3.Connection, path_id: int = None):
+    """Respace ranks to multiples of POSITION_GAP (one path, or all). Does not commit."""
+    conn.execute(RENORMALIZE_SQL, (POSITION_GAP, path_id, path_id))
+
+
+def next_position(conn: sqlite3.Connection, path_id: int) -> int:
+    """Rank for appending to the end of a path."""
+    row = conn.execute(
+        'SELECT MAX(position) FROM learning_path_books WHERE learning_path_id = ?',
+        (path_id,)
+    ).fetchone()
+    return (row[0] or 0) + POSITION_GAP
+
+
+def position_between(conn: sqlite3.Connection, path_id: int, anchor_id: int, place: str,
+                     moving_id: int = None) -> int | None:
+    """Rank that puts a book just before or after the anchor book.
+
+    Returns None if the anchor is not in the path. Renormalizes the path
+    first when there is no free rank next to the anchor.
+    """
+    for attempt in range(2):
+        row = conn.execute(
+            'SELECT position FROM learning_path_books WHERE learning_path_id = ? AND user_book_id = ?',
+            (path_id, anchor_id)
+        ).fetchone()
+        if row is None:
+            return None
+        anchor = row[0]
+
+        if place == 'after':
+            neighbour = conn.execute('''
+                SELECT MIN(position) FROM learning_path_books
+                WHERE learning_path_id = ? AND position > ? AND user_book_id IS NOT ?
+            ''', (path_id, anchor, moving_id)).fetchone()[0]
+            if neighbour is None:
+                return anchor + POSITION_GAP
+        else:
+            neighbour = conn.execute('''
+                SELECT MAX(position) FROM learning_path_books
+                WHERE learning_path_id = ? AND position < ? AND user_book_id IS NOT ?
+            ''', (path_id, anchor, moving_id)).fetchone()[0]
+            if neighbour is None:
+                return anchor - POSITION_GAP
+
+        if abs(neighbour - anchor) > 1:
+            return (anchor + neighbour) // 2
+        if attempt == 0:
+            renormalize(conn, path_id)
+    raise RuntimeError('No free rank after renormalizing')
@@ -0,0 +1,84 @@
+"""In-process cache of serialized API responses.
+
+Entries are keyed by endpoint and arguments and tagged with the library ETag
+(see get_library_etag in app.py) they were computed at. The ETag comes from a
+revision counter in the database, so a write from any worker or script makes
+older entries unreachable; they are dropped as soon as a newer revision is seen.
+Mutating requests in this process also clear the cache right away. Memory is
+capped by response size, with least recently used entries evicted first.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """LRU cache of response bodies, bounded by total bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (etag, body)
+        self._etag = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'invalidations': 0, 'bytes_saved': 0,
+        }
+
+    def _drop_all(self):
+        self._counters['invalidations'] += len(self._entries)
+        self._entries.clear()
+        self._bytes = 0
+
+    def _observe(self, etag: str):
+        # Revisions only move forward; entries from any other revision are dead
+        if etag != self._etag:
+            self._drop_all()
+            self._etag = etag
+
+    def get(self, key: tuple, etag: str) -> bytes | None:
+        """Get the cached body for a key at the given library ETag."""
+        with self._lock:
+            self._observe(etag)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            self._counters['bytes_saved'] += len(entry[1])
+            return entry[1]
+
+    def set(self, key: tuple, etag: str, body: bytes):
+        """Store a response body computed at the given library ETag."""
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._observe(etag)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[1])
+            self._entries[key] = (etag, body)
+            self._bytes += size
+            self._counters['stores'] += 1
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._counters['evictions'] += 1
+
+    def invalidate(self):
+        """Drop every entry (after a write in this process)."""
+        with self._lock:
+            self._drop_all()
+
+    def stats(self) -> dict:
+        """Get hit/miss counters and current size for this process."""
+        with self._lock:
+            counters = dict(self._counters)
+            counters['entries'] = len(self._entries)
+            counters['bytes'] = self._bytes
+        lookups = counters['hits'] + counters['misses']
+        counters['max_bytes'] = self.max_bytes
+        counters['hit_rate'] = round(counters['hits'] / lookups, 3) if lookups else None
+        return counters
@@ -53,6 +53,11 @@ CREATE TABLE IF NOT EXISTS user_books (
     date_captured DATE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Copies of the book's sort keys, kept current by triggers (v11)
+    sort_title TEXT,
+    sort_author TEXT,
+    sort_page_count INTEGER,
+    sort_year_published INTEGER,
     UNIQUE(book_id)
 );
 
@@ -109,7 +114,7 @@ CREATE TABLE IF NOT EXISTS learning_paths (
 CREATE TABLE IF NOT EXISTS learning_path_books (
     learning_path_id INTEGER NOT NULL REFERENCES learning_paths(id) ON DELETE CASCADE,
     user_book_id INTEGER NOT NULL REFERENCES user_books(id) ON DELETE CASCADE,
-    position INTEGER DEFAULT 0,  -- Order within path
+    position INTEGER DEFAULT 0,  -- Sparse rank within path (see path_ranks.py)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     PRIMARY KEY (learning_path_id, user_book_id)
 );
@@ -121,6 +126,38 @@ CREATE TABLE IF NOT EXISTS user_settings (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Cached Open Library search responses (empty responses cache "not found")
+CREATE TABLE IF NOT EXISTS open_library_cache (
+    cache_key TEXT PRIMARY KEY,  -- normalized query|limit|fields
+    response TEXT NOT NULL,  -- JSON list of docs
+    found INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,  -- Unix time, for TTL
+    last_used_at REAL NOT NULL  -- Unix time, for LRU eviction
+);
+
+-- Background bulk enrichment jobs (last_book_id is the resume checkpoint)
+CREATE TABLE IF NOT EXISTS enrichment_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT CHECK(status IN ('running', 'completed', 'cancelled', 'failed')) NOT NULL,
+    last_book_id INTEGER DEFAULT 0,
+    total INTEGER DEFAULT 0,
+    processed INTEGER DEFAULT 0,
+    enriched INTEGER DEFAULT 0,
+    failed INTEGER DEFAULT 0,
+    error TEXT,
+    started_at TIMESTAMP,
+    updated_at TIMESTAMP,  -- Heartbeat, bumped on every batch commit
+    finished_at TIMESTAMP
+);
+
+-- Statistics rollups kept current by triggers (see library_stats.py)
+CREATE TABLE IF NOT EXISTS library_stats (
+    metric TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (metric, key)
+);
+
 -- Indexes for common queries
 CREATE INDEX IF NOT EXISTS idx_books_isbn ON books(isbn);
 CREATE INDEX IF NOT EXISTS idx_books_isbn13 ON books(isbn13);
@@ -133,10 +170,380 @@ CREATE INDEX IF NOT EXISTS idx_user_books_finished ON user_books(finished_readin
 CREATE INDEX IF NOT EXISTS idx_user_books_priority ON user_books(priority);
 CREATE INDEX IF NOT EXISTS idx_user_books_last_read ON user_books(last_read_at);
 CREATE INDEX IF NOT EXISTS idx_notes_user_book ON notes(user_book_id);
+CREATE INDEX IF NOT EXISTS idx_reading_sessions_user_book ON reading_sessions(user_book_id);
 CREATE INDEX IF NOT EXISTS idx_tags_name ON tags(name);
 CREATE INDEX IF NOT EXISTS idx_learning_path_books_path ON learning_path_books(learning_path_id);
 CREATE INDEX IF NOT EXISTS idx_learning_path_books_book ON learning_path_books(user_book_id);
+CREATE INDEX IF NOT EXISTS idx_learning_path_books_position ON learning_path_books(learning_path_id, position);
 CREATE INDEX IF NOT EXISTS idx_user_books_source_book ON user_books(source_book_id);
+CREATE INDEX IF NOT EXISTS idx_open_library_cache_last_used ON open_library_cache(last_used_at);
+CREATE INDEX IF NOT EXISTS idx_library_stats_value ON library_stats(metric, value);
+
+-- Library list sort keys, alone and after the status filter (v11)
+CREATE INDEX IF NOT EXISTS idx_user_books_rating ON user_books(my_rating);
+CREATE INDEX IF NOT EXISTS idx_user_books_sort_title ON user_books(sort_title);
+CREATE INDEX IF NOT EXISTS idx_user_books_sort_author ON user_books(sort_author);
+CREATE INDEX IF NOT EXISTS idx_user_books_sort_page_count ON user_books(sort_page_count);
+CREATE INDEX IF NOT EXISTS idx_user_books_sort_year ON user_books(sort_year_published);
+CREATE INDEX IF NOT EXISTS idx_user_books_status_date_added ON user_books(status, date_added);
+CREATE INDEX IF NOT EXISTS idx_user_books_status_finished ON user_books(status, finished_reading_at);
+CREATE INDEX IF NOT EXISTS idx_user_books_status_rating ON user_books(status, my_rating);
+CREATE INDEX IF NOT EXISTS idx_user_books_status_title ON user_books(status, sort_title);
+CREATE INDEX IF NOT EXISTS idx_user_books_status_author ON user_books(status, sort_author);
+CREATE INDEX IF NOT EXISTS idx_user_books_status_page_count ON user_books(status, sort_page_count);
+CREATE INDEX IF NOT EXISTS idx_user_books_status_year ON user_books(status, sort_year_published);
+
+-- Full-text search index over catalog fields (external content, kept in sync by triggers)
+CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+    title,
+    author,
+    additional_authors,
+    publisher,
+    description,
+    content='books',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+    INSERT INTO books_fts (rowid, title, author, additional_authors, publisher, description)
+    VALUES (new.id, new.title, new.author, new.additional_authors, new.publisher, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+    INSERT INTO books_fts (books_fts, rowid, title, author, additional_authors, publisher, description)
+    VALUES ('delete', old.id, old.title, old.author, old.additional_authors, old.publisher, old.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS books_fts_au
+AFTER UPDATE OF title, author, additional_authors, publisher, description ON books BEGIN
+    INSERT INTO books_fts (books_fts, rowid, title, author, additional_authors, publisher, description)
+    VALUES ('delete', old.id, old.title, old.author, old.additional_authors, old.publisher, old.description);
+    INSERT INTO books_fts (rowid, title, author, additional_authors, publisher, description)
+    VALUES (new.id, new.title, new.author, new.additional_authors, new.publisher, new.description);
+END;
+
+-- Keep the sort key copies on user_books current
+CREATE TRIGGER IF NOT EXISTS user_books_sort_ai AFTER INSERT ON user_books BEGIN
+    UPDATE user_books SET (sort_title, sort_author, sort_page_count, sort_year_published) = (
+        SELECT title, author, page_count, year_published FROM books WHERE id = new.book_id
+    ) WHERE id = new.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS user_books_sort_au AFTER UPDATE OF book_id ON user_books BEGIN
+    UPDATE user_books SET (sort_title, sort_author, sort_page_count, sort_year_published) = (
+        SELECT title, author, page_count, year_published FROM books WHERE id = new.book_id
+    ) WHERE id = new.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS user_books_sort_books_au
+AFTER UPDATE OF title, author, page_count, year_published ON books BEGIN
+    UPDATE user_books SET (sort_title, sort_author, sort_page_count, sort_year_published) =
+        (new.title, new.author, new.page_count, new.year_published)
+    WHERE book_id = new.id;
+END;
+
+-- Keep library_stats rollups current
+CREATE TRIGGER IF NOT EXISTS library_stats_user_books_ai AFTER INSERT ON user_books BEGIN
+    INSERT INTO library_stats (metric, key, value)
+    SELECT metric, key, value FROM (
+        SELECT 'status' AS metric, new.status AS key, 1 AS value
+        UNION ALL
+        SELECT 'finished_year', strftime('%Y', new.finished_reading_at), 1
+        WHERE strftime('%Y', new.finished_reading_at) IS NOT NULL
+        UNION ALL
+        SELECT 'days_to_read_sum', '', CAST(julianday(new.finished_reading_at) - julianday(new.date_added) AS INTEGER)
+        WHERE CAST(julianday(new.finished_reading_at) - julianday(new.date_added) AS INTEGER) >= 0
+        UNION ALL
+        SELECT 'days_to_read_count', '', 1
+        WHERE CAST(julianday(new.finished_reading_at) - julianday(new.date_added) AS INTEGER) >= 0
+        UNION ALL
+        SELECT 'pages_read', '', b.page_count FROM books b
+        WHERE b.id = new.book_id AND new.status = 'finished' AND b.page_count IS NOT NULL
+        UNION ALL
+        SELECT 'author', b.author, 1 FROM books b WHERE b.id = new.book_id
+    ) WHERE true
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_stats_user_books_ad AFTER DELETE ON user_books BEGIN
+    INSERT INTO library_stats (metric, key, value)
+    SELECT metric, key, value FROM (
+        SELECT 'status' AS metric, old.status AS key, -1 AS value
+        UNION ALL
+        SELECT 'finished_year', strftime('%Y', old.finished_reading_at), -1
+        WHERE strftime('%Y', old.finished_reading_at) IS NOT NULL
+        UNION ALL
+        SELECT 'days_to_read_sum', '', -CAST(julianday(old.finished_reading_at) - julianday(old.date_added) AS INTEGER)
+        WHERE CAST(julianday(old.finished_reading_at) - julianday(old.date_added) AS INTEGER) >= 0
+        UNION ALL
+        SELECT 'days_to_read_count', '', -1
+        WHERE CAST(julianday(old.finished_reading_at) - julianday(old.date_added) AS INTEGER) >= 0
+        UNION ALL
+        SELECT 'pages_read', '', -b.page_count FROM books b
+        WHERE b.id = old.book_id AND old.status = 'finished' AND b.page_count IS NOT NULL
+        UNION ALL
+        SELECT 'author', b.author, -1 FROM books b WHERE b.id = old.book_id
+    ) WHERE true
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_stats_user_books_au
+AFTER UPDATE OF book_id, status, date_added, finished_reading_at ON user_books BEGIN
+    INSERT INTO library_stats (metric, key, value)
+    SELECT metric, key, value FROM (
+        SELECT 'status' AS metric, old.status AS key, -1 AS value
+        UNION ALL
+        SELECT 'finished_year', strftime('%Y', old.finished_reading_at), -1
+        WHERE strftime('%Y', old.finished_reading_at) IS NOT NULL
+        UNION ALL
+        SELECT 'days_to_read_sum', '', -CAST(julianday(old.finished_reading_at) - julianday(old.date_added) AS INTEGER)
+        WHERE CAST(julianday(old.finished_reading_at) - julianday(old.date_added) AS INTEGER) >= 0
+        UNION ALL
+        SELECT 'days_to_read_count', '', -1
+        WHERE CAST(julianday(old.finished_reading_at) - julianday(old.date_added) AS INTEGER) >= 0
+        UNION ALL
+        SELECT 'pages_read', '', -b.page_count FROM books b
+        WHERE b.id = old.book_id AND old.status = 'finished' AND b.page_count IS NOT NULL
+        UNION ALL
+        SELECT 'author', b.author, -1 FROM books b WHERE b.id = old.book_id
+    ) WHERE true
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO library_stats (metric, key, value)
+    SELECT metric, key, value FROM (
+        SELECT 'status' AS metric, new.status AS key, 1 AS value
+        UNION ALL
+        SELECT 'finished_year', strftime('%Y', new.finished_reading_at), 1
+        WHERE strftime('%Y', new.finished_reading_at) IS NOT NULL
+        UNION ALL
+        SELECT 'days_to_read_sum', '', CAST(julianday(new.finished_reading_at) - julianday(new.date_added) AS INTEGER)
+        WHERE CAST(julianday(new.finished_reading_at) - julianday(new.date_added) AS INTEGER) >= 0
+        UNION ALL
+        SELECT 'days_to_read_count', '', 1
+        WHERE CAST(julianday(new.finished_reading_at) - julianday(new.date_added) AS INTEGER) >= 0
+        UNION ALL
+        SELECT 'pages_read', '', b.page_count FROM books b
+        WHERE b.id = new.book_id AND new.status = 'finished' AND b.page_count IS NOT NULL
+        UNION ALL
+        SELECT 'author', b.author, 1 FROM books b WHERE b.id = new.book_id
+    ) WHERE true
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_stats_books_au AFTER UPDATE OF author, page_count ON books BEGIN
+    INSERT INTO library_stats (metric, key, value)
+    SELECT metric, key, value FROM (
+        SELECT 'author' AS metric, old.author AS key, -1 AS value FROM user_books ub
+        WHERE ub.book_id = old.id
+        UNION ALL
+        SELECT 'pages_read', '', -old.page_count FROM user_books ub
+        WHERE ub.book_id = old.id AND ub.status = 'finished' AND old.page_count IS NOT NULL
+    ) WHERE true
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO library_stats (metric, key, value)
+    SELECT metric, key, value FROM (
+        SELECT 'author' AS metric, new.author AS key, 1 AS value FROM user_books ub
+        WHERE ub.book_id = new.id
+        UNION ALL
+        SELECT 'pages_read', '', new.page_count FROM user_books ub
+        WHERE ub.book_id = new.id AND ub.status = 'finished' AND new.page_count IS NOT NULL
+    ) WHERE true
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_stats_tags_ai AFTER INSERT ON user_book_tags BEGIN
+    INSERT INTO library_stats (metric, key, value) VALUES ('tag', new.tag_id, 1)
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_stats_tags_ad AFTER DELETE ON user_book_tags BEGIN
+    INSERT INTO library_stats (metric, key, value) VALUES ('tag', old.tag_id, -1)
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_stats_tags_au AFTER UPDATE OF tag_id ON user_book_tags BEGIN
+    INSERT INTO library_stats (metric, key, value) VALUES ('tag', old.tag_id, -1)
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO library_stats (metric, key, value) VALUES ('tag', new.tag_id, 1)
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+-- Per-path book and finished counts in library_stats (read by the dashboard and paths list)
+CREATE TRIGGER IF NOT EXISTS library_stats_paths_ai AFTER INSERT ON learning_path_books BEGIN
+    INSERT INTO library_stats (metric, key, value)
+    SELECT metric, key, value FROM (
+        SELECT 'path_books' AS metric, new.learning_path_id AS key, 1 AS value
+        UNION ALL
+        SELECT 'path_finished', new.learning_path_id, 1 FROM user_books ub
+        WHERE ub.id = new.user_book_id AND ub.status = 'finished'
+    ) WHERE true
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_stats_paths_ad AFTER DELETE ON learning_path_books BEGIN
+    INSERT INTO library_stats (metric, key, value)
+    SELECT metric, key, value FROM (
+        SELECT 'path_books' AS metric, old.learning_path_id AS key, -1 AS value
+        UNION ALL
+        SELECT 'path_finished', old.learning_path_id, -1 FROM user_books ub
+        WHERE ub.id = old.user_book_id AND ub.status = 'finished'
+    ) WHERE true
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_stats_paths_au
+AFTER UPDATE OF learning_path_id, user_book_id ON learning_path_books BEGIN
+    INSERT INTO library_stats (metric, key, value)
+    SELECT metric, key, value FROM (
+        SELECT 'path_books' AS metric, old.learning_path_id AS key, -1 AS value
+        UNION ALL
+        SELECT 'path_finished', old.learning_path_id, -1 FROM user_books ub
+        WHERE ub.id = old.user_book_id AND ub.status = 'finished'
+        UNION ALL
+        SELECT 'path_books', new.learning_path_id, 1
+        UNION ALL
+        SELECT 'path_finished', new.learning_path_id, 1 FROM user_books ub
+        WHERE ub.id = new.user_book_id AND ub.status = 'finished'
+    ) WHERE true
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_stats_paths_user_books_au
+AFTER UPDATE OF status ON user_books
+WHEN (old.status = 'finished') != (new.status = 'finished') BEGIN
+    INSERT INTO library_stats (metric, key, value)
+    SELECT 'path_finished', lpb.learning_path_id, CASE WHEN new.status = 'finished' THEN 1 ELSE -1 END
+    FROM learning_path_books lpb
+    WHERE lpb.user_book_id = new.id
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_stats_paths_user_books_ad
+AFTER DELETE ON user_books WHEN old.status = 'finished' BEGIN
+    INSERT INTO library_stats (metric, key, value)
+    SELECT 'path_finished', lpb.learning_path_id, -1
+    FROM learning_path_books lpb
+    WHERE lpb.user_book_id = old.id
+    ON CONFLICT (metric, key) DO UPDATE SET value = value + excluded.value;
+END;
+
+-- Library revision, bumped by triggers on every write to library data.
+-- Read endpoints derive their ETag from it (epoch changes if the database is recreated).
+CREATE TABLE IF NOT EXISTS library_revision (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    epoch TEXT NOT NULL,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO library_revision (id, epoch, revision) VALUES (1, lower(hex(randomblob(4))), 0);
+
+CREATE TRIGGER IF NOT EXISTS library_revision_books_ai AFTER INSERT ON books BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_books_ad AFTER DELETE ON books BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_books_au AFTER UPDATE ON books BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_user_books_ai AFTER INSERT ON user_books BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_user_books_ad AFTER DELETE ON user_books BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_user_books_au AFTER UPDATE ON user_books BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_tags_ai AFTER INSERT ON tags BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_tags_ad AFTER DELETE ON tags BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_tags_au AFTER UPDATE ON tags BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_user_book_tags_ai AFTER INSERT ON user_book_tags BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_user_book_tags_ad AFTER DELETE ON user_book_tags BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_user_book_tags_au AFTER UPDATE ON user_book_tags BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_learning_paths_ai AFTER INSERT ON learning_paths BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_learning_paths_ad AFTER DELETE ON learning_paths BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_learning_paths_au AFTER UPDATE ON learning_paths BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_learning_path_books_ai AFTER INSERT ON learning_path_books BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_learning_path_books_ad AFTER DELETE ON learning_path_books BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_learning_path_books_au AFTER UPDATE ON learning_path_books BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_notes_ai AFTER INSERT ON notes BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_notes_ad AFTER DELETE ON notes BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_notes_au AFTER UPDATE ON notes BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_reading_sessions_ai AFTER INSERT ON reading_sessions BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_reading_sessions_ad AFTER DELETE ON reading_sessions BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_reading_sessions_au AFTER UPDATE ON reading_sessions BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_user_settings_ai AFTER INSERT ON user_settings BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_user_settings_ad AFTER DELETE ON user_settings BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS library_revision_user_settings_au AFTER UPDATE ON user_settings BEGIN
+    UPDATE library_revision SET revision = revision + 1 WHERE id = 1;
+END;
 
 -- View for easy querying of books with user data
 CREATE VIEW IF NOT EXISTS library_view AS
@@ -156,6 +563,11 @@ SELECT
     b.original_publication_year,
     b.description,
     b.cover_image_url,
+    -- Stored cover, or the Open Library cover for the ISBN (what the API shows)
+    COALESCE(
+        NULLIF(b.cover_image_url, ''),
+        'https://covers.openlibrary.org/b/isbn/' || COALESCE(NULLIF(b.isbn13, ''), NULLIF(b.isbn, '')) || '-L.jpg'
+    ) as display_cover_url,
     b.goodreads_avg_rating,
     ub.id as user_book_id,
     ub.status,
@@ -19,6 +19,7 @@ import './components/shared/bt-modal.js';
 import './components/shared/bt-toast.js';
 import './components/shared/bt-loading.js';
 import './components/shared/bt-empty-state.js';
+import { coverSrc } from './components/shared/bt-book-cover.js';
 
 // Import view components
 import './views/bt-login-view.js';
@@ -492,7 +493,7 @@ class BookTrackerApp {
                     ${availableBooks.map(book => `
                         <div class="book-list-item" data-title="${book.title.toLowerCase()}" data-author="${book.author.toLowerCase()}" data-user-book-id="${book.user_book_id}" style="padding: 10px; border-bottom: 1px solid var(--border); cursor: pointer; display: flex; gap: 12px; align-items: center;">
                             <div style="width: 40px; height: 60px; background: var(--bg-tertiary); border-radius: 4px; overflow: hidden; flex-shrink: 0;">
-                                ${book.cover_image_url ? `<img src="${book.cover_image_url}" style="width: 100%; height: 100%; object-fit: cover;">` : ''}
+                                ${book.cover_image_url ? `<img src="${coverSrc(book.cover_image_url, 'small')}" style="width: 100%; height: 100%; object-fit: cover;">` : ''}
                             </div>
                             <div>
                                 <div style="font-weight: 600; font-size: 0.875rem;">${book.title}</div>
@@ -531,7 +531,8 @@ export class BtBookDetail extends BaseComponent {
         this.setState({ loading: true, error: null });
 
         try {
-            const book = await api.getBook(bookId);
+            // Notes and reading sessions are not shown in the modal
+            const book = await api.getBook(bookId, ['tags', 'lineage', 'paths']);
             this.setState({ loading: false, book });
         } catch (error) {
             this.setState({
@@ -4,6 +4,26 @@
 
 import { BaseComponent, defineComponent } from '../../core/base-component.js';
 
+const OPEN_LIBRARY_COVER = /^https?:\/\/covers\.openlibrary\.org\/b\/(id|isbn|olid)\/([A-Za-z0-9]+)-[SML]\.jpg/;
+
+// Rendered width in CSS pixels for each size attribute
+const DISPLAY_WIDTHS = { small: 50, large: 200 };
+const DEFAULT_DISPLAY_WIDTH = 160;
+
+/**
+ * Map an Open Library cover URL to the local /covers proxy, picking the
+ * smallest Open Library size (S ~45px, M ~180px, L) that fills the display.
+ * Other URLs are returned unchanged.
+ */
+export function coverSrc(src, size) {
+    const match = src && src.match(OPEN_LIBRARY_COVER);
+    if (!match) return src;
+
+    const width = (DISPLAY_WIDTHS[size] || DEFAULT_DISPLAY_WIDTH) * (window.devicePixelRatio || 1);
+    const olSize = width <= 45 ? 'S' : width <= 180 ? 'M' : 'L';
+    return `/covers/${match[1]}/${match[2]}-${olSize}.jpg`;
+}
+
 export class BtBookCover extends BaseComponent {
     static get observedAttributes() {
         return ['src', 'title', 'size'];
@@ -75,7 +95,7 @@ export class BtBookCover extends BaseComponent {
     }
 
     template() {
-        const src = this.getAttribute('src');
+        const src = coverSrc(this.getAttribute('src'), this.getAttribute('size'));
         const title = this.getAttribute('title') || 'Book cover';
 
         if (src) {
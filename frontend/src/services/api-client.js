@@ -39,8 +39,9 @@ class ApiClient {
         const skipCache = options.skipCache || false;
 
         // Check cache first (if online and not skipping)
+        let cached = null;
         if (!skipCache && store.get('isOnline')) {
-            const cached = await cacheManager.get(cacheKey);
+            cached = await cacheManager.get(cacheKey);
             if (cached && !this._isStale(cached.timestamp, cacheTtl)) {
                 return cached.data;
             }
@@ -51,11 +52,18 @@ class ApiClient {
             return this._pendingRequests.get(cacheKey);
         }
 
-        const request = this._fetch(endpoint, { method: 'GET' })
-            .then(async data => {
+        // Revalidate a stale entry; the server answers 304 if the library is unchanged
+        const headers = cached?.etag ? { 'If-None-Match': cached.etag } : {};
+
+        const request = this._fetchRaw(endpoint, { method: 'GET', headers })
+            .then(async response => {
+                const data = response.status === 304
+                    ? cached.data
+                    : await this._parse(response);
                 // Cache the response
                 await cacheManager.set(cacheKey, {
                     data,
+                    etag: response.headers.get('ETag'),
                     timestamp: Date.now()
                 });
                 return data;
@@ -116,8 +124,15 @@ class ApiClient {
      * @returns {Promise<*>}
      */
     async _fetch(endpoint, options = {}) {
-        const response = await this._fetchRaw(endpoint, options);
+        return this._parse(await this._fetchRaw(endpoint, options));
+    }
 
+    /**
+     * Check a response for errors and parse its JSON body
+     * @param {Response} response
+     * @returns {Promise<*>}
+     */
+    async _parse(response) {
         if (response.status === 401) {
             store.set('authenticated', false);
             events.emit(EVENT_NAMES.AUTH_ERROR, { status: 401 });
@@ -183,7 +198,7 @@ class ApiClient {
     // ==========================================
 
     async getDashboard() {
-        const data = await this.get('/dashboard', {
+        const data = await this.get('/dashboard?view=card', {
             cacheKey: 'dashboard',
             cacheTtl: CACHE_TTL.dashboard
         });
@@ -196,7 +211,7 @@ class ApiClient {
     // ==========================================
 
     async getPipeline() {
-        const data = await this.get('/pipeline', {
+        const data = await this.get('/pipeline?view=card', {
             cacheKey: 'pipeline',
             cacheTtl: CACHE_TTL.pipeline
         });
@@ -212,12 +227,15 @@ class ApiClient {
         const query = new URLSearchParams({
             page: params.page || 1,
             per_page: params.perPage || 50,
-            sort: params.sort || 'date_added',
-            order: params.order || 'desc'
+            sort: params.sort || (params.search ? 'relevance' : 'date_added'),
+            order: params.order || 'desc',
+            view: params.view || 'card'
         });
 
         if (params.status) query.append('status', params.status);
         if (params.search) query.append('search', params.search);
+        if (params.cursor) query.append('cursor', params.cursor);
+        if (params.includeTotal === false) query.append('include_total', 'false');
 
         const endpoint = `/books?${query}`;
         const data = await this.get(endpoint, {
@@ -229,9 +247,20 @@ class ApiClient {
         return data;
     }
 
-    async getBook(bookId) {
-        return this.get(`/books/${bookId}`, {
-            cacheKey: `book:${bookId}`,
+    async getBook(bookId, include = null) {
+        // include: relations to load (tags, notes, sessions, lineage, paths); all by default
+        const query = include ? `?include=${include.join(',')}` : '';
+        return this.get(`/books/${bookId}${query}`, {
+            cacheKey: `book:${bookId}:${include ? include.join(',') : 'all'}`,
+            cacheTtl: CACHE_TTL.book
+        });
+    }
+
+    async getBooksByIds(bookIds, include = null) {
+        const query = new URLSearchParams({ ids: bookIds.join(',') });
+        if (include) query.append('include', include.join(','));
+        return this.get(`/books?${query}`, {
+            cacheKey: `books:${query.toString()}`,
             cacheTtl: CACHE_TTL.book
         });
     }
@@ -246,11 +275,24 @@ class ApiClient {
     async updateBook(bookId, data) {
         const result = await this.patch(`/books/${bookId}`, data);
         await this._invalidateBookCaches();
-        await cacheManager.delete(`book:${bookId}`);
+        await cacheManager.deleteByPrefix(`book:${bookId}:`);
         events.emit(EVENT_NAMES.BOOK_UPDATED, result);
         return result;
     }
 
+    /**
+     * Apply status, ownership and tag changes to many books at once
+     * @param {Object} selection - { ids: [bookId] } or { filter: { status, search } }
+     * @param {Object} changes - status, owns_kindle/owns_audible/owns_hardcopy, add_tags, remove_tags
+     * @returns {Promise<Object>} Counts of matched and changed rows
+     */
+    async bulkUpdateBooks(selection, changes) {
+        const result = await this.post('/books/bulk', { ...selection, ...changes });
+        await this._invalidateBookCaches();
+        await cacheManager.deleteByPrefix('book:');
+        return result;
+    }
+
     async searchOpenLibrary(query) {
         return this.get(`/search/openlibrary?q=${encodeURIComponent(query)}&limit=10`, {
             skipCache: true
@@ -258,9 +300,14 @@ class ApiClient {
     }
 
     async enrichBooks() {
-        const result = await this.post('/books/enrich-all', {});
+        // Enrichment runs in the background; poll until the job stops
+        let job = await this.post('/books/enrich-all', {});
+        while (job.status === 'running') {
+            await new Promise(resolve => setTimeout(resolve, 2000));
+            job = await this._fetch('/books/enrich-all/status', { method: 'GET' });
+        }
         await this._invalidateBookCaches();
-        return result;
+        return job;
     }
 
     // ==========================================
@@ -318,12 +365,38 @@ class ApiClient {
         await cacheManager.delete(`path:${pathId}`);
     }
 
+    /**
+     * Move a book within a path; only the moved book is rewritten
+     * @param {number} pathId
+     * @param {number} userBookId - Book to move
+     * @param {Object} target - { before: userBookId } or { after: userBookId }
+     */
+    async movePathBook(pathId, userBookId, target) {
+        const result = await this.patch(`/paths/${pathId}/books/${userBookId}/move`, target);
+        await cacheManager.delete(`path:${pathId}`);
+        return result;
+    }
+
     async reorderPathBooks(pathId, books) {
         const result = await this.patch(`/paths/${pathId}/books/reorder`, { books });
         await cacheManager.delete(`path:${pathId}`);
         return result;
     }
 
+    // ==========================================
+    // Batch API
+    // ==========================================
+
+    /**
+     * Apply mutations in one request and one transaction
+     * @param {Array} operations - [{ method, path, body }]
+     * @param {boolean} atomic - Roll back everything if any operation fails
+     * @returns {Promise<Object>} { committed, results: [{ status, body }] }
+     */
+    async batch(operations, atomic = false) {
+        return this.post('/batch', { operations, atomic });
+    }
+
     // ==========================================
     // Stats API
     // ==========================================
@@ -197,25 +197,37 @@ class OfflineQueue {
         let synced = 0;
         let failed = 0;
 
-        for (const mutation of mutations) {
-            try {
-                await this._executeMutation(mutation);
+        // Replay the whole backlog in one request and one server-side transaction
+        let results;
+        try {
+            const response = mutations.length
+                ? await api.batch(mutations.map(mutation => this._toOperation(mutation)))
+                : { results: [] };
+            results = response.results;
+        } catch (error) {
+            // Request failed as a whole; every mutation counts as a failed attempt
+            console.error('Mutation sync error:', error);
+            results = mutations.map(() => ({ status: 0 }));
+        }
+
+        for (const [i, mutation] of mutations.entries()) {
+            if (results[i].status > 0 && results[i].status < 400) {
                 await this.remove(mutation.id);
                 synced++;
-            } catch (error) {
-                console.error('Mutation sync error:', error);
-
+            } else if (mutation.retries < 3) {
                 // Retry up to 3 times
-                if (mutation.retries < 3) {
-                    await this.updateRetries(mutation.id, mutation.retries + 1);
-                } else {
-                    // Give up after 3 retries
-                    await this.remove(mutation.id);
-                    failed++;
-                }
+                await this.updateRetries(mutation.id, mutation.retries + 1);
+            } else {
+                // Give up after 3 retries
+                await this.remove(mutation.id);
+                failed++;
             }
         }
 
+        if (synced > 0) {
+            await api.invalidateAll();
+        }
+
         this._syncing = false;
 
         if (failed > 0) {
@@ -228,40 +240,45 @@ class OfflineQueue {
     }
 
     /**
-     * Execute a single mutation
+     * Convert a queued mutation into a batch operation
      * @param {Object} mutation
-     * @returns {Promise<*>}
+     * @returns {Object} { method, path, body }
      */
-    async _executeMutation(mutation) {
+    _toOperation(mutation) {
         const { type, data } = mutation;
 
         switch (type) {
             case 'book:create':
-                return api.createBook(data);
+                return { method: 'POST', path: '/api/books', body: data };
 
             case 'book:update':
-                return api.updateBook(data.id, data.updates);
+                return { method: 'PATCH', path: `/api/books/${data.id}`, body: data.updates };
 
             case 'book:delete':
-                return api.delete(`/books/${data.id}`);
+                return { method: 'DELETE', path: `/api/books/${data.id}` };
 
             case 'path:create':
-                return api.createPath(data);
+                return { method: 'POST', path: '/api/paths', body: data };
 
             case 'path:update':
-                return api.updatePath(data.id, data.updates);
+                return { method: 'PATCH', path: `/api/paths/${data.id}`, body: data.updates };
 
             case 'path:delete':
-                return api.deletePath(data.id);
+                return { method: 'DELETE', path: `/api/paths/${data.id}` };
 
             case 'path:addBook':
-                return api.addBookToPath(data.pathId, data.userBookId);
+                return {
+                    method: 'POST',
+                    path: `/api/paths/${data.pathId}/books`,
+                    body: { user_book_id: data.userBookId }
+                };
 
             case 'path:removeBook':
-                return api.removeBookFromPath(data.pathId, data.userBookId);
+                return { method: 'DELETE', path: `/api/paths/${data.pathId}/books/${data.userBookId}` };
 
             default:
-                throw new Error(`Unknown mutation type: ${type}`);
+                // Sent anyway so the server reports it as a failed operation
+                return { method: 'POST', path: `/unknown/${type}` };
         }
     }
 
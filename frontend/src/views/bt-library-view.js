@@ -450,7 +450,7 @@ export class BtLibraryView extends BaseComponent {
 
         try {
             const result = await api.enrichBooks();
-            const message = `Enhanced ${result.enriched} covers. ${result.failed} not found. ${result.remaining} remaining.`;
+            const message = `Enhanced ${result.enriched} covers. ${result.failed} not found. ${result.total - result.processed} remaining.`;
             this.emit('toast', { message, type: 'success' });
             await this._loadBooks();
         } catch (error) {
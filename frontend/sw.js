@@ -46,6 +46,9 @@ const STATIC_ASSETS = [
 // API endpoints that should use network-first strategy
 const API_ENDPOINTS = ['/api/'];
 
+// Cover images proxied and cached by the backend (content never changes)
+const COVER_PROXY_PATH = '/covers/';
+
 // Cover image URLs (Open Library, etc.)
 const COVER_DOMAINS = [
     'covers.openlibrary.org',
@@ -127,6 +130,12 @@ self.addEventListener('fetch', (event) => {
         return;
     }
 
+    // Proxied cover images - Cache first
+    if (url.origin === self.location.origin && url.pathname.startsWith(COVER_PROXY_PATH)) {
+        event.respondWith(cacheFirstStrategy(request, COVER_CACHE));
+        return;
+    }
+
     // Cover images - Stale while revalidate
     if (COVER_DOMAINS.some(domain => url.hostname.includes(domain))) {
         event.respondWith(staleWhileRevalidateStrategy(request, COVER_CACHE));